@@ -0,0 +1,260 @@
+"""
+Armazenamento colunar de interações com relatórios por agrupamento vetorizado.
+
+Em vez de um objeto Interacao por evento (referenciado por conteúdo, usuário e
+plataforma), cada evento ocupa uma posição em colunas tipadas do módulo
+`array`:
+
+    id_conteudo  int32        id_usuario  int32
+    plataforma   uint16 (código de dicionário)
+    tipo         uint8  (código de dicionário)
+    duracao      float32      timestamp   int64 (segundos desde a época, UTC;
+                                          SEM_TIMESTAMP se ausente)
+
+As colunas somam 23 bytes por evento; com a sobra de crescimento dos arrays
+e os dicionários de códigos, benchmarks.bench_colunar mede ~24 bytes por
+evento com 1 milhão de eventos, ~29 com 100 mil e ~47 com 10 mil, contra
+algumas centenas no modelo de objetos.
+Quando o NumPy está instalado as colunas são lidas sem cópia
+(`numpy.frombuffer`) e os relatórios agrupam com `bincount` sobre a faixa
+de IDs (O(E), sem ordenar os eventos; `unique` só para IDs esparsos) e
+ordenam as chaves com `argsort`; sem NumPy os mesmos relatórios são
+calculados em Python puro.
+
+Os relatórios devolvem tuplas em vez de entidades e seguem as mesmas regras
+de ordenação de SistemaAnaliseEngajamento (empates por ID crescente; para
+plataformas, por ordem de primeira ocorrência). Textos de comentário não são
+armazenados, apenas contados. A duração em float32 é exata para valores
+inteiros de segundos (ou com frações binárias, como .5).
+
+É um motor à parte: não pode ser ligado a SistemaAnaliseEngajamento (não há
+entidades, árvores nem índices por trás das colunas), e snapshots, ingestão
+incremental e vistas do sistema não se aplicam a ele.
+"""
+import heapq
+from array import array
+
+from analise.leitor_csv import ler_lotes
+from analise.sistema import MOTIVOS_REJEICAO, normalizar_lote
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele os relatórios usam Python puro
+    np = None
+
+# IDs cuja faixa (máximo - mínimo) é até este múltiplo do número de eventos
+# são agrupados por contagem direta; faixas mais esparsas usam np.unique.
+FATOR_FAIXA_DENSA = 4
+
+# Valor da coluna timestamp para eventos sem instante (0 é um instante válido).
+SEM_TIMESTAMP = -(1 << 63)
+
+
+class ArmazenamentoColunar:
+    """
+    Motor de armazenamento alternativo ao modelo de objetos.
+
+    Complexidades:
+        adicionar: O(1) amortizado
+        relatórios: O(E + F) com NumPy, F = faixa dos IDs (O(E log E) se os
+            IDs forem esparsos), ou O(E) em Python puro, mais O(k log k)
+            para ordenar as k chaves distintas
+    """
+    def __init__(self, usar_numpy: bool = True):
+        self._usar_numpy = usar_numpy and np is not None
+        self.id_conteudo = array('i')
+        self.id_usuario = array('i')
+        self.plataforma = array('H')
+        self.tipo = array('B')
+        self.duracao = array('f')
+        self.timestamp = array('q')
+        self._codigos_plataforma = {}
+        self._codigos_tipo = {}
+        self._nomes_conteudo = {}
+        self._chaves_densas = {}
+        self._linhas_rejeitadas = dict.fromkeys(MOTIVOS_REJEICAO, 0)
+
+    def __len__(self) -> int:
+        return len(self.tipo)
+
+    def memoria_bytes(self) -> int:
+        # Bytes ocupados pelos buffers das colunas.
+        colunas = (self.id_conteudo, self.id_usuario, self.plataforma,
+                   self.tipo, self.duracao, self.timestamp)
+        return sum(c.itemsize * len(c) for c in colunas)
+
+    def adicionar(self, id_conteudo, nome_conteudo, id_usuario, plataforma, tipo,
+                  duracao=0.0, timestamp=None):
+        # Acrescenta um evento às colunas, codificando plataforma e tipo.
+        cod_plat = self._codigos_plataforma.get(plataforma)
+        if cod_plat is None:
+            cod_plat = self._codigos_plataforma[plataforma] = len(self._codigos_plataforma)
+        cod_tipo = self._codigos_tipo.get(tipo)
+        if cod_tipo is None:
+            cod_tipo = self._codigos_tipo[tipo] = len(self._codigos_tipo)
+        if id_conteudo not in self._nomes_conteudo:
+            self._nomes_conteudo[id_conteudo] = nome_conteudo
+        self.id_conteudo.append(id_conteudo)
+        self.id_usuario.append(id_usuario)
+        self.plataforma.append(cod_plat)
+        self.tipo.append(cod_tipo)
+        self.duracao.append(duracao)
+        self.timestamp.append(SEM_TIMESTAMP if timestamp is None else timestamp)
+
+    def carregar_csv(self, caminho_arquivo: str) -> dict:
+        """Lê o CSV direto para as colunas; retorna o resumo como SistemaAnaliseEngajamento.resumo_ingestao."""
+        for lote in ler_lotes(caminho_arquivo):
+            validos, motivos = normalizar_lote(lote)
+            for motivo in motivos:
+                self._linhas_rejeitadas[motivo] += 1
+            for id_c, nome_c, id_u, plat, tipo, dur, _, ts in validos:
+                self.adicionar(id_c, nome_c, id_u, plat, tipo, dur, ts)
+        return {'registradas': len(self), 'rejeitadas': dict(self._linhas_rejeitadas)}
+
+    # Relatórios
+    def gerar_top_conteudos_por_tempo(self, n=None):
+        """[(id_conteudo, nome, tempo_total_consumo)] em ordem decrescente."""
+        pares = self._ranking(self.id_conteudo, self._mascara('view_start'), self.duracao, n)
+        return [(k, self._nomes_conteudo[k], v) for k, v in pares]
+
+    def gerar_top_usuarios_por_interacoes(self, n=None):
+        """[(id_usuario, total_interacoes)] em ordem decrescente."""
+        return [(k, int(v)) for k, v in self._ranking(self.id_usuario, None, None, n)]
+
+    def gerar_ranking_usuarios_por_tempo(self, n=None):
+        """[(id_usuario, tempo_total_consumo)] em ordem decrescente."""
+        return self._ranking(self.id_usuario, self._mascara('view_start'), self.duracao, n)
+
+    def gerar_ranking_plataformas_por_engajamento(self, n=None):
+        """[(plataforma, total_engajamento)] em ordem decrescente."""
+        pares = self._ranking(self.plataforma, self._mascara('like', 'share', 'comment'), None, n,
+                              todas_as_chaves=True)
+        nomes = list(self._codigos_plataforma)
+        return [(nomes[k], int(v)) for k, v in pares]
+
+    def gerar_ranking_conteudos_por_comentarios(self, n=None):
+        """[(id_conteudo, nome, total_comentarios)] em ordem decrescente."""
+        pares = self._ranking(self.id_conteudo, self._mascara('comment'), None, n)
+        return [(k, self._nomes_conteudo[k], int(v)) for k, v in pares]
+
+    def gerar_conteudos_por_total_interacoes(self, n=None):
+        """[(id_conteudo, nome, total_interacoes)] em ordem decrescente."""
+        pares = self._ranking(self.id_conteudo, None, None, n)
+        return [(k, self._nomes_conteudo[k], int(v)) for k, v in pares]
+
+    def calcular_tempo_medio_consumo_por_plataforma(self):
+        """{plataforma: tempo médio por 'view_start'} na ordem de primeira ocorrência."""
+        mascara = self._mascara('view_start')
+        chaves, tempos = self._agrupar(self.plataforma, mascara, self.duracao, True)
+        _, views = self._agrupar(self.plataforma, mascara, None, True)
+        nomes = list(self._codigos_plataforma)
+        return {nomes[k]: (float(t) / float(q)) if q else 0.0
+                for k, t, q in zip(chaves, tempos, views)}
+
+    def contar_comentarios_por_conteudo(self):
+        """{nome do conteúdo: total_comentarios} em ordem de ID."""
+        chaves, valores = self._agrupar(self.id_conteudo, self._mascara('comment'), None)
+        return {self._nomes_conteudo[k]: int(v) for k, v in zip(chaves, valores)}
+
+    # Agrupamento
+    def _mascara(self, *tipos):
+        # Conjunto de códigos de tipo aceitos (None = todos).
+        return {self._codigos_tipo[t] for t in tipos if t in self._codigos_tipo}
+
+    def _agrupar(self, coluna, codigos_tipo, pesos, todas_as_chaves=False):
+        """
+        Soma `pesos` (ou conta eventos) por valor de `coluna`, considerando só
+        eventos cujo tipo está em `codigos_tipo`. Retorna (chaves, somas) com
+        chaves em ordem crescente. Chaves sem nenhum evento aceito aparecem
+        com soma zero (como entidades sem aquele tipo de interação).
+        Com `todas_as_chaves`, a coluna é um código denso 0..k-1 (plataformas).
+        """
+        if self._usar_numpy:
+            return self._agrupar_numpy(coluna, codigos_tipo, pesos, todas_as_chaves)
+        somas = {}
+        tipos = self.tipo
+        if codigos_tipo is None:
+            if pesos is None:
+                for chave in coluna:
+                    somas[chave] = somas.get(chave, 0) + 1
+            else:
+                for chave, peso in zip(coluna, pesos):
+                    somas[chave] = somas.get(chave, 0.0) + peso
+        else:
+            for i, chave in enumerate(coluna):
+                if tipos[i] in codigos_tipo:
+                    somas[chave] = somas.get(chave, 0) + (pesos[i] if pesos is not None else 1)
+                elif chave not in somas:
+                    somas[chave] = 0.0 if pesos is not None else 0
+        if todas_as_chaves:
+            chaves = list(range(len(self._codigos_plataforma)))
+            return chaves, [somas.get(k, 0) for k in chaves]
+        chaves = sorted(somas)
+        return chaves, [somas[k] for k in chaves]
+
+    def _agrupar_numpy(self, coluna, codigos_tipo, pesos, todas_as_chaves):
+        valores = np.frombuffer(coluna, dtype=np.dtype(coluna.typecode))
+        presentes = None
+        if todas_as_chaves:
+            chaves = np.arange(len(self._codigos_plataforma))
+            inverso = valores
+        else:
+            chaves, inverso, presentes = self._indexar_chaves(coluna, valores)
+        w = None
+        if pesos is not None:
+            w = np.frombuffer(pesos, dtype=np.float32)
+        if codigos_tipo is not None:
+            # Tabela código de tipo -> aceito, indexada pela coluna (em vez de isin).
+            aceitos = np.zeros(256, dtype=bool)
+            aceitos[list(codigos_tipo)] = True
+            aceito = aceitos[np.frombuffer(self.tipo, dtype=np.uint8)]
+            w = np.where(aceito, w, np.float32(0)) if w is not None else aceito
+        somas = np.bincount(inverso, weights=w,
+                            minlength=len(chaves) if presentes is None else 0)
+        if presentes is not None:
+            somas = somas[presentes]
+        if pesos is None:
+            somas = somas.astype(np.int64, copy=False)
+        return chaves, somas
+
+    def _indexar_chaves(self, coluna, valores):
+        """
+        Chaves distintas (crescentes) de `valores` e, para cada evento, a
+        posição usada no bincount. IDs numa faixa densa usam o próprio ID
+        (menos o mínimo, se preciso) como posição e `presentes` diz quais
+        posições têm eventos; IDs esparsos caem em np.unique (presentes=None).
+        As chaves de uma faixa densa ficam em cache até a coluna crescer.
+        """
+        memo = self._chaves_densas.get(id(coluna))
+        if memo is not None and memo[0] == len(valores):
+            _, base, chaves, presentes = memo
+            return chaves, valores - base if base else valores, presentes
+        if len(valores):
+            minimo, maximo = int(valores.min()), int(valores.max())
+            limite = FATOR_FAIXA_DENSA * len(valores)
+            base = 0 if 0 <= minimo and maximo < limite else minimo
+            if maximo - base < limite:
+                inverso = valores - base if base else valores
+                presentes = np.flatnonzero(np.bincount(inverso))
+                chaves = presentes + base
+                self._chaves_densas[id(coluna)] = (len(valores), base, chaves, presentes)
+                return chaves, inverso, presentes
+        chaves, inverso = np.unique(valores, return_inverse=True)
+        return chaves, inverso, None
+
+    def _ranking(self, coluna, codigos_tipo, pesos, n, todas_as_chaves=False):
+        # Ordena as chaves pelo valor agregado (desc.), empates por chave crescente.
+        chaves, somas = self._agrupar(coluna, codigos_tipo, pesos, todas_as_chaves)
+        if self._usar_numpy:
+            if n and n < len(somas):
+                # Só os candidatos ao top-n (>= n-ésima maior soma, com empates) são ordenados.
+                limiar = np.partition(somas, len(somas) - n)[len(somas) - n]
+                candidatos = np.flatnonzero(somas >= limiar)
+                ordem = candidatos[np.argsort(-somas[candidatos], kind='stable')][:n]
+            else:
+                ordem = np.argsort(-somas, kind='stable')
+            return [(int(chaves[i]), somas[i].item()) for i in ordem]
+        pares = list(zip(chaves, somas))
+        if n:
+            return heapq.nlargest(n, pares, key=lambda p: p[1])
+        return sorted(pares, key=lambda p: p[1], reverse=True)
@@ -0,0 +1,285 @@
+"""
+Matriz esparsa usuário × conteúdo de coengajamento ("quem viu isto também viu").
+
+Cada par (usuário, conteúdo) com ao menos uma interação é uma entrada da
+matriz binária, guardada duas vezes em formato CSR (arrays de inteiros, sem
+um objeto Python por entrada), sobre índices densos atribuídos na ordem de
+primeira ocorrência dos IDs:
+
+    por usuário   conteúdos de cada usuário (linhas da matriz, ordenadas)
+    por conteúdo  usuários de cada conteúdo (a transposta, ou CSC)
+
+Pares novos entram em um conjunto de pendentes, deduplicado contra o CSR por
+busca binária na linha do usuário, e são incorporados por compactar(), que
+remonta os arrays copiando em bloco os trechos sem alteração: O(nnz + l)
+mais O(p log p) para p pendentes. A compactação é automática quando os
+pendentes passam de max(limite_pendentes, nnz / 8), o que mantém o custo
+amortizado constante por entrada; as consultas compactam antes, se preciso.
+
+A similaridade entre os conteúdos a e b é o cosseno dos vetores de usuários,
+|U_a ∩ U_b| / sqrt(|U_a| |U_b|). conteudos_similares(a) acumula os produtos
+esparsos percorrendo os usuários de a e as linhas deles, com poda:
+
+    - um conteúdo com mais de `limite_usuarios` usuários usa uma amostra
+      regular desse tamanho, e as interseções são escaladas (estimativa);
+    - usuários com mais de `limite_linha` conteúdos não geram candidatos:
+      contribuem pouco para a similaridade e custam muito.
+
+O custo de uma consulta fica em O(limite_usuarios × limite_linha), qualquer
+que seja o número de usuários; sem poda (amostra completa) o resultado é exato.
+"""
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from math import sqrt
+
+LIMITE_PENDENTES = 1 << 16
+LIMITE_USUARIOS_CONSULTA = 20_000
+LIMITE_LINHA = 1_000
+
+_MASCARA = (1 << 32) - 1
+
+
+class _LinhasCSR:
+    # Linhas binárias em CSR: colunas[inicio[i]:inicio[i + 1]] são as colunas (ordenadas) da linha i.
+    def __init__(self):
+        self.inicio = array('q', [0])
+        self.colunas = array('I')
+
+    def __len__(self):
+        return len(self.inicio) - 1
+
+    def tamanho_linha(self, linha):
+        if linha >= len(self.inicio) - 1:
+            return 0
+        return self.inicio[linha + 1] - self.inicio[linha]
+
+    def linha(self, linha):
+        if linha >= len(self.inicio) - 1:
+            return array('I')
+        return self.colunas[self.inicio[linha]:self.inicio[linha + 1]]
+
+    def contem(self, linha, coluna):
+        if linha >= len(self.inicio) - 1:
+            return False
+        fim = self.inicio[linha + 1]
+        i = bisect_left(self.colunas, coluna, self.inicio[linha], fim)
+        return i < fim and self.colunas[i] == coluna
+
+    def incorporar(self, chaves, total_linhas):
+        """
+        Acrescenta as entradas `chaves` (linha << 32 | coluna, ordenadas e
+        ausentes do CSR) e completa as linhas até `total_linhas`.
+        """
+        inicio, colunas = self.inicio, self.colunas
+        antigas = len(inicio) - 1
+        novo_inicio, novas = array('q', [0]), array('I')
+        copiada = 0  # primeira linha antiga ainda não copiada
+
+        def copiar_ate(limite):
+            # Copia em bloco as linhas antigas [copiada, limite), deslocando os inícios.
+            nonlocal copiada
+            limite = min(limite, antigas)
+            if copiada < limite:
+                deslocamento = len(novas) - inicio[copiada]
+                novas.extend(colunas[inicio[copiada]:inicio[limite]])
+                novo_inicio.extend(map(deslocamento.__add__, inicio[copiada + 1:limite + 1]))
+                copiada = limite
+
+        i, n = 0, len(chaves)
+        while i < n:
+            linha = chaves[i] >> 32
+            j = i
+            while j < n and chaves[j] >> 32 == linha:
+                j += 1
+            copiar_ate(linha)
+            # Linhas novas sem entradas antes desta.
+            while len(novo_inicio) <= linha:
+                novo_inicio.append(len(novas))
+            existentes = colunas[inicio[linha]:inicio[linha + 1]] if linha < antigas else ()
+            if existentes or j > i + 1:
+                novas.extend(sorted([*existentes, *(k & _MASCARA for k in chaves[i:j])]))
+            else:
+                # Caso mais comum: primeira entrada da linha.
+                novas.append(chaves[i] & _MASCARA)
+            novo_inicio.append(len(novas))
+            copiada = max(copiada, linha + 1)
+            i = j
+        copiar_ate(antigas)
+        while len(novo_inicio) <= total_linhas:
+            novo_inicio.append(len(novas))
+        self.inicio, self.colunas = novo_inicio, novas
+
+    def transposta(self, total_colunas):
+        # CSR da transposta por contagem (O(nnz)); as linhas saem ordenadas.
+        contagens = Counter(self.colunas)
+        inicio = array('q', [0])
+        for coluna in range(total_colunas):
+            inicio.append(inicio[-1] + contagens.get(coluna, 0))
+        posicao = array('q', inicio[:-1])
+        colunas = array('I', bytes(4 * len(self.colunas)))
+        for linha in range(len(self)):
+            for coluna in self.colunas[self.inicio[linha]:self.inicio[linha + 1]]:
+                colunas[posicao[coluna]] = linha
+                posicao[coluna] += 1
+        transposta = _LinhasCSR()
+        transposta.inicio, transposta.colunas = inicio, colunas
+        return transposta
+
+
+class MatrizCoengajamento:
+    """
+    Pares (usuário, conteúdo) engajados, em CSR por usuário e por conteúdo,
+    com consultas de conteúdos similares por cosseno.
+
+    Complexidades:
+        registrar: O(log r) amortizado, r = conteúdos do usuário
+        compactar: O(nnz + l + p log p), p = pares pendentes
+        conteudos_similares: O(a × r + c log k), com a <= limite_usuarios
+            usuários amostrados, r <= limite_linha e c candidatos
+        usuarios_em_comum, similaridade: O(m log M), m <= M usuários dos dois conteúdos
+    """
+    def __init__(self, limite_pendentes: int = LIMITE_PENDENTES):
+        if limite_pendentes <= 0:
+            raise ValueError("limite_pendentes deve ser positivo")
+        self.limite_pendentes = limite_pendentes
+        self._usuarios = {}
+        self._conteudos = {}
+        self._ids_usuarios = array('q')
+        self._ids_conteudos = array('q')
+        self._por_usuario = _LinhasCSR()
+        self._por_conteudo = _LinhasCSR()
+        self._pendentes = set()
+        self.entradas = 0
+
+    def registrar(self, id_usuario: int, id_conteudo: int):
+        # Marca o par como engajado (repetições são ignoradas).
+        u = self._usuarios.get(id_usuario)
+        if u is None:
+            u = self._usuarios[id_usuario] = len(self._ids_usuarios)
+            self._ids_usuarios.append(id_usuario)
+        c = self._conteudos.get(id_conteudo)
+        if c is None:
+            c = self._conteudos[id_conteudo] = len(self._ids_conteudos)
+            self._ids_conteudos.append(id_conteudo)
+        chave = u << 32 | c
+        if chave in self._pendentes or self._por_usuario.contem(u, c):
+            return
+        self._pendentes.add(chave)
+        if len(self._pendentes) >= max(self.limite_pendentes, self.entradas >> 3):
+            self.compactar()
+
+    def compactar(self):
+        """Incorpora os pares pendentes aos dois CSR."""
+        if not self._pendentes:
+            return
+        chaves = sorted(self._pendentes)
+        self._pendentes = set()
+        self._por_usuario.incorporar(chaves, len(self._ids_usuarios))
+        transpostas = sorted((k & _MASCARA) << 32 | k >> 32 for k in chaves)
+        self._por_conteudo.incorporar(transpostas, len(self._ids_conteudos))
+        self.entradas += len(chaves)
+
+    def __len__(self) -> int:
+        # Pares (usuário, conteúdo) distintos.
+        return self.entradas + len(self._pendentes)
+
+    def usuarios_do_conteudo(self, id_conteudo: int) -> int:
+        """Quantidade de usuários distintos que interagiram com o conteúdo."""
+        self.compactar()
+        c = self._conteudos.get(id_conteudo)
+        return 0 if c is None else self._por_conteudo.tamanho_linha(c)
+
+    def conteudos_do_usuario(self, id_usuario: int) -> list:
+        """IDs dos conteúdos com que o usuário interagiu, na ordem de primeira ocorrência dos conteúdos."""
+        self.compactar()
+        u = self._usuarios.get(id_usuario)
+        if u is None:
+            return []
+        return [self._ids_conteudos[c] for c in self._por_usuario.linha(u)]
+
+    def usuarios_em_comum(self, id_a: int, id_b: int) -> int:
+        """|U_a ∩ U_b| exato, por busca binária dos usuários do menor no maior."""
+        self.compactar()
+        a, b = self._conteudos.get(id_a), self._conteudos.get(id_b)
+        if a is None or b is None:
+            return 0
+        menor, maior = sorted((self._por_conteudo.linha(a), self._por_conteudo.linha(b)), key=len)
+        total = 0
+        for u in menor:
+            i = bisect_left(maior, u)
+            total += i < len(maior) and maior[i] == u
+        return total
+
+    def similaridade(self, id_a: int, id_b: int) -> float:
+        """Cosseno exato entre os conteúdos (0.0 se algum não tem usuários)."""
+        produto = self.usuarios_do_conteudo(id_a) * self.usuarios_do_conteudo(id_b)
+        return self.usuarios_em_comum(id_a, id_b) / sqrt(produto) if produto else 0.0
+
+    def conteudos_similares(self, id_conteudo: int, k: int = 10,
+                            limite_usuarios: int = LIMITE_USUARIOS_CONSULTA,
+                            limite_linha: int = LIMITE_LINHA) -> list:
+        """
+        Até k triplas (id_conteudo, similaridade, usuários em comum), da maior
+        similaridade para a menor, empates por ID crescente. Com amostragem
+        (mais de `limite_usuarios` usuários) os valores são estimativas.
+        """
+        if limite_usuarios <= 0 or limite_linha <= 0:
+            raise ValueError("limite_usuarios e limite_linha devem ser positivos")
+        self.compactar()
+        a = self._conteudos.get(id_conteudo)
+        if a is None or k <= 0:
+            return []
+        usuarios = self._por_conteudo.linha(a)
+        passo = -(-len(usuarios) // limite_usuarios)
+        amostra = usuarios[::passo] if passo > 1 else usuarios
+        escala = len(usuarios) / len(amostra)
+        inicio, colunas = self._por_usuario.inicio, self._por_usuario.colunas
+        comuns = Counter()
+        for u in amostra:
+            ini, fim = inicio[u], inicio[u + 1]
+            if fim - ini <= limite_linha:
+                comuns.update(colunas[ini:fim])
+        comuns.pop(a, None)
+        tamanho_a, tamanho = len(usuarios), self._por_conteudo.tamanho_linha
+        ids = self._ids_conteudos
+        melhores = heapq.nlargest(
+            k, ((min(1.0, comum * escala / sqrt(tamanho_a * tamanho(c))), -ids[c], comum)
+                for c, comum in comuns.items()))
+        return [(-id_neg, sim, round(comum * escala)) for sim, id_neg, comum in melhores]
+
+    def mesclar(self, outra):
+        # Acrescenta os pares de outra matriz (ex.: fatia da ingestão paralela).
+        outra.compactar()
+        ids_u, ids_c = outra._ids_usuarios, outra._ids_conteudos
+        for u in range(len(outra._por_usuario)):
+            id_u = ids_u[u]
+            for c in outra._por_usuario.linha(u):
+                self.registrar(id_u, ids_c[c])
+
+    def exportar(self) -> dict:
+        """
+        Estado como arrays (gravados como bytes no snapshot): só o CSR por
+        usuário; a transposta é remontada em importar.
+        """
+        self.compactar()
+        return {
+            'usuarios': self._ids_usuarios,
+            'conteudos': self._ids_conteudos,
+            'inicio': self._por_usuario.inicio,
+            'colunas': self._por_usuario.colunas,
+        }
+
+    @classmethod
+    def importar(cls, dados: dict, limite_pendentes: int = LIMITE_PENDENTES):
+        matriz = cls(limite_pendentes)
+        matriz._ids_usuarios = array('q', dados['usuarios'])
+        matriz._ids_conteudos = array('q', dados['conteudos'])
+        matriz._usuarios = {id_u: i for i, id_u in enumerate(matriz._ids_usuarios)}
+        matriz._conteudos = {id_c: i for i, id_c in enumerate(matriz._ids_conteudos)}
+        matriz._por_usuario.inicio = array('q', dados['inicio'])
+        matriz._por_usuario.colunas = array('I', dados['colunas'])
+        matriz._por_conteudo = matriz._por_usuario.transposta(len(matriz._ids_conteudos))
+        matriz.entradas = len(matriz._por_usuario.colunas)
+        return matriz
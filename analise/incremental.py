@@ -0,0 +1,140 @@
+"""
+Ingestão incremental de um CSV que só cresce (append-only).
+
+Para cada arquivo processado o sistema guarda um checkpoint:
+
+    offset      byte logo após o último registro completo processado
+    linhas      registros de dados lidos até o offset
+    cabecalho   SHA-1 da linha de cabeçalho
+    assinatura  SHA-1 dos últimos bytes antes do offset
+
+Na chamada seguinte a leitura começa no offset. Se o cabeçalho mudou, o
+arquivo ficou menor que o offset ou os bytes antes do offset não conferem, o
+arquivo foi truncado ou rotacionado: o estado agregado não pode ser
+"desfeito", então ele é descartado e o arquivo é relido do início.
+
+Uma linha final sem quebra de linha (ainda sendo escrita) não é consumida, e
+registros com quebra de linha dentro de aspas são montados antes da leitura.
+"""
+import csv
+import hashlib
+import os
+
+from analise.leitor_csv import registros_de_textos
+
+TAMANHO_ASSINATURA = 64
+
+
+def chave_checkpoint(caminho_arquivo: str) -> str:
+    return os.path.abspath(caminho_arquivo)
+
+
+def _sha1(dados: bytes) -> str:
+    return hashlib.sha1(dados).hexdigest()
+
+
+def _assinatura(arquivo, inicio_dados: int, offset: int) -> str:
+    inicio = max(inicio_dados, offset - TAMANHO_ASSINATURA)
+    arquivo.seek(inicio)
+    return _sha1(arquivo.read(offset - inicio))
+
+
+def checkpoint_valido(arquivo, checkpoint, cabecalho: bytes, inicio_dados: int, tamanho: int) -> bool:
+    """
+    Indica se `checkpoint` ainda descreve um prefixo de `arquivo` (aberto em
+    modo binário, com `tamanho` bytes e dados a partir de `inicio_dados`);
+    falso se o arquivo foi truncado ou rotacionado.
+    """
+    return (checkpoint['cabecalho'] == _sha1(cabecalho)
+            and checkpoint['offset'] <= tamanho
+            and checkpoint['assinatura'] == _assinatura(arquivo, inicio_dados, checkpoint['offset']))
+
+
+def montar_checkpoint(arquivo, cabecalho: bytes, inicio_dados: int, offset: int, linhas: int) -> dict:
+    """Checkpoint de `arquivo` lido até `offset`, com `linhas` registros de dados."""
+    return {
+        'offset': offset,
+        'linhas': linhas,
+        'cabecalho': _sha1(cabecalho),
+        'assinatura': _assinatura(arquivo, inicio_dados, offset),
+    }
+
+
+def registros_completos(arquivo, offset: int, incluir_final: bool = False):
+    """
+    Gera (texto, offset_final) para cada registro completo a partir de `offset`.
+    Um registro termina em '\\n' fora de aspas; o trecho final incompleto é
+    ignorado, salvo com `incluir_final=True` (arquivo já fechado, como em uma
+    fatia da ingestão paralela), em que ele sai como o último registro.
+    """
+    arquivo.seek(offset)
+    partes = []
+    aspas = 0
+    for linha in arquivo:
+        if not linha.endswith(b'\n'):
+            if incluir_final:
+                partes.append(linha)
+                break
+            return
+        partes.append(linha)
+        aspas += linha.count(b'"')
+        if aspas % 2:
+            continue
+        registro = b''.join(partes) if len(partes) > 1 else linha
+        partes = []
+        aspas = 0
+        offset += len(registro)
+        yield registro.decode('utf-8'), offset
+    if incluir_final and partes:
+        registro = b''.join(partes)
+        yield registro.decode('utf-8'), offset + len(registro)
+
+
+def processar_csv_incremental(sistema, caminho_arquivo: str, tamanho_lote: int = 1000,
+                              limite_fila: int = 10000) -> dict:
+    """
+    Aplica em `sistema` apenas os registros novos de `caminho_arquivo`.
+
+    Retorna o resumo da ingestão acrescido de `modo` ('completo' na primeira
+    leitura, 'incremental', 'recarga' após truncamento/rotação ou 'sem_dados'
+    se o cabeçalho ainda não está completo) e `linhas_novas`.
+    """
+    chave = chave_checkpoint(caminho_arquivo)
+    with open(caminho_arquivo, 'rb') as arquivo:
+        cabecalho = arquivo.readline()
+        if not cabecalho.endswith(b'\n'):
+            resumo = sistema.resumo_ingestao()
+            resumo.update(modo='sem_dados', linhas_novas=0)
+            return resumo
+        inicio_dados = arquivo.tell()
+        tamanho = os.fstat(arquivo.fileno()).st_size
+
+        checkpoint = sistema._checkpoints.get(chave)
+        if checkpoint is None:
+            modo, offset, linhas = 'completo', inicio_dados, 0
+        elif checkpoint_valido(arquivo, checkpoint, cabecalho, inicio_dados, tamanho):
+            modo, offset, linhas = 'incremental', checkpoint['offset'], checkpoint['linhas']
+        else:
+            sistema._reiniciar_estado()
+            modo, offset, linhas = 'recarga', inicio_dados, 0
+
+        colunas = next(csv.reader([cabecalho.decode('utf-8')]))
+        progresso = {'offset': offset, 'linhas': 0}
+
+        def textos():
+            for texto, fim in registros_completos(arquivo, offset):
+                progresso['offset'] = fim
+                yield texto
+
+        def linhas_lidas():
+            for registro in registros_de_textos(textos(), colunas):
+                progresso['linhas'] += 1
+                yield registro
+
+        sistema._ingerir_em_lotes(linhas_lidas(), tamanho_lote, limite_fila)
+
+        sistema._checkpoints[chave] = montar_checkpoint(
+            arquivo, cabecalho, inicio_dados, progresso['offset'], linhas + progresso['linhas'])
+    resumo = sistema.resumo_ingestao()
+    resumo.update(modo=modo, linhas_novas=progresso['linhas'])
+    return resumo
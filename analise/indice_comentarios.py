@@ -0,0 +1,251 @@
+"""
+Índice invertido dos textos de comentário (comment_text) para busca por termo.
+
+Cada comentário é normalizado (minúsculas, acentos removidos, como em
+'ação' -> 'acao') e quebrado em termos alfanuméricos; termos curtos e
+stopwords do português são descartados. Os termos recebem IDs inteiros na
+ordem de primeira ocorrência e o índice guarda, sem um objeto Python por
+ocorrência:
+
+    postings     por termo, pares (id_conteudo, id_usuario) intercalados em
+                 `array('i')` (IDs de 32 bits, como no armazenamento colunar),
+                 em ordem de registro (8 bytes por par)
+    por conteúdo contagem de cada termo nos comentários do conteúdo
+                 (dicionário ID do termo -> ocorrências), base de termos_frequentes
+    saturados    por termo saturado, o conjunto dos conteúdos que o citam
+
+A memória é limitada por `limite_vocabulario` (termos novos além dele não são
+indexados), por `limite_postings` (pares por termo; um termo que atinge o
+limite fica saturado: os pares seguintes entram só no conjunto de conteúdos
+do termo, no máximo um item por conteúdo), por `limite_postings_total` (pares
+somando todos os termos; esgotado o orçamento, todo termo que receber um par
+novo fica saturado da mesma forma, assim como um par com ID fora de 32 bits)
+e por `limite_termos_conteudo` (termos distintos contados por conteúdo; além
+dele, termos novos do conteúdo não entram em termos_frequentes, mas
+continuam nos postings e na busca). Os postings ocupam no máximo
+8 * limite_postings_total bytes e os conjuntos dos saturados crescem com os
+conteúdos distintos, não com o número de comentários.
+Comentários repetidos são tokenizados uma só vez (memória limitada, como o
+pool de textos de entidades.interacao).
+"""
+import re
+import unicodedata
+from array import array
+
+TAMANHO_MINIMO_TERMO = 2
+LIMITE_VOCABULARIO = 200_000
+LIMITE_POSTINGS = 1 << 20
+LIMITE_POSTINGS_TOTAL = 1 << 23
+LIMITE_TERMOS_CONTEUDO = 1024
+LIMITE_TOKENIZADOS = 100_000
+# Faixa de IDs que cabe nos postings (array 'i').
+_ID_MINIMO, _ID_MAXIMO = -(1 << 31), (1 << 31) - 1
+
+STOPWORDS = frozenset("""
+    a ao aos as com da das de do dos e ela ele elas eles em entre era essa esse
+    esta este eu foi ha isso isto ja la mais mas me meu minha muito na nao nas
+    nem no nos num numa o os ou para pela pelas pelo pelos por pra que se sem
+    ser seu sua so sao tem tb te tao to tu um uma umas uns vc voce voces
+""".split())
+
+_TERMO = re.compile(r'[a-z0-9]+')
+
+
+def normalizar_texto(texto: str) -> str:
+    """Minúsculas e sem acentos (decomposição NFKD sem as marcas combinantes)."""
+    decomposto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def tokenizar(texto: str) -> list:
+    """Termos indexáveis do texto, na ordem em que aparecem (com repetições)."""
+    return [t for t in _TERMO.findall(normalizar_texto(texto))
+            if len(t) >= TAMANHO_MINIMO_TERMO and t not in STOPWORDS]
+
+
+class IndiceComentarios:
+    """
+    Termo -> pares (conteúdo, usuário) dos comentários que o contêm.
+
+    Complexidades:
+        registrar: O(t) para t termos do comentário (O(1) por termo)
+        conteudos: O(p log p) para p pares dos termos consultados (para um
+            termo saturado, o número de conteúdos que o citam)
+        termos_frequentes: O(d log d) para d termos distintos contados no conteúdo
+    """
+    def __init__(self, limite_vocabulario: int = LIMITE_VOCABULARIO,
+                 limite_postings: int = LIMITE_POSTINGS,
+                 limite_termos_conteudo: int = LIMITE_TERMOS_CONTEUDO,
+                 limite_postings_total: int = LIMITE_POSTINGS_TOTAL):
+        if min(limite_vocabulario, limite_postings, limite_termos_conteudo, limite_postings_total) <= 0:
+            raise ValueError("limite_vocabulario, limite_postings, limite_termos_conteudo e "
+                             "limite_postings_total devem ser positivos")
+        self.limite_vocabulario = limite_vocabulario
+        self.limite_postings = limite_postings
+        self.limite_termos_conteudo = limite_termos_conteudo
+        self.limite_postings_total = limite_postings_total
+        self.total_postings = 0
+        self._ids = {}
+        self._termos = []
+        self._postings = []
+        self._por_conteudo = {}
+        self._saturados = {}
+        self._tokenizados = {}
+        self.comentarios = 0
+        self.termos_ignorados = 0
+
+    def registrar(self, id_conteudo: int, id_usuario: int, texto: str):
+        # Indexa os termos de um comentário; cada termo recebe o par uma vez por comentário.
+        tokenizado = self._tokenizados.get(texto)
+        if tokenizado is None:
+            termos = tokenizar(texto)
+            ids = [i for i in map(self._id, termos) if i is not None]
+            tokenizado = (ids, len(termos) - len(ids))
+            if len(self._tokenizados) < LIMITE_TOKENIZADOS:
+                self._tokenizados[texto] = tokenizado
+        ids, ignorados = tokenizado
+        self.comentarios += 1
+        self.termos_ignorados += ignorados
+        if not ids:
+            return
+        contagem = self._por_conteudo.get(id_conteudo)
+        if contagem is None:
+            contagem = self._por_conteudo[id_conteudo] = {}
+        for i in ids:
+            if i in contagem:
+                contagem[i] += 1
+            elif len(contagem) < self.limite_termos_conteudo:
+                contagem[i] = 1
+        postings = self._postings
+        # Um par com ID fora de 32 bits não cabe nos postings e satura o termo.
+        cabe = _ID_MINIMO <= min(id_conteudo, id_usuario) and max(id_conteudo, id_usuario) <= _ID_MAXIMO
+        for i in set(ids):
+            pares = postings[i]
+            if cabe and i not in self._saturados and len(pares) < 2 * self.limite_postings \
+                    and self.total_postings < self.limite_postings_total:
+                pares.append(id_conteudo)
+                pares.append(id_usuario)
+                self.total_postings += 1
+            else:
+                self._conteudos_saturado(i).add(id_conteudo)
+
+    def conteudos(self, consulta: str) -> list:
+        """
+        IDs (crescentes) dos conteúdos com comentários que mencionam todos os
+        termos da consulta. Consultas sem termo indexável retornam [].
+        """
+        ids = []
+        for termo in set(tokenizar(consulta)):
+            i = self._ids.get(termo)
+            if i is None:
+                return []
+            ids.append(i)
+        resultado = None
+        for i in ids:
+            encontrados = self._saturados.get(i)
+            if encontrados is None:
+                encontrados = set(self._postings[i][::2])
+            resultado = encontrados if resultado is None else resultado & encontrados
+        return sorted(resultado) if resultado else []
+
+    def pares(self, termo: str) -> list:
+        """
+        Pares (id_conteudo, id_usuario) dos comentários com `termo`, em ordem de
+        registro (no máximo limite_postings; ver saturado).
+        """
+        i = self._ids.get(normalizar_texto(termo))
+        if i is None:
+            return []
+        pares = self._postings[i]
+        return list(zip(pares[::2], pares[1::2]))
+
+    def saturado(self, termo: str) -> bool:
+        return self._ids.get(normalizar_texto(termo)) in self._saturados
+
+    def termos_frequentes(self, id_conteudo: int, n: int = 10) -> list:
+        """Até n pares (termo, ocorrências) do conteúdo; empates pelo termo."""
+        contagem = self._por_conteudo.get(id_conteudo, {})
+        termos = self._termos
+        ordenados = sorted(contagem.items(), key=lambda item: (-item[1], termos[item[0]]))
+        return [(termos[i], qtd) for i, qtd in ordenados[:n]]
+
+    def __len__(self) -> int:
+        return len(self._termos)
+
+    def mesclar(self, outro):
+        # Acrescenta o índice de outro shard (ex.: fatia da ingestão paralela), em ordem.
+        mapa = list(map(self._id, outro._termos))
+        for i, destino in enumerate(mapa):
+            if destino is None:
+                continue
+            origem = outro._postings[i]
+            pares = self._postings[destino]
+            espaco = 0
+            if destino not in self._saturados:
+                espaco = max(0, min(2 * self.limite_postings - len(pares),
+                                    2 * (self.limite_postings_total - self.total_postings)))
+            pares.extend(origem[:espaco])
+            self.total_postings += min(espaco, len(origem)) // 2
+            saturado = outro._saturados.get(i)
+            if espaco < len(origem) or saturado is not None:
+                self._conteudos_saturado(destino).update(origem[::2] if saturado is None else saturado)
+        limite = self.limite_termos_conteudo
+        for id_conteudo, outra in outro._por_conteudo.items():
+            contagem = self._por_conteudo.setdefault(id_conteudo, {})
+            for i, qtd in outra.items():
+                # Termos do outro que não couberam no vocabulário deste índice ficam de fora.
+                destino = mapa[i]
+                if destino is None:
+                    self.termos_ignorados += qtd
+                elif destino in contagem:
+                    contagem[destino] += qtd
+                elif len(contagem) < limite:
+                    contagem[destino] = qtd
+        self.comentarios += outro.comentarios
+        self.termos_ignorados += outro.termos_ignorados
+
+    def exportar(self) -> dict:
+        """Estado com os postings como arrays (gravados como bytes no snapshot)."""
+        return {
+            'limite_vocabulario': self.limite_vocabulario,
+            'limite_postings': self.limite_postings,
+            'limite_termos_conteudo': self.limite_termos_conteudo,
+            'limite_postings_total': self.limite_postings_total,
+            'termos': self._termos,
+            'postings': list(self._postings),
+            'por_conteudo': [[c, list(t), list(t.values())] for c, t in self._por_conteudo.items()],
+            'saturados': [[i, sorted(c)] for i, c in self._saturados.items()],
+            'comentarios': self.comentarios,
+            'termos_ignorados': self.termos_ignorados,
+        }
+
+    @classmethod
+    def importar(cls, dados: dict):
+        indice = cls(dados['limite_vocabulario'], dados['limite_postings'],
+                     dados['limite_termos_conteudo'],
+                     dados.get('limite_postings_total', LIMITE_POSTINGS_TOTAL))
+        indice._termos = dados['termos']
+        indice._ids = {termo: i for i, termo in enumerate(indice._termos)}
+        indice._postings = [array('i', p) for p in dados['postings']]
+        indice.total_postings = sum(len(p) for p in indice._postings) // 2
+        indice._por_conteudo = {c: dict(zip(t, q)) for c, t, q in dados['por_conteudo']}
+        indice._saturados = {i: set(c) for i, c in dados['saturados']}
+        indice.comentarios = dados['comentarios']
+        indice.termos_ignorados = dados['termos_ignorados']
+        return indice
+
+    def _conteudos_saturado(self, i):
+        # Conjunto de conteúdos do termo i, criado (a partir dos postings, ainda completos) ao saturar.
+        conteudos = self._saturados.get(i)
+        if conteudos is None:
+            conteudos = self._saturados[i] = set(self._postings[i][::2])
+        return conteudos
+
+    def _id(self, termo):
+        # ID do termo, criado se ainda houver espaço no vocabulário (senão None).
+        i = self._ids.get(termo)
+        if i is None and len(self._termos) < self.limite_vocabulario:
+            i = self._ids[termo] = len(self._termos)
+            self._termos.append(termo)
+            self._postings.append(array('i'))
+        return i
@@ -0,0 +1,305 @@
+"""
+Índice de agregados por intervalo de tempo (buckets) para consultas em janela.
+
+Cada interação com timestamp soma suas métricas no bucket que contém o seu
+instante (buckets de `largura_bucket` segundos alinhados à época), separado
+por conteúdo e plataforma e, se ativado, por usuário (com buckets próprios
+de `largura_bucket_usuarios` segundos). Uma consulta [inicio, fim) soma apenas
+os buckets da janela, sem revisitar interações; a granularidade da janela é
+a do bucket (o bucket que contém `inicio` entra inteiro).
+"""
+from array import array
+from bisect import bisect_left, insort
+from collections import namedtuple
+from datetime import date, datetime, time, timezone
+
+DIMENSOES = ('conteudos', 'usuarios', 'plataformas')
+_POSICOES = {dimensao: i for i, dimensao in enumerate(DIMENSOES)}
+
+# Métricas de uma entidade restritas a uma janela; os nomes dos campos são os
+# mesmos das entidades para que os relatórios possam ser exibidos igualmente.
+MetricasJanela = namedtuple('MetricasJanela', [
+    'id', 'nome', 'tempo_total_consumo', 'total_interacoes',
+    'total_visualizacoes', 'total_engajamento', 'total_comentarios',
+])
+
+_EPOCA = date(1970, 1, 1)
+
+# Memória de converter_timestamps: 'AAAA-MM-DD HH:MM:' -> início do minuto
+# (None quando inválido) e '00'..'59' -> segundos.
+LIMITE_MINUTOS_CONVERTIDOS = 100_000
+_MINUTOS_CONVERTIDOS = {}
+_SEGUNDOS = {f'{s:02d}': s for s in range(60)}
+
+
+def converter_timestamp(texto) -> int:
+    """Converte 'AAAA-MM-DD HH:MM:SS' (UTC) em segundos desde a época; None se ausente ou inválido."""
+    if not texto:
+        return None
+    if len(texto) > 10 and texto[10] not in ' T':
+        # fromisoformat (3.11+) aceita qualquer separador entre data e hora.
+        return None
+    try:
+        momento = datetime.fromisoformat(texto)
+    except ValueError:
+        return None
+    if momento.tzinfo is None:
+        momento = momento.replace(tzinfo=timezone.utc)
+    return int(momento.timestamp())
+
+
+def converter_timestamps(textos) -> list:
+    """
+    Versão em lote de converter_timestamp. Para textos 'AAAA-MM-DD HH:MM:SS'
+    o início de cada minuto é convertido uma vez e memorizado entre chamadas
+    (um arquivo tem poucos minutos distintos) e os segundos vêm de uma
+    tabela fixa; outros formatos usam converter_timestamp.
+    """
+    minutos, segundos = _MINUTOS_CONVERTIDOS, _SEGUNDOS
+    try:
+        # Caminho rápido: todos os minutos do lote já são conhecidos e válidos.
+        return [minutos[texto[:17]] + segundos[texto[17:]] for texto in textos]
+    except (KeyError, TypeError):
+        pass
+    if len(minutos) > LIMITE_MINUTOS_CONVERTIDOS:
+        minutos.clear()
+    epocas = []
+    for texto in textos:
+        if texto and len(texto) == 19:
+            prefixo = texto[:17]
+            minuto = minutos.get(prefixo, False)
+            if minuto is False:
+                minuto = minutos[prefixo] = _inicio_do_minuto(prefixo)
+            segundo = segundos.get(texto[17:])
+            if minuto is not None and segundo is not None:
+                epocas.append(minuto + segundo)
+                continue
+        epocas.append(converter_timestamp(texto))
+    return epocas
+
+
+def _inicio_do_minuto(prefixo):
+    # 'AAAA-MM-DD HH:MM:' -> segundos desde a época, ou None se inválido.
+    if prefixo[10] not in ' T' or prefixo[13] != ':' or prefixo[16] != ':':
+        return None
+    try:
+        dia = date.fromisoformat(prefixo[:10])
+        hora = time.fromisoformat(prefixo[11:16])
+    except ValueError:
+        return None
+    if hora.tzinfo is not None:
+        return None
+    return (dia - _EPOCA).days * 86400 + hora.hour * 3600 + hora.minute * 60
+
+
+def para_epoca(valor):
+    """
+    Normaliza int/float (segundos), datetime (ingênuo = UTC) ou texto ISO para
+    segundos; None continua None (janela aberta) e texto inválido é ValueError.
+    """
+    if valor is None or isinstance(valor, (int, float)):
+        return None if valor is None else int(valor)
+    if isinstance(valor, datetime):
+        if valor.tzinfo is None:
+            valor = valor.replace(tzinfo=timezone.utc)
+        return int(valor.timestamp())
+    epoca = converter_timestamp(valor)
+    if epoca is None:
+        raise ValueError(f"instante inválido: {valor!r}")
+    return epoca
+
+
+class _Agregados:
+    """
+    Métricas de uma dimensão em um bucket, em colunas tipadas: `chaves` na
+    ordem de chegada (array('q') para IDs, lista para nomes de plataforma),
+    `tempo` (float64) e `contagens` (uint32, interações, visualizações,
+    engajamento e comentários intercalados, 4 por chave). O mapa chave ->
+    linha é montado quando o bucket recebe interações ou é mesclado e
+    descartado pelo IndiceTemporal quando a ingestão passa a um bucket mais
+    novo; um evento atrasado o remonta.
+    """
+    __slots__ = ('chaves', 'tempo', 'contagens', '_linhas')
+
+    def __init__(self, chaves, tempo=None, contagens=None):
+        self.chaves = chaves
+        self.tempo = tempo if tempo is not None else array('d')
+        self.contagens = contagens if contagens is not None else array('I')
+        self._linhas = None
+
+    def __len__(self) -> int:
+        return len(self.tempo)
+
+    def linha(self, chave) -> int:
+        # Posição da chave nas colunas, criada zerada se nova.
+        linhas = self._linhas
+        if linhas is None:
+            linhas = self._linhas = {c: i for i, c in enumerate(self.chaves)}
+        i = linhas.get(chave)
+        if i is None:
+            i = linhas[chave] = len(self.tempo)
+            self.chaves.append(chave)
+            self.tempo.append(0.0)
+            self.contagens.extend(_ZERO_CONTAGENS)
+        return i
+
+    def somar_em(self, total: dict):
+        # Acumula as linhas em {chave: [métricas]}.
+        contagens = self.contagens
+        for i, (chave, tempo) in enumerate(zip(self.chaves, self.tempo)):
+            j = 4 * i
+            acc = total.get(chave)
+            if acc is None:
+                total[chave] = [tempo, *contagens[j:j + 4]]
+            else:
+                acc[0] += tempo
+                acc[1] += contagens[j]
+                acc[2] += contagens[j + 1]
+                acc[3] += contagens[j + 2]
+                acc[4] += contagens[j + 3]
+
+    def mesclar(self, outro):
+        # Soma as linhas de outro _Agregados da mesma dimensão e bucket.
+        tempo, contagens, outras = self.tempo, self.contagens, outro.contagens
+        for i, (chave, t) in enumerate(zip(outro.chaves, outro.tempo)):
+            k = self.linha(chave)
+            tempo[k] += t
+            for d in range(4):
+                contagens[4 * k + d] += outras[4 * i + d]
+
+
+_ZERO_CONTAGENS = array('I', [0, 0, 0, 0])
+
+
+class IndiceTemporal:
+    """
+    Buckets de tempo -> agregados por conteúdo, usuário e plataforma.
+
+    Cada dimensão guarda, por bucket, um _Agregados (colunas tipadas na ordem
+    dos campos de MetricasJanela, ~32 bytes por chave); só o bucket mais novo
+    de cada dimensão, e os que receberam eventos atrasados desde a sua
+    abertura, mantêm o mapa de linhas. A dimensão de usuários é opcional
+    (`largura_bucket_usuarios`, padrão desligada): seu tamanho acompanha os
+    pares (bucket, usuário), quase um por evento em buckets de uma hora,
+    então ela usa buckets próprios, em geral mais largos (ex.: um dia), e a
+    janela de relatórios de usuários é alinhada a essa largura.
+
+    Complexidades:
+        registrar: O(1) (O(b) ao criar um bucket fora de ordem, b = buckets)
+        agregar: O(log b + soma das entidades ativas nos buckets da janela)
+    """
+    def __init__(self, largura_bucket: int = 3600, largura_bucket_usuarios: int = None):
+        if largura_bucket <= 0 or (largura_bucket_usuarios is not None and largura_bucket_usuarios <= 0):
+            raise ValueError("largura_bucket e largura_bucket_usuarios devem ser positivas")
+        self.largura_bucket = largura_bucket
+        self.largura_bucket_usuarios = largura_bucket_usuarios
+        # Dimensão -> largura, {início: _Agregados} e inícios ordenados.
+        self._larguras = {'conteudos': largura_bucket, 'plataformas': largura_bucket}
+        if largura_bucket_usuarios is not None:
+            self._larguras['usuarios'] = largura_bucket_usuarios
+        self._buckets = {dimensao: {} for dimensao in self._larguras}
+        self._inicios = {dimensao: [] for dimensao in self._larguras}
+        # Dimensão -> buckets com o mapa de linhas montado desde o último bucket novo.
+        self._com_linhas = {dimensao: [] for dimensao in self._larguras}
+        self.sem_timestamp = 0
+
+    @property
+    def dimensoes(self) -> tuple:
+        return tuple(d for d in DIMENSOES if d in self._larguras)
+
+    def registrar(self, timestamp: int, id_conteudo, id_usuario, plataforma, tipo, duracao):
+        # Soma a interação no bucket do seu timestamp em cada dimensão; sem timestamp, só conta.
+        if timestamp is None:
+            self.sem_timestamp += 1
+            return
+        visualizacao = tipo == 'view_start'
+        engajamento = tipo in ('like', 'share', 'comment')
+        chaves = (id_conteudo, id_usuario, plataforma)
+        for dimensao in self._larguras:
+            agregados = self._bucket(dimensao, timestamp)
+            i = agregados.linha(chaves[_POSICOES[dimensao]])
+            contagens, j = agregados.contagens, 4 * i
+            contagens[j] += 1
+            if visualizacao:
+                agregados.tempo[i] += duracao
+                contagens[j + 1] += 1
+            elif engajamento:
+                contagens[j + 2] += 1
+                if tipo == 'comment':
+                    contagens[j + 3] += 1
+
+    def agregar(self, dimensao: str, inicio: int = None, fim: int = None) -> dict:
+        """Soma os buckets com início em [inicio alinhado, fim): {chave: [métricas]}."""
+        if dimensao not in DIMENSOES:
+            raise ValueError(f"dimensão deve ser uma de {DIMENSOES}")
+        if dimensao not in self._larguras:
+            raise ValueError("relatórios de usuários por janela exigem largura_bucket_usuarios")
+        largura, inicios = self._larguras[dimensao], self._inicios[dimensao]
+        lo = 0 if inicio is None else bisect_left(inicios, inicio - inicio % largura)
+        hi = len(inicios) if fim is None else bisect_left(inicios, fim)
+        total = {}
+        buckets = self._buckets[dimensao]
+        for inicio_bucket in inicios[lo:hi]:
+            buckets[inicio_bucket].somar_em(total)
+        return total
+
+    def intervalo(self):
+        """(início do primeiro bucket, fim do último) ou None se vazio."""
+        inicios = self._inicios['conteudos']
+        if not inicios:
+            return None
+        return inicios[0], inicios[-1] + self.largura_bucket
+
+    def mesclar(self, outro):
+        # Soma os buckets de outro índice com as mesmas larguras (ex.: parcial de um shard).
+        if outro._larguras != self._larguras:
+            raise ValueError("índices com larguras de bucket diferentes")
+        self.sem_timestamp += outro.sem_timestamp
+        for dimensao, buckets in outro._buckets.items():
+            for inicio_bucket in outro._inicios[dimensao]:
+                self._bucket(dimensao, inicio_bucket).mesclar(buckets[inicio_bucket])
+
+    def exportar(self) -> dict:
+        """
+        Estado por dimensão como [início, chaves, tempo, contagens] de cada
+        bucket; os arrays são gravados como bytes no snapshot.
+        """
+        return {
+            'largura_bucket': self.largura_bucket,
+            'largura_bucket_usuarios': self.largura_bucket_usuarios,
+            'sem_timestamp': self.sem_timestamp,
+            'buckets': {dimensao: [[inicio, a.chaves, a.tempo, a.contagens]
+                                   for inicio, a in ((i, self._buckets[dimensao][i]) for i in inicios)]
+                        for dimensao, inicios in self._inicios.items()},
+        }
+
+    @classmethod
+    def importar(cls, dados: dict):
+        indice = cls(dados['largura_bucket'], dados.get('largura_bucket_usuarios'))
+        indice.sem_timestamp = dados['sem_timestamp']
+        for dimensao, buckets in dados['buckets'].items():
+            for inicio, chaves, tempo, contagens in buckets:
+                indice._buckets[dimensao][inicio] = _Agregados(
+                    list(chaves) if dimensao == 'plataformas' else array('q', chaves),
+                    array('d', tempo), array('I', contagens))
+                indice._inicios[dimensao].append(inicio)
+        return indice
+
+    def _bucket(self, dimensao, timestamp):
+        inicio = timestamp - timestamp % self._larguras[dimensao]
+        buckets = self._buckets[dimensao]
+        agregados = buckets.get(inicio)
+        if agregados is None:
+            agregados = buckets[inicio] = _Agregados([] if dimensao == 'plataformas' else array('q'))
+            inicios = self._inicios[dimensao]
+            if not inicios or inicio > inicios[-1]:
+                # Bucket mais novo: os mapas de linhas dos anteriores deixam de ser mantidos.
+                for anterior in self._com_linhas[dimensao]:
+                    anterior._linhas = None
+                self._com_linhas[dimensao].clear()
+                inicios.append(inicio)
+            else:
+                insort(inicios, inicio)
+        if agregados._linhas is None:
+            self._com_linhas[dimensao].append(agregados)
+        return agregados
@@ -0,0 +1,181 @@
+"""
+Tipo de cada conteúdo (vídeo, podcast ou artigo) e índice secundário por tipo.
+
+O CSV não traz o tipo do conteúdo: ele é declarado (tipos_conteudo no
+sistema ou declarar_tipo_conteudo) ou inferido do nome na primeira
+ocorrência do conteúdo, sem diferenciar maiúsculas nem acentos:
+
+    'Podcast GE Tabelando'      -> podcast  (podcast, podcasts, episodio)
+    'Matéria: bastidores da...' -> artigo   (artigo, materia, noticia, coluna, blog)
+    demais nomes                -> video
+
+O conteúdo é criado já na subclasse do tipo (Video, Podcast, Artigo) e entra
+no IndiceTipos, que guarda por tipo os conteúdos (por ID) e os totais
+agregados do tipo, atualizados a cada interação. Listar os podcasts ou
+montar um ranking só de artigos custa o tamanho da resposta, sem percorrer
+todos os conteúdos nem comparar nomes de classe.
+"""
+import heapq
+from operator import attrgetter
+
+from analise.indice_comentarios import _TERMO, normalizar_texto
+from entidades.conteudo import Video, Podcast, Artigo
+from estruturas_dados.registro_hash import RegistroHash
+
+TIPOS_CONTEUDO = {'video': Video, 'podcast': Podcast, 'artigo': Artigo}
+TIPO_PADRAO = 'video'
+
+# Termos do nome que indicam o tipo, testados nesta ordem.
+TERMOS_TIPO = (
+    ('podcast', frozenset(('podcast', 'podcasts', 'episodio'))),
+    ('artigo', frozenset(('artigo', 'artigos', 'materia', 'noticia', 'noticias', 'coluna', 'blog'))),
+)
+
+
+def inferir_tipo_conteudo(nome: str) -> str:
+    """Tipo ('video', 'podcast' ou 'artigo') indicado pelos termos do nome do conteúdo."""
+    termos = set(_TERMO.findall(normalizar_texto(nome or '')))
+    for tipo, marcadores in TERMOS_TIPO:
+        if not termos.isdisjoint(marcadores):
+            return tipo
+    return TIPO_PADRAO
+
+
+def validar_tipo(tipo: str) -> str:
+    """Normaliza o tipo declarado ('Podcast', 'vídeo'...) ou lança ValueError."""
+    normalizado = normalizar_texto(str(tipo)).strip()
+    if normalizado not in TIPOS_CONTEUDO:
+        raise ValueError(f"tipo de conteúdo deve ser um de {tuple(TIPOS_CONTEUDO)}")
+    return normalizado
+
+
+class TotaisTipo:
+    """
+    Totais agregados dos conteúdos de um tipo, com os mesmos nomes de
+    atributo das métricas de Conteudo.
+
+    Complexidades:
+        registrar, somar: O(1)
+    """
+    __slots__ = ('tipo', 'conteudos', 'total_interacoes', 'tempo_total_consumo',
+                 'total_visualizacoes', 'total_engajamento', 'total_comentarios')
+
+    def __init__(self, tipo: str):
+        self.tipo = tipo
+        self.conteudos = 0
+        self.total_interacoes = 0
+        self.tempo_total_consumo = 0.0
+        self.total_visualizacoes = 0
+        self.total_engajamento = 0
+        self.total_comentarios = 0
+
+    def registrar(self, tipo_interacao: str, duracao: float):
+        # Mesma contabilidade de Conteudo.registrar_interacao.
+        self.total_interacoes += 1
+        if tipo_interacao == "view_start":
+            self.total_visualizacoes += 1
+            self.tempo_total_consumo += duracao
+        elif tipo_interacao in ("like", "share", "comment"):
+            self.total_engajamento += 1
+            if tipo_interacao == "comment":
+                self.total_comentarios += 1
+
+    def somar(self, entidade, sinal: int = 1):
+        # Soma (ou, com sinal=-1, subtrai) as métricas já agregadas de um conteúdo.
+        self.total_interacoes += sinal * entidade.total_interacoes
+        self.tempo_total_consumo += sinal * entidade.tempo_total_consumo
+        self.total_visualizacoes += sinal * entidade.total_visualizacoes
+        self.total_engajamento += sinal * entidade.total_engajamento
+        self.total_comentarios += sinal * entidade.total_comentarios
+
+    def calcular_media_tempo_consumo(self) -> float:
+        return self.tempo_total_consumo / self.total_visualizacoes if self.total_visualizacoes else 0.0
+
+    def como_dict(self) -> dict:
+        return {'conteudos': self.conteudos, 'total_interacoes': self.total_interacoes,
+                'tempo_total_consumo': self.tempo_total_consumo,
+                'total_visualizacoes': self.total_visualizacoes,
+                'total_engajamento': self.total_engajamento,
+                'total_comentarios': self.total_comentarios}
+
+    def __repr__(self):
+        return f"<TotaisTipo tipo='{self.tipo}' conteudos={self.conteudos} interacoes={self.total_interacoes}>"
+
+
+class IndiceTipos:
+    """
+    Índice secundário tipo -> conteúdos (RegistroHash por ID), com os
+    TotaisTipo de cada tipo. Os tipos aparecem na ordem de primeira ocorrência.
+
+    Complexidades:
+        adicionar, remover, registrar, acumular: O(1) médio
+        conteudos(tipo): O(k), k = conteúdos do tipo (O(k log k) se chegaram fora de ordem de ID)
+        ranking(tipo, atributo, n): O(k log n)
+        totais: O(t), t = tipos
+    """
+    def __init__(self):
+        self._conteudos = {}
+        self._totais = {}
+
+    @classmethod
+    def de_conteudos(cls, conteudos):
+        """Índice montado a partir de conteúdos já agregados (ex.: snapshot ou parciais mesclados)."""
+        indice = cls()
+        for conteudo in conteudos:
+            indice.adicionar(conteudo)
+        return indice
+
+    def adicionar(self, conteudo):
+        # Indexa o conteúdo pelo seu tipo e soma as métricas que ele já tiver.
+        tipo = conteudo.tipo_conteudo
+        registro = self._conteudos.get(tipo)
+        if registro is None:
+            registro = self._conteudos[tipo] = RegistroHash()
+            self._totais[tipo] = TotaisTipo(tipo)
+        registro.inserir(conteudo.id, conteudo)
+        totais = self._totais[tipo]
+        totais.conteudos += 1
+        totais.somar(conteudo)
+
+    def remover(self, conteudo):
+        # Retira o conteúdo (e suas métricas) do tipo atual, antes de uma reclassificação.
+        tipo = conteudo.tipo_conteudo
+        registro = self._conteudos.get(tipo)
+        if registro is None or registro.buscar(conteudo.id) is None:
+            return
+        registro.remover(conteudo.id)
+        totais = self._totais[tipo]
+        totais.conteudos -= 1
+        totais.somar(conteudo, -1)
+
+    def registrar(self, tipo: str, tipo_interacao: str, duracao: float):
+        # Uma interação nova em um conteúdo do tipo (já indexado).
+        self._totais[tipo].registrar(tipo_interacao, duracao)
+
+    def acumular(self, conteudo, parcial):
+        # Soma ao tipo de `conteudo` as métricas de `parcial`, outra instância do mesmo conteúdo.
+        self._totais[conteudo.tipo_conteudo].somar(parcial)
+
+    def tipos(self) -> list:
+        return list(self._totais)
+
+    def conteudos(self, tipo: str) -> list:
+        """Conteúdos do tipo em ordem de ID ([] para tipos sem conteúdo)."""
+        registro = self._conteudos.get(tipo)
+        return [v for _, v in registro.percurso_em_ordem()] if registro is not None else []
+
+    def contar(self, tipo: str) -> int:
+        registro = self._conteudos.get(tipo)
+        return len(registro) if registro is not None else 0
+
+    def totais(self) -> dict:
+        """{tipo: TotaisTipo}, na ordem de primeira ocorrência dos tipos."""
+        return dict(self._totais)
+
+    def ranking(self, tipo: str, atributo: str, n: int = None) -> list:
+        """Conteúdos do tipo por `atributo` decrescente; empates em ordem de ID."""
+        lista = self.conteudos(tipo)
+        chave = attrgetter(atributo)
+        if n:
+            return heapq.nlargest(n, lista, key=chave)
+        return sorted(lista, key=chave, reverse=True)
@@ -0,0 +1,140 @@
+"""
+Contadores, cronômetros por etapa e captura de perfil da ingestão e dos relatórios.
+
+SistemaAnaliseEngajamento só mede quando tem uma Instrumentacao ativa
+(instrumentar=True ou ativar_instrumentacao); desligada, cada ponto de
+medição custa um teste `is not None` por lote, não por linha.
+
+As etapas são cronometradas por lote (leitura do CSV, normalização e
+registro), e as buscas nos índices por amostragem: a cada `amostragem`
+registros, a busca do conteúdo e a do usuário são repetidas e medidas à
+parte, o que estima a latência sem pôr um relógio em cada linha. Cada
+relatório calculado (fora do cache) é cronometrado pelo nome.
+
+Para a captura completa de uma execução, perfilar() liga o cProfile:
+
+    with perfilar() as perfil:
+        sistema.processar_csv_em_fluxo(caminho)
+    print(perfil.resumo())
+"""
+import cProfile
+import io
+import pstats
+import time
+from contextlib import contextmanager
+
+# A cada quantos registros as buscas nos índices são cronometradas.
+AMOSTRAGEM_BUSCAS = 64
+
+
+class Instrumentacao:
+    """
+    Contadores (inteiros), máximos e tempos acumulados (soma e chamadas) por nome.
+
+    Complexidades:
+        contar, registrar_maximo, acumular: O(1)
+        estatisticas: O(k), k = nomes medidos
+    """
+    def __init__(self, amostragem: int = AMOSTRAGEM_BUSCAS):
+        if amostragem <= 0:
+            raise ValueError("amostragem deve ser positiva")
+        self.amostragem = amostragem
+        self.contadores = {}
+        self.maximos = {}
+        self.tempos = {}
+
+    def contar(self, nome: str, quantidade: int = 1):
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def registrar_maximo(self, nome: str, valor):
+        if valor > self.maximos.get(nome, valor - 1):
+            self.maximos[nome] = valor
+
+    def acumular(self, nome: str, segundos: float, chamadas: int = 1):
+        # Soma `segundos` ao tempo da etapa (chamadas > 1 para medições de um lote).
+        tempo = self.tempos.get(nome)
+        if tempo is None:
+            self.tempos[nome] = [segundos, chamadas]
+        else:
+            tempo[0] += segundos
+            tempo[1] += chamadas
+
+    @contextmanager
+    def cronometrar(self, nome: str, chamadas: int = 1):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.acumular(nome, time.perf_counter() - inicio, chamadas)
+
+    def zerar(self):
+        self.contadores.clear()
+        self.maximos.clear()
+        self.tempos.clear()
+
+    def estatisticas(self) -> dict:
+        """
+        {'contadores': {...}, 'maximos': {...}, 'tempos': {nome: {'total_s',
+        'chamadas', 'media_us'}}}, em tipos JSON.
+        """
+        tempos = {nome: {'total_s': total, 'chamadas': chamadas,
+                         'media_us': total / chamadas * 1e6 if chamadas else 0.0}
+                  for nome, (total, chamadas) in sorted(self.tempos.items())}
+        return {'contadores': dict(sorted(self.contadores.items())),
+                'maximos': dict(sorted(self.maximos.items())), 'tempos': tempos}
+
+
+class Perfil:
+    """Resultado de perfilar(): as estatísticas do cProfile (pstats.Stats) e um resumo em texto."""
+    def __init__(self):
+        self.estatisticas = None
+
+    def resumo(self, linhas: int = 20, ordem: str = 'cumulative') -> str:
+        if self.estatisticas is None:
+            return ''
+        saida = io.StringIO()
+        self.estatisticas.stream = saida
+        self.estatisticas.sort_stats(ordem).print_stats(linhas)
+        return saida.getvalue()
+
+
+@contextmanager
+def perfilar(caminho: str = None):
+    """
+    Executa o bloco sob o cProfile e entrega um Perfil, preenchido na saída
+    do bloco; com `caminho`, grava também o arquivo .prof (pstats/snakeviz).
+    """
+    perfil = Perfil()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield perfil
+    finally:
+        profiler.disable()
+        if caminho:
+            profiler.dump_stats(caminho)
+        perfil.estatisticas = pstats.Stats(profiler)
+
+
+def formatar_estatisticas(estatisticas: dict) -> str:
+    """Texto legível de SistemaAnaliseEngajamento.estatisticas()."""
+    linhas = []
+    indices = estatisticas['indices']
+    for nome in ('conteudos', 'usuarios'):
+        altura = indices[nome]['altura']
+        linhas.append(f"índice de {nome}: {indices[nome]['tipo']}, {indices[nome]['nos']} nós"
+                      + (f", altura {altura}" if altura is not None else ""))
+    linhas.append(f"plataformas: {indices['plataformas']}")
+    linhas.append(f"fila: {estatisticas['fila']} itens; cache de relatórios: {estatisticas['cache']} resultados")
+    medicoes = estatisticas.get('instrumentacao')
+    if medicoes is None:
+        linhas.append("instrumentação desligada")
+        return "\n".join(linhas)
+    for nome, valor in medicoes['contadores'].items():
+        linhas.append(f"  {nome:<32}{valor:>14,}")
+    for nome, valor in medicoes['maximos'].items():
+        linhas.append(f"  {nome + ' (máx.)':<32}{valor:>14,}")
+    for nome, tempo in medicoes['tempos'].items():
+        linhas.append(f"  {nome:<32}{tempo['total_s']:>12.3f}s {tempo['chamadas']:>10,}x "
+                      f"{tempo['media_us']:>10.2f}µs")
+    return "\n".join(linhas)
@@ -0,0 +1,150 @@
+"""
+Leitor posicional de CSV para a ingestão, no lugar de csv.DictReader.
+
+O arquivo é lido em blocos grandes de texto e cada bloco é quebrado em linhas
+de uma vez. Linhas sem aspas (a grande maioria) são divididas com str.split;
+só as que têm aspas passam pelo módulo csv, o que mantém a semântica de
+campos entre aspas com vírgulas ou quebras de linha (uma linha com número
+ímpar de aspas é juntada às seguintes até o registro fechar).
+
+O cabeçalho é resolvido uma única vez para as posições de COLUNAS, e cada
+registro sai como uma tupla de strings nessa ordem, sem montar um dicionário
+por linha. Colunas ausentes no cabeçalho (ou no final de uma linha curta)
+viram None, como em DictReader. A conversão de tipos fica para
+analise.sistema.normalizar_lote, que trabalha por lote de registros.
+"""
+import csv
+from operator import itemgetter
+
+# Ordem dos campos nas tuplas produzidas pelo leitor.
+COLUNAS = ('id_conteudo', 'nome_conteudo', 'id_usuario', 'timestamp_interacao',
+           'plataforma', 'tipo_interacao', 'watch_duration_seconds', 'comment_text')
+
+TAMANHO_BLOCO = 1 << 16
+
+
+class _Posicoes:
+    # Extrai as colunas de COLUNAS de uma lista de campos com o cabeçalho `colunas`.
+    def __init__(self, colunas):
+        self.largura = len(colunas)
+        posicoes = [colunas.index(c) if c in colunas else self.largura for c in COLUNAS]
+        self.completo = self.largura not in posicoes
+        self.extrair = itemgetter(*posicoes)
+
+    def tupla(self, campos):
+        if self.completo and len(campos) >= self.largura:
+            return self.extrair(campos)
+        # Linha curta ou coluna ausente: completa com None (posição `largura`).
+        campos = campos[:self.largura]
+        campos.extend([None] * (self.largura + 1 - len(campos)))
+        return self.extrair(campos)
+
+    def tuplas(self, lista_campos):
+        if self.completo:
+            try:
+                # itemgetter sobre cada lista, sem chamada Python por linha.
+                return list(map(self.extrair, lista_campos))
+            except IndexError:
+                pass
+        return [self.tupla(campos) for campos in lista_campos]
+
+
+def _campos_com_aspas(texto):
+    return next(csv.reader([texto]), [])
+
+
+def _dividir(textos, posicoes):
+    # Textos de registros -> tuplas; linhas vazias são puladas, como em DictReader.
+    return posicoes.tuplas([t.split(',') if '"' not in t else _campos_com_aspas(t)
+                            for t in textos if t])
+
+
+def registros_de_textos(textos, colunas):
+    """
+    Converte textos de registros completos (um por item, com ou sem a quebra
+    de linha final) em tuplas na ordem de COLUNAS. Linhas vazias são puladas.
+    """
+    posicoes = _Posicoes(colunas)
+    for texto in textos:
+        if '"' in texto:
+            campos = _campos_com_aspas(texto)
+        else:
+            texto = texto.rstrip('\r\n')
+            campos = texto.split(',') if texto else None
+        if campos:
+            yield posicoes.tupla(campos)
+
+
+def blocos_de_textos(arquivo, tamanho_bloco: int = TAMANHO_BLOCO):
+    """
+    Lê `arquivo` (texto, newline='') em blocos e gera, por bloco, a lista dos
+    textos de registro, sem a quebra de linha final ('\n' ou '\r\n').
+    Registros com quebra de linha entre aspas saem inteiros.
+    """
+    resto = ''
+    pendente = None
+    while True:
+        bloco = arquivo.read(tamanho_bloco)
+        if not bloco:
+            break
+        bloco = resto + bloco
+        if pendente is None and '"' not in bloco:
+            # Sem aspas no bloco, '\r\n' só pode ser fim de registro.
+            linhas = bloco.replace('\r\n', '\n').split('\n')
+            resto = linhas.pop()
+            yield linhas
+            continue
+        # Com todas as quebras em '\r\n' (ou nenhum '\r'), os pedaços já são as linhas sem terminador.
+        if '\r' in bloco:
+            linhas = bloco.split('\r\n')
+            uniforme = len(linhas) - 1 == bloco.count('\n')
+        else:
+            linhas = bloco.split('\n')
+            uniforme = True
+        resto = linhas.pop()
+        if pendente is None and uniforme and not any(
+                linha.count('"') % 2 for linha in linhas if '"' in linha):
+            # Toda linha com aspas fecha o próprio registro: as linhas já são os registros.
+            yield linhas
+            continue
+        if '\r' in bloco:
+            linhas = bloco.split('\n')
+            resto = linhas.pop()
+        textos = []
+        for linha in linhas:
+            if pendente is not None:
+                pendente.append(linha)
+                if linha.count('"') % 2:
+                    textos.append('\n'.join(pendente))
+                    pendente = None
+            elif '"' not in linha:
+                textos.append(linha[:-1] if linha.endswith('\r') else linha)
+            elif linha.count('"') % 2:
+                pendente = [linha]
+            else:
+                textos.append(linha)
+        yield textos
+    if pendente is not None:
+        pendente.append(resto)
+        yield ['\n'.join(pendente)]
+    elif resto:
+        yield [resto if '"' in resto else resto.rstrip('\r')]
+
+
+def ler_lotes(caminho_arquivo: str, tamanho_bloco: int = TAMANHO_BLOCO):
+    """Gera, por bloco lido, a lista de tuplas (ordem de COLUNAS) dos registros de dados do CSV."""
+    with open(caminho_arquivo, newline='', encoding='utf-8') as arquivo:
+        cabecalho = arquivo.readline()
+        if not cabecalho:
+            return
+        posicoes = _Posicoes(next(csv.reader([cabecalho])))
+        for textos in blocos_de_textos(arquivo, tamanho_bloco):
+            registros = _dividir(textos, posicoes)
+            if registros:
+                yield registros
+
+
+def ler_registros(caminho_arquivo: str, tamanho_bloco: int = TAMANHO_BLOCO):
+    """Gera as tuplas (ordem de COLUNAS) de todos os registros de dados do CSV."""
+    for lote in ler_lotes(caminho_arquivo, tamanho_bloco):
+        yield from lote
@@ -0,0 +1,228 @@
+"""
+Ingestão paralela do CSV em fatias de bytes processadas por um pool de processos.
+
+Cada processo agrega sua fatia em um SistemaAnaliseEngajamento próprio
+(indexado por RegistroHash) e devolve as entidades agregadas, sempre sem a
+lista bruta de interações: as interações formam ciclos com as entidades
+(Interacao -> Usuario -> Interacao...) que estouram a recursão do pickle.
+Se o sistema de destino guarda as interações, a fatia devolve também seus
+eventos, na ordem do arquivo, como tuplas planas (id do conteúdo, id do
+usuário, plataforma, tipo, duração, comentário, timestamp), e o processo
+principal recria as Interacao ligadas às suas próprias entidades. Os
+parciais são mesclados na ordem das fatias, o que preserva a ordem de
+primeira ocorrência de plataformas, nomes de conteúdo, tipos e comentários,
+e a ordem das interações de cada entidade.
+
+Limitações:
+    - Somas de ponto flutuante são associadas por fatia; para durações com
+      casas decimais o tempo total pode diferir do caminho serial no último bit.
+"""
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from analise.incremental import registros_completos
+from analise.leitor_csv import registros_de_textos
+from estruturas_dados.registro_hash import RegistroHash
+
+
+def ler_cabecalho(caminho_arquivo: str):
+    """Retorna (lista de colunas, offset em bytes do início dos dados)."""
+    with open(caminho_arquivo, 'rb') as arquivo:
+        primeira = arquivo.readline()
+        colunas = next(csv.reader([primeira.decode('utf-8')]))
+        return colunas, arquivo.tell()
+
+
+def _contar_aspas(arquivo, inicio: int, fim: int, bloco: int = 1 << 20) -> int:
+    # Conta os '"' de [inicio, fim) em blocos, sem separar linhas.
+    arquivo.seek(inicio)
+    total = 0
+    while inicio < fim:
+        dados = arquivo.read(min(bloco, fim - inicio))
+        if not dados:
+            break
+        total += dados.count(b'"')
+        inicio += len(dados)
+    return total
+
+
+def dividir_em_fatias(caminho_arquivo: str, partes: int, inicio_dados: int):
+    """
+    Divide [inicio_dados, fim do arquivo) em até `partes` intervalos de bytes
+    que começam sempre no início de um registro. Retorna lista de (inicio, fim).
+
+    A paridade de aspas é acumulada desde o limite anterior: uma quebra de
+    linha só encerra registro fora de aspas, então o corte avança linha a
+    linha a partir do alvo até a paridade ficar par.
+
+    Complexidades:
+        Tempo: O(B) sobre os B bytes de dados (contagem em blocos)
+        Espaço: O(tamanho do bloco)
+    """
+    tamanho = os.path.getsize(caminho_arquivo)
+    if tamanho <= inicio_dados:
+        return []
+    passo = max(1, (tamanho - inicio_dados) // max(1, partes))
+    limites = [inicio_dados]
+    posicao = inicio_dados
+    aspas = 0
+    with open(caminho_arquivo, 'rb') as arquivo:
+        for i in range(1, partes):
+            alvo = inicio_dados + i * passo
+            if alvo <= posicao:
+                continue
+            aspas += _contar_aspas(arquivo, posicao, alvo - 1)
+            arquivo.seek(alvo - 1)
+            posicao = alvo - 1
+            # Avança até uma quebra de linha fora de aspas (se alvo-1 já é '\n'
+            # fora de aspas, o corte fica no próprio alvo).
+            while True:
+                linha = arquivo.readline()
+                if not linha:
+                    break
+                posicao += len(linha)
+                aspas += linha.count(b'"')
+                if aspas % 2 == 0:
+                    break
+            if posicao >= tamanho:
+                break
+            limites.append(posicao)
+    limites.append(tamanho)
+    return list(zip(limites, limites[1:]))
+
+
+def _registros_da_fatia(arquivo, inicio: int, fim: int):
+    # A fatia começa em início de registro; o último registro dela termina em `fim`.
+    for texto, offset in registros_completos(arquivo, inicio, incluir_final=True):
+        yield texto
+        if offset >= fim:
+            break
+
+
+def _agregar_fatia(caminho_arquivo, colunas, inicio, fim, opcoes, devolver_eventos=False):
+    # Executado no processo filho: agrega a fatia e devolve o estado agregado
+    # (e, com `devolver_eventos`, os eventos em tuplas planas).
+    from analise.sistema import SistemaAnaliseEngajamento, TAMANHO_LOTE_NORMALIZACAO
+    parcial = SistemaAnaliseEngajamento(classe_arvore=RegistroHash, guardar_interacoes=False, **opcoes)
+    if devolver_eventos:
+        parcial._eventos = []
+    with open(caminho_arquivo, 'rb') as arquivo:
+        parcial._ingerir_em_lotes(registros_de_textos(_registros_da_fatia(arquivo, inicio, fim), colunas),
+                                  TAMANHO_LOTE_NORMALIZACAO, TAMANHO_LOTE_NORMALIZACAO)
+    return (
+        parcial._arvore_conteudos.valores(),
+        parcial._arvore_usuarios.valores(),
+        list(parcial._plataformas_registradas.values()),
+        parcial._linhas_rejeitadas,
+        parcial._total_registradas,
+        parcial._indice_temporal,
+        parcial._indice_comentarios,
+        parcial._coengajamento,
+        parcial._eventos,
+    )
+
+
+def carregar_csv_paralelo(sistema, caminho_arquivo: str, num_processos: int = None) -> dict:
+    """
+    Ingere o CSV em `sistema` usando `num_processos` processos (padrão: os.cpu_count()).
+
+    Com guardar_interacoes (padrão do sistema) cada fatia devolve também uma
+    tupla por evento, o que encarece a transferência e a mescla; sistemas que
+    só precisam das métricas devem usar guardar_interacoes=False.
+    Retorna o resumo da ingestão do sistema.
+    """
+    num_processos = num_processos or os.cpu_count() or 1
+    colunas, inicio_dados = ler_cabecalho(caminho_arquivo)
+    fatias = dividir_em_fatias(caminho_arquivo, num_processos, inicio_dados)
+    # Opções que mudam o estado agregado de cada fatia.
+    opcoes = dict(largura_bucket=sistema._largura_bucket,
+                  largura_bucket_usuarios=sistema._largura_bucket_usuarios,
+                  indexar_comentarios=sistema._indexar_comentarios,
+                  erro_distintos=sistema._erro_distintos,
+                  erro_frequentes=sistema._erro_frequentes,
+                  tipos_conteudo=sistema._tipos_declarados,
+                  coengajamento=sistema._coengajar,
+                  guardar_comentarios=sistema._guardar_comentarios)
+    eventos = sistema._guardar_interacoes
+    if num_processos == 1:
+        parciais = [_agregar_fatia(caminho_arquivo, colunas, i, f, opcoes, eventos) for i, f in fatias]
+    else:
+        with ProcessPoolExecutor(max_workers=num_processos) as executor:
+            futuros = [executor.submit(_agregar_fatia, caminho_arquivo, colunas, i, f, opcoes, eventos)
+                       for i, f in fatias]
+            parciais = [futuro.result() for futuro in futuros]
+    for parcial in parciais:
+        mesclar_parcial(sistema, *parcial)
+    sistema.reconstruir_placares()
+    if sistema._publicar_vistas:
+        sistema.publicar_vista(completa=True)
+    return sistema.resumo_ingestao()
+
+
+def mesclar_parcial(sistema, conteudos, usuarios, plataformas, rejeitadas, registradas,
+                    indice_temporal=None, indice_comentarios=None, coengajamento=None, eventos=None):
+    """
+    Mescla em `sistema` as entidades agregadas de uma fatia (recebidas sem
+    interações) e, se o sistema guarda interações, recria as de `eventos`.
+    """
+    guardar = sistema._guardar_interacoes
+    with sistema._alterando_estado():
+        for conteudo in conteudos:
+            existente = sistema._arvore_conteudos.buscar(conteudo.id)
+            if existente is None:
+                if guardar:
+                    conteudo._interacoes = []
+                sistema._arvore_conteudos.inserir(conteudo.id, conteudo)
+                sistema._indice_tipos.adicionar(conteudo)
+            else:
+                # O tipo vem da primeira ocorrência do conteúdo, como no caminho serial.
+                sistema._indice_tipos.acumular(existente, conteudo)
+                existente.mesclar_metricas(conteudo)
+        for usuario in usuarios:
+            existente = sistema._arvore_usuarios.buscar(usuario.id)
+            if existente is None:
+                if guardar:
+                    usuario._interacoes = []
+                sistema._arvore_usuarios.inserir(usuario.id, usuario)
+            else:
+                existente.mesclar_metricas(usuario)
+        for plat in plataformas:
+            existente = sistema._plataformas_registradas.get(plat.nome)
+            if existente is None:
+                if guardar:
+                    plat._interacoes = []
+                sistema._plataformas_registradas[plat.nome] = plat
+            else:
+                existente.mesclar_metricas(plat)
+        if guardar and eventos:
+            _religar_interacoes(sistema, eventos)
+        for motivo, qtd in rejeitadas.items():
+            sistema._linhas_rejeitadas[motivo] = sistema._linhas_rejeitadas.get(motivo, 0) + qtd
+        sistema._total_registradas += registradas
+        if indice_temporal is not None:
+            sistema._indice_temporal.mesclar(indice_temporal)
+        if indice_comentarios is not None:
+            sistema._indice_comentarios.mesclar(indice_comentarios)
+        if coengajamento is not None:
+            sistema._coengajamento.mesclar(coengajamento)
+
+
+def _religar_interacoes(sistema, eventos):
+    # Recria as interações da fatia, ligadas às entidades do sistema, na ordem do arquivo.
+    from entidades.interacao import Interacao
+    conteudos, usuarios = {}, {}
+    buscar_conteudo, buscar_usuario = sistema._arvore_conteudos.buscar, sistema._arvore_usuarios.buscar
+    plataformas = sistema._plataformas_registradas
+    for id_conteudo, id_usuario, nome_plat, tipo, duracao, comentario, timestamp in eventos:
+        conteudo = conteudos.get(id_conteudo)
+        if conteudo is None:
+            conteudo = conteudos[id_conteudo] = buscar_conteudo(id_conteudo)
+        usuario = usuarios.get(id_usuario)
+        if usuario is None:
+            usuario = usuarios[id_usuario] = buscar_usuario(id_usuario)
+        plat = plataformas[nome_plat]
+        interacao = Interacao(usuario, conteudo, plat, tipo, duracao, comentario, timestamp)
+        conteudo._interacoes.append(interacao)
+        usuario._interacoes.append(interacao)
+        plat._interacoes.append(interacao)
@@ -0,0 +1,234 @@
+"""
+Geração não interativa de um conjunto de relatórios, exportados em CSV ou JSON.
+
+O estado é montado uma vez (snapshot restaurado e/ou CSV ingerido, como no
+main.py) e os relatórios pedidos são calculados de forma concorrente sobre
+esse estado, que não muda mais:
+
+    - onde há fork (Linux), cada relatório roda em um processo do pool, que
+      herda o sistema já carregado por cópia na escrita, sem serializá-lo;
+    - sem fork, threads consultam uma VistaSistema publicada (imutável e sem
+      lock, ver analise.vista); relatórios por janela de tempo exigem o
+      índice temporal do sistema e, nesse caso, rodam em sequência.
+
+Cada relatório é gravado pelo próprio trabalhador, linha a linha, por
+escritores em fluxo (escrever_csv / escrever_json): o texto de uma saída
+nunca é montado inteiro. O cálculo, porém, é o do sistema: um ranking sem
+placar (ou com n maior que ele) ordena todas as entidades da dimensão, e
+os relatórios por plataforma/conteúdo são dicionários completos, dos quais
+só as n primeiras entradas são percorridas.
+
+Uso (a partir da raiz do projeto):
+    python -m analise.relatorios_lote --csv interacoes_globo.csv --saida relatorios/
+    python -m analise.relatorios_lote --snapshot interacoes_globo.snapshot --csv interacoes_globo.csv \\
+        --relatorios usuarios_tempo plataformas_engajamento --formato json --n 1000
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+from analise.indice_temporal import para_epoca
+from analise.sistema import RANKINGS
+from analise.snapshot import SnapshotInvalido
+
+# Relatório -> método de SistemaAnaliseEngajamento (e de VistaSistema).
+METODOS = {
+    'conteudos_tempo': 'gerar_top_conteudos_por_tempo',
+    'usuarios_interacoes': 'gerar_top_usuarios_por_interacoes',
+    'usuarios_tempo': 'gerar_ranking_usuarios_por_tempo',
+    'plataformas_engajamento': 'gerar_ranking_plataformas_por_engajamento',
+    'conteudos_comentarios': 'gerar_ranking_conteudos_por_comentarios',
+    'conteudos_interacoes': 'gerar_conteudos_por_total_interacoes',
+    'tempo_medio_plataformas': 'calcular_tempo_medio_consumo_por_plataforma',
+    'comentarios_conteudos': 'contar_comentarios_por_conteudo',
+}
+RELATORIOS = tuple(METODOS)
+FORMATOS = ('csv', 'json')
+
+# Colunas das chaves de cada dimensão dos rankings.
+_CHAVES = {'conteudos': ('id', 'nome'), 'usuarios': ('id',), 'plataformas': ('nome',)}
+
+# Estado herdado pelos processos do pool (fork); definido antes de criá-lo.
+_FONTE = None
+
+
+def cabecalho(relatorio: str) -> tuple:
+    """Nomes das colunas exportadas para o relatório."""
+    if relatorio == 'tempo_medio_plataformas':
+        return ('plataforma', 'tempo_medio_consumo')
+    if relatorio == 'comentarios_conteudos':
+        return ('nome', 'total_comentarios')
+    dimensao, atributo = RANKINGS[relatorio]
+    return ('posicao',) + _CHAVES[dimensao] + (atributo,)
+
+
+def linhas_relatorio(fonte, relatorio: str, n=None, inicio=None, fim=None):
+    """
+    Gera as linhas (tuplas na ordem de cabecalho) do relatório calculado em
+    `fonte` (sistema ou VistaSistema); a janela [inicio, fim) exige o sistema.
+    """
+    gerar = getattr(fonte, METODOS[relatorio])
+    janela = (inicio, fim) if inicio is not None or fim is not None else ()
+    if relatorio in RANKINGS:
+        dimensao, atributo = RANKINGS[relatorio]
+        chaves = _CHAVES[dimensao]
+        for posicao, entidade in enumerate(gerar(n, *janela), 1):
+            yield (posicao,) + tuple(getattr(entidade, c) for c in chaves) + (getattr(entidade, atributo),)
+    else:
+        itens = gerar(*janela).items()
+        yield from (itens if n is None else islice(itens, n))
+
+
+def escrever_csv(arquivo, colunas, linhas) -> int:
+    """Escreve cabeçalho e linhas em um arquivo texto aberto; retorna a quantidade de linhas."""
+    escritor = csv.writer(arquivo)
+    escritor.writerow(colunas)
+    total = 0
+    for linha in linhas:
+        escritor.writerow(linha)
+        total += 1
+    return total
+
+
+def escrever_json(arquivo, colunas, linhas) -> int:
+    """Escreve uma lista JSON de objetos {coluna: valor}, um por linha do arquivo."""
+    total = 0
+    arquivo.write('[')
+    for linha in linhas:
+        arquivo.write(',\n' if total else '\n')
+        arquivo.write(json.dumps(dict(zip(colunas, linha)), ensure_ascii=False))
+        total += 1
+    arquivo.write('\n]\n' if total else ']\n')
+    return total
+
+
+ESCRITORES = {'csv': escrever_csv, 'json': escrever_json}
+
+
+def exportar_relatorio(fonte, relatorio, caminho, formato='csv', n=None, inicio=None, fim=None) -> dict:
+    """Calcula o relatório em `fonte` e o grava em `caminho`; retorna o resumo da exportação."""
+    comeco = time.perf_counter()
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        total = ESCRITORES[formato](arquivo, cabecalho(relatorio),
+                                    linhas_relatorio(fonte, relatorio, n, inicio, fim))
+    return {'relatorio': relatorio, 'caminho': caminho, 'linhas': total,
+            'segundos': time.perf_counter() - comeco}
+
+
+def _exportar_da_fonte_herdada(relatorio, caminho, formato, n, inicio, fim):
+    # Executado no processo filho (fork): usa o sistema herdado do pai.
+    return exportar_relatorio(_FONTE, relatorio, caminho, formato, n, inicio, fim)
+
+
+def gerar_relatorios(sistema, relatorios=RELATORIOS, diretorio='.', formato='csv', n=None,
+                     inicio=None, fim=None, trabalhadores: int = None) -> list:
+    """
+    Exporta cada relatório em `diretorio`/<relatorio>.<formato>, com até
+    `trabalhadores` relatórios simultâneos (padrão: os.cpu_count()). O sistema
+    não deve ser alterado durante a chamada. Retorna os resumos na ordem pedida.
+    """
+    global _FONTE
+    if formato not in ESCRITORES:
+        raise ValueError(f"formato deve ser um de {FORMATOS}")
+    desconhecidos = [r for r in relatorios if r not in METODOS]
+    if desconhecidos:
+        raise ValueError(f"relatórios desconhecidos: {', '.join(desconhecidos)}")
+    os.makedirs(diretorio, exist_ok=True)
+    tarefas = [(r, os.path.join(diretorio, f"{r}.{formato}"), formato, n, inicio, fim) for r in relatorios]
+    trabalhadores = min(trabalhadores or os.cpu_count() or 1, len(tarefas))
+    janela = inicio is not None or fim is not None
+    if trabalhadores > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        _FONTE = sistema
+        try:
+            with ProcessPoolExecutor(trabalhadores, mp_context=multiprocessing.get_context('fork')) as executor:
+                return list(executor.map(_exportar_da_fonte_herdada, *zip(*tarefas)))
+        finally:
+            _FONTE = None
+    if trabalhadores <= 1 or janela:
+        return [exportar_relatorio(sistema, *tarefa) for tarefa in tarefas]
+    vista = sistema.publicar_vista(completa=True)
+    with ThreadPoolExecutor(trabalhadores) as executor:
+        return list(executor.map(lambda tarefa: exportar_relatorio(vista, *tarefa), tarefas))
+
+
+def carregar_sistema(csv_entrada=None, snapshot=None, processos=None, **opcoes):
+    """
+    Monta o sistema: com `snapshot` e `csv_entrada`, como o main.py
+    (SistemaAnaliseEngajamento.carregar_snapshot_atualizado); só com o
+    snapshot, restaura-o; só com o CSV, ingere-o inteiro (em paralelo com
+    `processos`).
+    """
+    from analise.sistema import SistemaAnaliseEngajamento
+    if csv_entrada and snapshot:
+        return SistemaAnaliseEngajamento.carregar_snapshot_atualizado(snapshot, csv_entrada, **opcoes)[0]
+    if snapshot:
+        return SistemaAnaliseEngajamento.carregar_snapshot(snapshot, **opcoes)
+    sistema = SistemaAnaliseEngajamento(**opcoes)
+    if processos:
+        sistema.carregar_csv_paralelo(csv_entrada, processos)
+    else:
+        sistema.processar_csv_em_fluxo(csv_entrada)
+    return sistema
+
+
+def main():
+    from estruturas_dados.arvore_avl import ArvoreAVL
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--csv', dest='csv_entrada', help='CSV de interações a ingerir')
+    parser.add_argument('--snapshot', help='restaura deste snapshot e o atualiza com as linhas novas do CSV')
+    parser.add_argument('--processos', type=int,
+                        help='ingestão paralela do CSV inteiro (incompatível com --snapshot)')
+    parser.add_argument('--relatorios', nargs='+', choices=RELATORIOS,
+                        help='relatórios a exportar (padrão: todos)')
+    parser.add_argument('--formato', choices=FORMATOS, default='csv')
+    parser.add_argument('--saida', default='.', help='diretório dos arquivos gerados')
+    parser.add_argument('--n', type=int, help='limita cada relatório às n primeiras linhas')
+    parser.add_argument('--inicio', help="início da janela ('AAAA-MM-DD HH:MM:SS')")
+    parser.add_argument('--fim', help='fim (exclusivo) da janela')
+    parser.add_argument('--largura-usuarios', type=int,
+                        help='buckets por usuário (segundos), exigidos pelos relatórios de usuários com janela')
+    parser.add_argument('--trabalhadores', type=int, help='relatórios simultâneos (padrão: CPUs)')
+    args = parser.parse_args()
+    if not args.csv_entrada and not (args.snapshot and os.path.exists(args.snapshot)):
+        parser.error("informe --csv ou um --snapshot existente")
+    if args.processos and args.snapshot:
+        # Com snapshot só as linhas novas do CSV são ingeridas, sempre em série.
+        parser.error("--processos não se aplica com --snapshot")
+    for opcao, valor in (('--inicio', args.inicio), ('--fim', args.fim)):
+        try:
+            para_epoca(valor)
+        except ValueError as erro:
+            parser.error(f"{opcao}: {erro}")
+    relatorios = args.relatorios or list(RELATORIOS)
+    if (args.inicio or args.fim) and args.largura_usuarios is None:
+        # Sem buckets por usuário não há rankings de usuários por janela.
+        de_usuarios = [r for r in relatorios if RANKINGS.get(r, ('',))[0] == 'usuarios']
+        if args.relatorios and de_usuarios:
+            parser.error(f"{', '.join(de_usuarios)} com --inicio/--fim exigem --largura-usuarios")
+        if de_usuarios:
+            print(f"aviso: {', '.join(de_usuarios)} omitidos (a janela exige --largura-usuarios)")
+            relatorios = [r for r in relatorios if r not in de_usuarios]
+
+    inicio = time.perf_counter()
+    try:
+        sistema = carregar_sistema(args.csv_entrada, args.snapshot, args.processos, classe_arvore=ArvoreAVL,
+                                   guardar_interacoes=False, largura_bucket=3600,
+                                   largura_bucket_usuarios=args.largura_usuarios)
+    except SnapshotInvalido as erro:
+        parser.error(f"--snapshot: {erro} (informe também --csv para recarregá-lo)")
+    resumo = sistema.resumo_ingestao()
+    print(f"estado: {resumo['registradas']} interações ({time.perf_counter() - inicio:.2f}s)")
+    inicio = time.perf_counter()
+    for r in gerar_relatorios(sistema, relatorios, args.saida, args.formato, args.n,
+                              args.inicio, args.fim, args.trabalhadores):
+        print(f"{r['relatorio']:<26}{r['linhas']:>10} linhas {r['segundos']:>8.2f}s  {r['caminho']}")
+    print(f"relatórios: {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+"""
+Serviço assíncrono que acompanha (tail) vários CSVs e alimenta um único sistema.
+
+Cada arquivo tem uma tarefa produtora que, a cada `intervalo` segundos, lê os
+registros completos acrescentados desde o último offset (a leitura do disco
+roda em uma thread, via asyncio.to_thread) e os coloca em uma FilaAssincrona
+limitada; com a fila cheia o produtor aguarda, o que segura a leitura
+(backpressure). Uma única tarefa consumidora retira lotes da fila e os
+registra no sistema, então os relatórios podem ser gerados por outras
+corrotinas do mesmo loop enquanto a ingestão continua.
+
+Depois dos registros de cada leitura o produtor enfileira um marco com o
+checkpoint do arquivo (mesmo formato de analise.incremental). O consumidor
+só grava o checkpoint em `sistema` ao alcançar o marco, ou seja, depois de
+registrar tudo o que veio antes; um snapshot salvo a qualquer momento fica
+coerente com os checkpoints e o serviço retoma de onde parou. Um arquivo
+truncado ou rotacionado depois de lido é recusado: os agregados que já vieram
+dele não podem ser desfeitos sem descartar também os das outras fontes, e
+relê-lo contaria essas linhas duas vezes. Ele deixa de ser acompanhado e
+aparece em metricas()['arquivos_recusados']; para reprocessá-lo, o serviço
+deve ser reiniciado com um sistema novo (a recarga de
+processar_csv_incremental, que descarta todo o estado).
+
+Com `diretorio`, arquivos novos que casem com `padrao` passam a ser
+acompanhados assim que aparecem.
+
+Uso (a partir da raiz do projeto):
+    python -m analise.servico_ingestao --diretorio dados/ --intervalo 1
+"""
+import argparse
+import asyncio
+import csv
+import glob
+import os
+import signal
+import time
+from collections import namedtuple
+from itertools import islice
+
+from analise.incremental import chave_checkpoint, checkpoint_valido, montar_checkpoint, registros_completos
+from analise.leitor_csv import registros_de_textos
+from estruturas_dados.fila_assincrona import FilaAssincrona
+
+# Item de controle na fila: checkpoint do arquivo após os registros que o precedem.
+Marco = namedtuple('Marco', ['chave', 'checkpoint', 'lido_em'])
+
+
+class ServicoIngestao:
+    """
+    Acompanha `caminhos` (e os arquivos de `diretorio` que casem com `padrao`)
+    e registra as interações em `sistema`.
+
+    Métricas (ver metricas): profundidade da fila e atraso de ingestão, medido
+    entre a leitura de um trecho do arquivo e o registro do seu último evento.
+    """
+    def __init__(self, sistema, caminhos=(), diretorio=None, padrao='*.csv',
+                 capacidade_fila=10000, intervalo=1.0, tamanho_lote=1024):
+        if capacidade_fila <= 0 or tamanho_lote <= 0:
+            raise ValueError("capacidade_fila e tamanho_lote devem ser positivos")
+        self.sistema = sistema
+        self.caminhos = list(caminhos)
+        self.diretorio = diretorio
+        self.padrao = padrao
+        self.intervalo = intervalo
+        self.tamanho_lote = tamanho_lote
+        self._fila = FilaAssincrona(capacidade_fila)
+        self._parar = None
+        self._produtores = {}
+        # Chave -> caminho dos arquivos truncados ou rotacionados após a leitura.
+        self._recusados = {}
+        self._lidos = 0
+        self._processados = 0
+        self._atraso_ultimo = 0.0
+        self._atraso_maximo = 0.0
+
+    async def executar(self) -> dict:
+        """Roda até parar() ser chamado; drena a fila e retorna o resumo da ingestão."""
+        self._parar = asyncio.Event()
+        consumidor = asyncio.create_task(self._consumir())
+        for caminho in self.caminhos:
+            self._acompanhar(caminho)
+        while not self._parar.is_set():
+            if self.diretorio is not None:
+                for caminho in sorted(glob.glob(os.path.join(self.diretorio, self.padrao))):
+                    self._acompanhar(caminho)
+            await self._aguardar(self.intervalo)
+        await asyncio.gather(*self._produtores.values())
+        await self._fila.enfileirar(None)
+        await consumidor
+        return self.sistema.resumo_ingestao()
+
+    def parar(self):
+        # Pede o encerramento: os produtores terminam a leitura corrente e a fila é drenada.
+        if self._parar is not None:
+            self._parar.set()
+
+    def metricas(self) -> dict:
+        """Profundidade da fila, atraso de ingestão (s) e progresso por arquivo."""
+        return {
+            'profundidade_fila': len(self._fila),
+            'capacidade_fila': self._fila.capacidade,
+            'atraso_ultimo': self._atraso_ultimo,
+            'atraso_maximo': self._atraso_maximo,
+            'registros_lidos': self._lidos,
+            'registros_processados': self._processados,
+            'arquivos': {chave: {'offset': c['offset'], 'linhas': c['linhas']}
+                         for chave, c in self.sistema._checkpoints.items()
+                         if chave in self._produtores},
+            'arquivos_recusados': list(self._recusados.values()),
+        }
+
+    def _acompanhar(self, caminho):
+        chave = chave_checkpoint(caminho)
+        if chave not in self._produtores:
+            self._produtores[chave] = asyncio.create_task(self._produzir(caminho, chave))
+
+    async def _aguardar(self, segundos):
+        # Dorme até `segundos` ou até parar() ser chamado.
+        try:
+            await asyncio.wait_for(self._parar.wait(), segundos)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _produzir(self, caminho, chave):
+        checkpoint = self.sistema._checkpoints.get(chave)
+        while True:
+            lido_em = time.monotonic()
+            registros, checkpoint, completo = await asyncio.to_thread(
+                self._ler_trecho, caminho, checkpoint)
+            if registros is None:
+                self._recusados[chave] = caminho
+                return
+            if registros:
+                self._lidos += len(registros)
+                await self._fila.enfileirar_lote(registros)
+            if checkpoint is not None and (registros or chave not in self.sistema._checkpoints):
+                await self._fila.enfileirar(Marco(chave, checkpoint, lido_em))
+            if completo:
+                if self._parar.is_set():
+                    return
+                await self._aguardar(self.intervalo)
+
+    def _ler_trecho(self, caminho, checkpoint):
+        """
+        Lê até tamanho_lote registros novos a partir do checkpoint (executado
+        em thread). Retorna (registros, novo checkpoint, se chegou ao fim);
+        registros é None se o arquivo não confere mais com o checkpoint.
+        """
+        try:
+            arquivo = open(caminho, 'rb')
+        except FileNotFoundError:
+            return [], checkpoint, True
+        with arquivo:
+            cabecalho = arquivo.readline()
+            if not cabecalho.endswith(b'\n'):
+                return [], checkpoint, True
+            inicio_dados = arquivo.tell()
+            tamanho = os.fstat(arquivo.fileno()).st_size
+            if checkpoint is None:
+                offset, linhas = inicio_dados, 0
+            elif checkpoint_valido(arquivo, checkpoint, cabecalho, inicio_dados, tamanho):
+                offset, linhas = checkpoint['offset'], checkpoint['linhas']
+            else:
+                return None, checkpoint, True
+            textos = list(islice(registros_completos(arquivo, offset), self.tamanho_lote))
+            if textos:
+                offset = textos[-1][1]
+            colunas = next(csv.reader([cabecalho.decode('utf-8')]))
+            registros = list(registros_de_textos((t for t, _ in textos), colunas))
+            novo = montar_checkpoint(arquivo, cabecalho, inicio_dados, offset, linhas + len(registros))
+        return registros, novo, len(textos) < self.tamanho_lote
+
+    async def _consumir(self):
+        # Única tarefa que escreve no sistema: registra lotes e aplica os marcos.
+        sistema = self.sistema
+        while True:
+            itens = await self._fila.desenfileirar_lote(self.tamanho_lote)
+            registros = []
+            for item in itens:
+                if type(item) is tuple:
+                    registros.append(item)
+                    continue
+                self._registrar(registros)
+                registros = []
+                if item is None:
+                    return
+                sistema._checkpoints[item.chave] = item.checkpoint
+                atraso = time.monotonic() - item.lido_em
+                self._atraso_ultimo = atraso
+                self._atraso_maximo = max(self._atraso_maximo, atraso)
+            self._registrar(registros)
+            if sistema._publicar_vistas and self._fila.esta_vazia():
+                sistema.publicar_vista()
+            # Devolve o controle ao loop para que relatórios possam ser atendidos.
+            await asyncio.sleep(0)
+
+    def _registrar(self, registros):
+        if registros:
+            self.sistema._processar_lote(registros)
+            self._processados += len(registros)
+
+
+async def _monitorar(servico, periodo):
+    # Relatório periódico servido enquanto a ingestão continua.
+    while True:
+        await asyncio.sleep(periodo)
+        m = servico.metricas()
+        print(f"fila {m['profundidade_fila']}/{m['capacidade_fila']}  "
+              f"lidos {m['registros_lidos']}  processados {m['registros_processados']}  "
+              f"atraso {m['atraso_ultimo']:.3f}s (máx. {m['atraso_maximo']:.3f}s)")
+        for caminho in m['arquivos_recusados']:
+            print(f"  recusado (truncado ou rotacionado após a leitura): {caminho}")
+        for c in servico.sistema.gerar_conteudos_por_total_interacoes(3):
+            print(f"  {c.nome}: {c.total_interacoes}")
+
+
+async def _principal(args):
+    from analise.sistema import SistemaAnaliseEngajamento
+    from estruturas_dados.arvore_avl import ArvoreAVL
+    sistema = SistemaAnaliseEngajamento(classe_arvore=ArvoreAVL, guardar_interacoes=False,
+                                        tamanho_placar=10, largura_bucket=3600)
+    servico = ServicoIngestao(sistema, args.caminhos, args.diretorio, args.padrao,
+                              args.capacidade_fila, args.intervalo)
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGINT, servico.parar)
+    except NotImplementedError:  # Windows: Ctrl+C interrompe sem drenar a fila
+        pass
+    if args.duracao:
+        loop.call_later(args.duracao, servico.parar)
+    monitor = asyncio.create_task(_monitorar(servico, args.relatorio))
+    resumo = await servico.executar()
+    monitor.cancel()
+    print(resumo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('caminhos', nargs='*', help='CSVs a acompanhar')
+    parser.add_argument('--diretorio', help='acompanha também os arquivos novos deste diretório')
+    parser.add_argument('--padrao', default='*.csv')
+    parser.add_argument('--intervalo', type=float, default=1.0, help='segundos entre leituras')
+    parser.add_argument('--capacidade-fila', type=int, default=10000)
+    parser.add_argument('--relatorio', type=float, default=5.0, help='segundos entre relatórios')
+    parser.add_argument('--duracao', type=float, help='encerra após N segundos')
+    args = parser.parse_args()
+    if not args.caminhos and not args.diretorio:
+        parser.error("informe caminhos ou --diretorio")
+    asyncio.run(_principal(args))
+
+
+if __name__ == '__main__':
+    main()
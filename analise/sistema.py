@@ -1,10 +1,129 @@
-import csv
+import heapq
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+from operator import attrgetter
 from estruturas_dados.fila import Fila
 from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+from estruturas_dados.placar import Placar
+from estruturas_dados.sketches import HyperLogLog, SpaceSaving
+from analise.coengajamento import MatrizCoengajamento
+from analise.indice_comentarios import IndiceComentarios
+from analise.indice_tipos import TIPOS_CONTEUDO, IndiceTipos, inferir_tipo_conteudo, validar_tipo
+from analise.instrumentacao import AMOSTRAGEM_BUSCAS, Instrumentacao
+from analise.indice_temporal import IndiceTemporal, MetricasJanela, converter_timestamp, converter_timestamps, para_epoca
+from analise.leitor_csv import COLUNAS, ler_registros
 from entidades.plataforma import Plataforma
-from entidades.conteudo import Conteudo, Video, Podcast, Artigo
 from entidades.usuario import Usuario
-from entidades.interacao import Interacao
+from entidades.interacao import Interacao, limpar_pool_comentarios
+
+MOTIVOS_REJEICAO = ('id_ausente', 'id_invalido', 'plataforma_ausente')
+
+# Registros normalizados por vez ao drenar a fila.
+TAMANHO_LOTE_NORMALIZACAO = 1024
+
+# Intervalo mínimo (s) entre publicações automáticas de vistas durante a ingestão.
+INTERVALO_VISTAS = 0.1
+
+# Resultados de relatórios mantidos em cache (LRU) entre ingestões, por
+# (relatório, n, janela). Toda ingestão avança a geração do estado ao começar
+# e ao terminar cada lote e descarta o cache; um resultado calculado com um
+# lote em curso não é guardado. O cache é protegido por uma trava (relatórios
+# podem vir de outras threads), mas o cálculo roda fora dela. Os resultados
+# são compartilhados entre chamadas e não devem ser modificados.
+TAMANHO_CACHE_RELATORIOS = 64
+
+
+class LinhaInvalida(ValueError):
+    """Linha do CSV descartada na validação; `motivo` é um de MOTIVOS_REJEICAO."""
+    def __init__(self, motivo: str):
+        super().__init__(motivo)
+        self.motivo = motivo
+
+
+def normalizar_linha(dados: dict) -> tuple:
+    """
+    Valida e converte uma linha bruta do CSV.
+
+    Retorna (id_conteudo, nome_conteudo, id_usuario, plataforma, tipo, duracao,
+    comentario, timestamp) ou lança LinhaInvalida quando faltam IDs, eles não são inteiros ou falta a plataforma.
+    """
+    return normalizar_registro(*map(dados.get, COLUNAS))
+
+
+def normalizar_registro(raw_c, nome_c, raw_u, raw_ts, nome_plat, tipo, raw_dur, comentario) -> tuple:
+    """Como normalizar_linha, para um registro posicional na ordem de leitor_csv.COLUNAS."""
+    if not raw_c or not raw_u:
+        raise LinhaInvalida('id_ausente')
+    try:
+        id_conteudo = int(raw_c)
+        id_usuario = int(raw_u)
+    except ValueError:
+        raise LinhaInvalida('id_invalido') from None
+    if not nome_plat:
+        raise LinhaInvalida('plataforma_ausente')
+    nome_c = nome_c or f"conteudo_{id_conteudo}"
+    try:
+        dur = float(raw_dur or 0)
+    except ValueError:
+        dur = 0.0
+    return (id_conteudo, nome_c, id_usuario, nome_plat, tipo, dur,
+            comentario, converter_timestamp(raw_ts))
+
+
+def validar_id_conteudo(valor) -> int:
+    """ID de conteúdo como int (ex.: '42' vindo da CLI ou do CSV) ou ValueError."""
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"id de conteúdo inválido: {valor!r}") from None
+
+
+def normalizar_lote(registros) -> tuple:
+    """
+    Normaliza uma lista de registros posicionais de uma vez.
+
+    As colunas tipadas são convertidas em bloco (map de int/float sobre a
+    coluna, datas e horas dos timestamps memorizadas). Se algum registro
+    do lote for inválido, o lote inteiro cai para normalizar_registro linha a
+    linha, que identifica o motivo de cada rejeição.
+    Retorna (registros válidos na ordem de entrada, [motivos das rejeições]).
+    """
+    if not registros:
+        return [], []
+    try:
+        raw_c, nomes, raw_u, raw_ts, plats, tipos, raw_dur, comentarios = zip(*registros)
+        ids_c = list(map(int, raw_c))
+        ids_u = list(map(int, raw_u))
+        if not all(plats):
+            raise ValueError
+        durs = [float(d) if d else 0.0 for d in raw_dur]
+    except (ValueError, TypeError):
+        validos, motivos = [], []
+        for registro in registros:
+            try:
+                validos.append(normalizar_registro(*registro))
+            except LinhaInvalida as erro:
+                motivos.append(erro.motivo)
+        return validos, motivos
+    instantes = converter_timestamps(raw_ts)
+    nomes = [nome or f"conteudo_{i}" for nome, i in zip(nomes, ids_c)]
+    return list(zip(ids_c, nomes, ids_u, plats, tipos, durs, comentarios, instantes)), []
+
+
+# Relatório -> (índice de entidades, atributo usado na ordenação)
+RANKINGS = {
+    'conteudos_tempo': ('conteudos', 'tempo_total_consumo'),
+    'conteudos_interacoes': ('conteudos', 'total_interacoes'),
+    'conteudos_comentarios': ('conteudos', 'total_comentarios'),
+    'usuarios_interacoes': ('usuarios', 'total_interacoes'),
+    'usuarios_tempo': ('usuarios', 'tempo_total_consumo'),
+    'plataformas_engajamento': ('plataformas', 'total_engajamento'),
+}
+
 
 class SistemaAnaliseEngajamento:
     """
@@ -13,120 +132,728 @@ class SistemaAnaliseEngajamento:
     Principais operações:
       - carregar_interacoes_csv: O(n)
       - processar_interacoes_da_fila: O(n log m)
-      - relatórios diversos: O(k log k)
+      - processar_csv_em_fluxo: O(n log m), memória limitada por lote + limite da fila
+      - carregar_csv_paralelo: O((n/p) log m) por processo + O(m) para mesclar
+      - relatórios diversos: O(m log m); com n, O(m log n) via heap, ou
+        O(k log k) quando há placar de tamanho k >= n para o relatório
+
+    As opções do construtor ligam recursos descritos onde são implementados:
+    classe_arvore (ArvoreAVL, RegistroHash), guardar_interacoes e
+    guardar_comentarios (Conteudo), tamanho_placar (Placar), largura_bucket
+    e largura_bucket_usuarios (analise.indice_temporal), publicar_vistas
+    (analise.vista), indexar_comentarios (analise.indice_comentarios),
+    erro_distintos e erro_frequentes (HyperLogLog.para_erro,
+    SpaceSaving.para_erro), tipos_conteudo (analise.indice_tipos),
+    coengajamento (analise.coengajamento), instrumentar
+    (analise.instrumentacao), limite_memoria_fila e diretorio_fila (Fila) e
+    tamanho_cache (cache de relatórios, 0 o desliga).
     """
-    def __init__(self):
-        self._fila_interacoes_brutas = Fila()
-        self._arvore_conteudos = ArvoreBinariaBusca()
-        self._arvore_usuarios = ArvoreBinariaBusca()
-        self._plataformas_registradas = {}
+    def __init__(self, classe_arvore=ArvoreBinariaBusca, guardar_interacoes=True,
+                 tamanho_placar=None, largura_bucket=None, publicar_vistas=False,
+                 tamanho_cache=TAMANHO_CACHE_RELATORIOS, indexar_comentarios=False,
+                 erro_distintos=None, erro_frequentes=None, instrumentar=False,
+                 tipos_conteudo=None, coengajamento=False, limite_memoria_fila=None,
+                 diretorio_fila=None, guardar_comentarios=None, largura_bucket_usuarios=None):
+        self._guardar_interacoes = guardar_interacoes
+        self._guardar_comentarios = guardar_interacoes if guardar_comentarios is None else guardar_comentarios
+        self._classe_arvore = classe_arvore
+        self._tamanho_placar = tamanho_placar
+        self._largura_bucket = largura_bucket
+        self._largura_bucket_usuarios = largura_bucket_usuarios
+        self._publicar_vistas = publicar_vistas
+        self._indexar_comentarios = indexar_comentarios
+        self._erro_distintos = erro_distintos
+        self._erro_frequentes = erro_frequentes
+        self._coengajar = coengajamento
+        self._limite_memoria_fila = limite_memoria_fila
+        self._diretorio_fila = diretorio_fila
+        self._tipos_declarados = {validar_id_conteudo(id_c): validar_tipo(tipo) for id_c, tipo in (tipos_conteudo or {}).items()}
+        # (precisão do HyperLogLog, capacidade do SpaceSaving) de cada entidade, ou None.
+        self._sketches = None
+        if erro_distintos or erro_frequentes:
+            self._sketches = (HyperLogLog.para_erro(erro_distintos).precisao if erro_distintos else None,
+                              SpaceSaving.para_erro(erro_frequentes).capacidade if erro_frequentes else None)
+        self.intervalo_vistas = INTERVALO_VISTAS
+        self._tamanho_cache = tamanho_cache
+        self._cache_relatorios = OrderedDict()
+        self._trava_cache = threading.Lock()
+        self._cache_geracao = self._geracao = 0
+        self._alteracoes_em_curso = 0
+        self._instrumentacao = Instrumentacao() if instrumentar else None
+        # Eventos registrados, em ordem, como tuplas (id_conteudo, id_usuario,
+        # plataforma, tipo, duração, comentário, timestamp); só nas fatias da
+        # ingestão paralela que devolvem as interações (ver analise.paralelo).
+        self._eventos = None
+        self._reiniciar_estado()
+
+    def _reiniciar_estado(self):
+        # Descarta todo o estado agregado (usado no construtor e em recargas completas).
+        limpar_pool_comentarios()
+        with self._alterando_estado():
+            self._fila_interacoes_brutas = Fila(self._limite_memoria_fila, self._diretorio_fila)
+            self._arvore_conteudos = self._classe_arvore()
+            self._arvore_usuarios = self._classe_arvore()
+            self._plataformas_registradas = {}
+            self._linhas_rejeitadas = dict.fromkeys(MOTIVOS_REJEICAO, 0)
+            self._total_registradas = 0
+            self._checkpoints = {}
+            self._indice_temporal = (IndiceTemporal(self._largura_bucket, self._largura_bucket_usuarios)
+                                     if self._largura_bucket else None)
+            self._indice_comentarios = IndiceComentarios() if self._indexar_comentarios else None
+            self._indice_tipos = IndiceTipos()
+            self._coengajamento = MatrizCoengajamento() if self._coengajar else None
+            self._placares = {}
+            if self._tamanho_placar:
+                self._placares = {nome: Placar(self._tamanho_placar)
+                                  for nome, (indice, _) in RANKINGS.items() if indice != 'plataformas'}
+            # Vista publicada e entidades alteradas desde a publicação (conteúdos, usuários, plataformas).
+            self._vista = None
+            self._vista_publicada_em = 0.0
+            self._alterados = (set(), set(), set()) if self._publicar_vistas else None
 
     def carregar_interacoes_csv(self, caminho_arquivo: str):
-        """Carrega linhas do CSV na fila (raw)."""
-        with open(caminho_arquivo, newline='', encoding='utf-8') as arquivo:
-            leitor = csv.DictReader(arquivo)
-            for linha in leitor:
-                self._fila_interacoes_brutas.enfileirar(linha)
+        """
+        Carrega linhas do CSV na fila (raw), como tuplas na ordem de
+        leitor_csv.COLUNAS. A fila também aceita dicionários (ex.: DictReader).
+        """
+        instr = self._instrumentacao
+        inicio = time.perf_counter()
+        antes = len(self._fila_interacoes_brutas)
+        registros = ler_registros(caminho_arquivo)
+        while True:
+            bloco = list(islice(registros, TAMANHO_LOTE_NORMALIZACAO))
+            if not bloco:
+                break
+            self._fila_interacoes_brutas.enfileirar_lote(bloco)
+        if instr is not None:
+            lidas = len(self._fila_interacoes_brutas) - antes
+            instr.acumular('leitura_csv', time.perf_counter() - inicio, lidas)
+            instr.contar('linhas_lidas', lidas)
 
     def processar_interacoes_da_fila(self):
         """Processa cada item da fila, instanciando entidades e registrando interações."""
-        while not self._fila_interacoes_brutas.esta_vazia():
-            dados = self._fila_interacoes_brutas.desenfileirar()
-            raw_c = dados.get('id_conteudo')
-            raw_u = dados.get('id_usuario')
-            if not raw_c or not raw_u:
-                continue
-            try:
-                id_conteudo = int(raw_c)
-                id_usuario = int(raw_u)
-            except ValueError:
-                continue
-            nome_c = dados.get('nome_conteudo') or f"conteudo_{id_conteudo}"
-            # Plataforma
-            nome_plat = dados.get('plataforma')
-            if not nome_plat:
-                continue
-            plat = self._plataformas_registradas.get(nome_plat)
-            if plat is None:
-                plat = Plataforma(nome_plat)
-                self._plataformas_registradas[nome_plat] = plat
-            # Conteúdo
-            conteudo = self._arvore_conteudos.buscar(id_conteudo)
-            if conteudo is None:
-                conteudo = Conteudo(id_conteudo, nome_c)
-                self._arvore_conteudos.inserir(id_conteudo, conteudo)
-            # Usuário
-            usuario = self._arvore_usuarios.buscar(id_usuario)
-            if usuario is None:
-                usuario = Usuario(id_usuario)
-                self._arvore_usuarios.inserir(id_usuario, usuario)
-            # Interação
-            tipo_int = dados.get('tipo_interacao')
+        fila = self._fila_interacoes_brutas
+        if self._instrumentacao is not None:
+            self._instrumentacao.registrar_maximo('fila_pico', len(fila))
+        while True:
+            lote = fila.desenfileirar_lote(TAMANHO_LOTE_NORMALIZACAO)
+            if not lote:
+                break
+            self._processar_lote(lote)
+        if self._publicar_vistas:
+            self.publicar_vista()
+
+    def processar_csv_em_fluxo(self, caminho_arquivo: str, tamanho_lote: int = 1000,
+                               limite_fila: int = 10000) -> dict:
+        """
+        Lê, valida e registra o CSV em lotes, sem carregar o arquivo inteiro na fila.
+
+        As linhas são lidas `tamanho_lote` por vez; quando a fila atinge
+        `limite_fila` (high-water mark) a leitura pausa e a fila é drenada antes
+        de continuar. O pico de linhas brutas em memória fica limitado a
+        limite_fila + tamanho_lote, independente do tamanho do arquivo.
+        Retorna o resumo da ingestão (ver resumo_ingestao).
+        """
+        self._ingerir_em_lotes(ler_registros(caminho_arquivo), tamanho_lote, limite_fila)
+        return self.resumo_ingestao()
+
+    def processar_csv_incremental(self, caminho_arquivo: str, tamanho_lote: int = 1000,
+                                  limite_fila: int = 10000) -> dict:
+        """
+        Processa só as linhas acrescentadas ao CSV desde a última chamada para
+        o mesmo arquivo, usando o checkpoint (offset, linhas, impressão digital
+        do cabeçalho e do trecho final lido). Se o arquivo foi truncado ou
+        rotacionado, todo o estado é descartado e o arquivo é relido do início.
+        Os checkpoints são gravados junto com o snapshot (ver analise.incremental).
+        """
+        from analise.incremental import processar_csv_incremental
+        return processar_csv_incremental(self, caminho_arquivo, tamanho_lote, limite_fila)
+
+    def obter_checkpoint(self, caminho_arquivo: str):
+        """Retorna uma cópia do checkpoint do arquivo, ou None se ele nunca foi processado."""
+        from analise.incremental import chave_checkpoint
+        checkpoint = self._checkpoints.get(chave_checkpoint(caminho_arquivo))
+        return dict(checkpoint) if checkpoint else None
+
+    def _ingerir_em_lotes(self, linhas, tamanho_lote, limite_fila):
+        # Enfileira em lotes e drena a fila sempre que ela atinge o limite.
+        if tamanho_lote <= 0 or limite_fila <= 0:
+            raise ValueError("tamanho_lote e limite_fila devem ser positivos")
+        fila = self._fila_interacoes_brutas
+        instr = self._instrumentacao
+        linhas = iter(linhas)
+        while True:
+            inicio = time.perf_counter()
+            lote = list(islice(linhas, tamanho_lote))
+            if not lote:
+                break
+            if instr is not None:
+                instr.acumular('leitura_csv', time.perf_counter() - inicio, len(lote))
+                instr.contar('linhas_lidas', len(lote))
+            fila.enfileirar_lote(lote)
+            if len(fila) >= limite_fila:
+                self.processar_interacoes_da_fila()
+        self.processar_interacoes_da_fila()
+
+    def carregar_csv_paralelo(self, caminho_arquivo: str, num_processos: int = None) -> dict:
+        """
+        Ingere o CSV em fatias de bytes processadas em paralelo e mescla os
+        agregados parciais neste sistema (ver analise.paralelo). Os relatórios
+        resultantes são os mesmos do caminho serial.
+        """
+        from analise.paralelo import carregar_csv_paralelo
+        if self._instrumentacao is None:
+            return carregar_csv_paralelo(self, caminho_arquivo, num_processos)
+        with self._instrumentacao.cronometrar('ingestao_paralela'):
+            return carregar_csv_paralelo(self, caminho_arquivo, num_processos)
+
+    def salvar_snapshot(self, caminho_arquivo: str):
+        """Grava o estado agregado (entidades, contadores, plataformas) em um snapshot binário."""
+        from analise.snapshot import salvar_snapshot
+        salvar_snapshot(self, caminho_arquivo)
+
+    @classmethod
+    def carregar_snapshot(cls, caminho_arquivo: str, **opcoes):
+        """
+        Cria um sistema a partir de um snapshot gravado por salvar_snapshot.
+        `opcoes` são repassadas ao construtor (classe_arvore, tamanho_placar...).
+        O custo é proporcional ao número de entidades, não ao de eventos.
+        """
+        from analise.snapshot import carregar_snapshot
+        sistema = cls(**opcoes)
+        carregar_snapshot(caminho_arquivo, sistema)
+        return sistema
+
+    @classmethod
+    def carregar_snapshot_atualizado(cls, caminho_snapshot: str, caminho_csv: str, **opcoes) -> tuple:
+        """
+        Restaura `caminho_snapshot` (se existir e servir a estas opções; senão
+        começa vazio), aplica as linhas novas de `caminho_csv` com
+        processar_csv_incremental e regrava o snapshot se o estado mudou.
+        Retorna (sistema, resumo da ingestão incremental), com o resumo
+        acrescido de 'snapshot': 'restaurado', 'ausente' ou o motivo da recusa.
+        """
+        from analise.snapshot import SnapshotInvalido
+        sistema, situacao = None, 'ausente'
+        if os.path.exists(caminho_snapshot):
             try:
-                dur = float(dados.get('watch_duration_seconds') or 0)
-            except ValueError:
-                dur = 0.0
-            comentario = dados.get('comment_text')
-            inter = Interacao(usuario, conteudo, plat, tipo_int, dur, comentario)
-            # Registro
-            conteudo.registrar_interacao(inter)
-            usuario.registrar_interacao(inter)
-            plat.registrar_interacao(inter)
+                sistema = cls.carregar_snapshot(caminho_snapshot, **opcoes)
+                situacao = 'restaurado'
+            except SnapshotInvalido as erro:
+                situacao = f"ignorado ({erro})"
+        if sistema is None:
+            sistema = cls(**opcoes)
+        resumo = sistema.processar_csv_incremental(caminho_csv)
+        if resumo['linhas_novas'] or resumo['modo'] != 'incremental':
+            sistema.salvar_snapshot(caminho_snapshot)
+        resumo['snapshot'] = situacao
+        return sistema, resumo
+
+    def resumo_ingestao(self) -> dict:
+        """Retorna {'registradas': int, 'rejeitadas': {motivo: int}} desde a criação do sistema."""
+        return {'registradas': self._total_registradas,
+                'rejeitadas': dict(self._linhas_rejeitadas)}
+
+    def _processar_lote(self, lote):
+        # O lote inteiro é uma única alteração do estado (ver _alterando_estado).
+        with self._alterando_estado():
+            self._aplicar_lote(lote)
+
+    def _aplicar_lote(self, lote):
+        # Registros posicionais são normalizados em bloco; dicionários, um a um.
+        if self._instrumentacao is not None:
+            self._processar_lote_medido(lote, self._instrumentacao)
+            return
+        if not all(type(item) is tuple for item in lote):
+            for item in lote:
+                self._processar_linha(item)
+            return
+        validos, motivos = normalizar_lote(lote)
+        for motivo in motivos:
+            self._linhas_rejeitadas[motivo] += 1
+        registrar = self._registrar
+        for registro in validos:
+            registrar(*registro)
+        if self._publicar_vistas and time.monotonic() - self._vista_publicada_em >= self.intervalo_vistas:
+            self.publicar_vista()
+
+    def _processar_lote_medido(self, lote, instr):
+        # Mesmo efeito de _processar_lote, com tempos por etapa e buscas amostradas.
+        criados = (len(self._arvore_conteudos), len(self._arvore_usuarios), len(self._plataformas_registradas))
+        perf = time.perf_counter
+        inicio = perf()
+        if all(type(item) is tuple for item in lote):
+            validos, motivos = normalizar_lote(lote)
+        else:
+            validos, motivos = [], []
+            for item in lote:
+                try:
+                    validos.append(normalizar_linha(item) if isinstance(item, dict) else normalizar_registro(*item))
+                except LinhaInvalida as erro:
+                    motivos.append(erro.motivo)
+        instr.acumular('normalizacao', perf() - inicio, len(lote))
+        for motivo in motivos:
+            self._linhas_rejeitadas[motivo] += 1
+        # Buscas cronometradas à parte a cada `amostragem` registros (contagem global).
+        amostragem = instr.amostragem
+        proxima = -instr.contadores.get('linhas_registradas', 0) % amostragem
+        buscar_conteudo, buscar_usuario = self._arvore_conteudos.buscar, self._arvore_usuarios.buscar
+        registrar = self._registrar
+        em_buscas = 0.0
+        inicio = perf()
+        for i, registro in enumerate(validos):
+            if i == proxima:
+                proxima += amostragem
+                t0 = perf()
+                buscar_conteudo(registro[0])
+                t1 = perf()
+                buscar_usuario(registro[2])
+                t2 = perf()
+                instr.acumular('busca_conteudo', t1 - t0)
+                instr.acumular('busca_usuario', t2 - t1)
+                em_buscas += t2 - t0
+            registrar(*registro)
+        instr.acumular('registro', perf() - inicio - em_buscas, len(validos))
+        instr.contar('lotes')
+        instr.contar('linhas_registradas', len(validos))
+        instr.contar('linhas_rejeitadas', len(motivos))
+        instr.contar('conteudos_criados', len(self._arvore_conteudos) - criados[0])
+        instr.contar('usuarios_criados', len(self._arvore_usuarios) - criados[1])
+        instr.contar('plataformas_criadas', len(self._plataformas_registradas) - criados[2])
+        if self._publicar_vistas and time.monotonic() - self._vista_publicada_em >= self.intervalo_vistas:
+            self.publicar_vista()
+
+    def _processar_linha(self, dados):
+        # Valida a linha (dicionário ou tupla posicional); rejeições são contabilizadas por motivo.
+        try:
+            if isinstance(dados, dict):
+                registro = normalizar_linha(dados)
+            else:
+                registro = normalizar_registro(*dados)
+        except LinhaInvalida as erro:
+            self._linhas_rejeitadas[erro.motivo] += 1
+            return False
+        self._registrar(*registro)
+        return True
+
+    def _registrar(self, id_conteudo, nome_c, id_usuario, nome_plat, tipo_int, dur, comentario,
+                   timestamp=None):
+        # Plataforma
+        plat = self._plataformas_registradas.get(nome_plat)
+        if plat is None:
+            plat = Plataforma(nome_plat, self._guardar_interacoes)
+            if self._sketches:
+                plat.ativar_sketches(*self._sketches)
+            self._plataformas_registradas[nome_plat] = plat
+        # Conteúdo
+        conteudo = self._arvore_conteudos.buscar(id_conteudo)
+        if conteudo is None:
+            classe = self._classe_conteudo(id_conteudo, nome_c)
+            conteudo = classe(id_conteudo, nome_c, self._guardar_interacoes, self._guardar_comentarios)
+            if self._sketches:
+                conteudo.ativar_sketches(*self._sketches)
+            self._arvore_conteudos.inserir(id_conteudo, conteudo)
+            self._indice_tipos.adicionar(conteudo)
+        # Usuário
+        usuario = self._arvore_usuarios.buscar(id_usuario)
+        if usuario is None:
+            usuario = Usuario(id_usuario, self._guardar_interacoes)
+            self._arvore_usuarios.inserir(id_usuario, usuario)
+        # Interação
+        inter = Interacao(usuario, conteudo, plat, tipo_int, dur, comentario, timestamp)
+        # Registro
+        conteudo.registrar_interacao(inter)
+        usuario.registrar_interacao(inter)
+        plat.registrar_interacao(inter)
+        self._indice_tipos.registrar(conteudo.tipo_conteudo, tipo_int, dur)
+        self._total_registradas += 1
+        if self._placares:
+            self._atualizar_placares(conteudo, usuario)
+        if self._indice_temporal is not None:
+            self._indice_temporal.registrar(timestamp, id_conteudo, id_usuario, nome_plat, tipo_int, dur)
+        if self._indice_comentarios is not None and comentario and tipo_int == 'comment':
+            self._indice_comentarios.registrar(id_conteudo, id_usuario, comentario)
+        if self._coengajamento is not None:
+            self._coengajamento.registrar(id_usuario, id_conteudo)
+        if self._alterados is not None:
+            self._alterados[0].add(conteudo)
+            self._alterados[1].add(usuario)
+            self._alterados[2].add(plat)
+        if self._eventos is not None:
+            self._eventos.append((id_conteudo, id_usuario, nome_plat, inter.tipo, inter.duracao,
+                                  inter.comentario, timestamp))
+
+    def _classe_conteudo(self, id_conteudo, nome):
+        # Subclasse do conteúdo: tipo declarado ou, na falta dele, inferido do nome.
+        tipo = self._tipos_declarados.get(id_conteudo) or inferir_tipo_conteudo(nome)
+        return TIPOS_CONTEUDO[tipo]
+
+    # Tipos de conteúdo
+    def declarar_tipo_conteudo(self, id_conteudo: int, tipo: str):
+        """
+        Declara o tipo ('video', 'podcast' ou 'artigo') do conteúdo, com
+        precedência sobre a inferência pelo nome. O ID é convertido com int(),
+        como na ingestão (ValueError se inválido). Um conteúdo já registrado
+        com outro tipo é reclassificado, levando seus totais para o novo tipo.
+        """
+        id_conteudo = validar_id_conteudo(id_conteudo)
+        tipo = validar_tipo(tipo)
+        self._tipos_declarados[id_conteudo] = tipo
+        conteudo = self._arvore_conteudos.buscar(id_conteudo)
+        if conteudo is None or conteudo.tipo_conteudo == tipo:
+            return
+        with self._alterando_estado():
+            self._indice_tipos.remover(conteudo)
+            # As subclasses não acrescentam slots, então a troca de classe é segura.
+            conteudo.__class__ = TIPOS_CONTEUDO[tipo]
+            self._indice_tipos.adicionar(conteudo)
+            if self._alterados is not None:
+                self._alterados[0].add(conteudo)
+
+    def listar_conteudos_por_tipo(self, tipo: str) -> list:
+        """Conteúdos do tipo em ordem de ID: O(k), k = conteúdos do tipo."""
+        return self._indice_tipos.conteudos(validar_tipo(tipo))
+
+    def totais_por_tipo(self) -> dict:
+        """
+        {tipo: {'conteudos', 'total_interacoes', 'tempo_total_consumo',
+        'total_visualizacoes', 'total_engajamento', 'total_comentarios'}},
+        na ordem de primeira ocorrência dos tipos: O(t), t = tipos.
+        """
+        return {tipo: totais.como_dict() for tipo, totais in self._indice_tipos.totais().items()}
+
+    def gerar_ranking_por_tipo(self, tipo: str, relatorio: str = 'conteudos_interacoes', n=None):
+        """
+        Ranking de conteúdos `relatorio` (um de RANKINGS sobre conteúdos)
+        restrito ao tipo: O(k log n), k = conteúdos do tipo.
+        """
+        tipo = validar_tipo(tipo)
+        indice, atributo = RANKINGS[relatorio]
+        if indice != 'conteudos':
+            raise ValueError("ranking por tipo exige um relatório de conteúdos")
+        return self._em_cache((f'{relatorio}_{tipo}', n, None, None), self._indice_tipos.ranking,
+                              tipo, atributo, n)
+
+    def reconstruir_indice_tipos(self):
+        """Remonta o índice de tipos a partir de todos os conteúdos (ex.: após restaurar um snapshot)."""
+        self._indice_tipos = IndiceTipos.de_conteudos(v for _, v in self._arvore_conteudos.intervalo())
 
     # Relatórios conforme solicitação
-    def gerar_top_conteudos_por_tempo(self, n=None):
-        pares = self._arvore_conteudos.percurso_em_ordem()
-        lista = [v for _, v in pares]
-        orden = sorted(lista, key=lambda c: c.tempo_total_consumo, reverse=True)
-        return orden[:n] if n else orden
-
-    def gerar_top_usuarios_por_interacoes(self, n=None):
-        pares = self._arvore_usuarios.percurso_em_ordem()
-        lista = [v for _, v in pares]
-        orden = sorted(lista, key=lambda u: u.total_interacoes, reverse=True)
-        return orden[:n] if n else orden
-
-    def gerar_ranking_usuarios_por_tempo(self, n=None):
-        pares = self._arvore_usuarios.percurso_em_ordem()
-        lista = [v for _, v in pares]
-        orden = sorted(lista, key=lambda u: u.tempo_total_consumo, reverse=True)
-        return orden[:n] if n else orden
-
-    def gerar_ranking_plataformas_por_engajamento(self, n=None):
-        lista = list(self._plataformas_registradas.values())
-        orden = sorted(lista, key=lambda p: p.calcular_total_interacoes_engajamento(), reverse=True)
-        return orden[:n] if n else orden
-
-    def gerar_ranking_conteudos_por_comentarios(self, n=None):
-        pares = self._arvore_conteudos.percurso_em_ordem()
-        lista = [v for _, v in pares]
-        orden = sorted(lista, key=lambda c: c.calcular_contagem_por_tipo_interacao().get('comment', 0), reverse=True)
-        return orden[:n] if n else orden
+    # Com `inicio`/`fim` (segundos, datetime ou texto ISO) os relatórios usam o
+    # índice temporal e devolvem MetricasJanela só das entidades ativas na janela.
+    def gerar_top_conteudos_por_tempo(self, n=None, inicio=None, fim=None):
+        return self._ranking('conteudos_tempo', n, inicio, fim)
 
-    def gerar_conteudos_por_total_interacoes(self, n=None):
-        pares = self._arvore_conteudos.percurso_em_ordem()
-        lista = [v for _, v in pares]
-        orden = sorted(lista, key=lambda c: c.total_interacoes, reverse=True)
-        return orden[:n] if n else orden
+    def gerar_top_usuarios_por_interacoes(self, n=None, inicio=None, fim=None):
+        return self._ranking('usuarios_interacoes', n, inicio, fim)
+
+    def gerar_ranking_usuarios_por_tempo(self, n=None, inicio=None, fim=None):
+        return self._ranking('usuarios_tempo', n, inicio, fim)
+
+    def gerar_ranking_plataformas_por_engajamento(self, n=None, inicio=None, fim=None):
+        return self._ranking('plataformas_engajamento', n, inicio, fim)
+
+    def gerar_ranking_conteudos_por_comentarios(self, n=None, inicio=None, fim=None):
+        return self._ranking('conteudos_comentarios', n, inicio, fim)
+
+    def gerar_conteudos_por_total_interacoes(self, n=None, inicio=None, fim=None):
+        return self._ranking('conteudos_interacoes', n, inicio, fim)
+
+    def intervalo_temporal(self):
+        """
+        (início do primeiro bucket, fim do último) das interações com data,
+        ou None se não houver nenhuma; base para janelas como "últimos 7 dias".
+        """
+        if self._indice_temporal is None:
+            raise ValueError("relatórios por janela exigem largura_bucket no sistema")
+        return self._indice_temporal.intervalo()
+
+    def _ranking(self, nome, n, inicio=None, fim=None):
+        inicio, fim = para_epoca(inicio), para_epoca(fim)
+        return self._em_cache((nome, n, inicio, fim), self._calcular_ranking, nome, n, inicio, fim)
+
+    def _calcular_ranking(self, nome, n, inicio, fim):
+        # Top-n pelo placar quando disponível; senão heap O(m log n) ou ordenação completa.
+        indice, atributo = RANKINGS[nome]
+        if inicio is not None or fim is not None:
+            lista = self._listar_janela(indice, inicio, fim)
+        else:
+            placar = self._placares.get(nome)
+            if n and placar is not None and n <= placar.capacidade:
+                return placar.top(n)
+            lista = self._listar(indice)
+        chave = attrgetter(atributo)
+        if n:
+            return heapq.nlargest(n, lista, key=chave)
+        return sorted(lista, key=chave, reverse=True)
+
+    def _listar(self, indice):
+        if indice == 'conteudos':
+            return [v for _, v in self._arvore_conteudos.percurso_em_ordem()]
+        if indice == 'usuarios':
+            return [v for _, v in self._arvore_usuarios.percurso_em_ordem()]
+        return list(self._plataformas_registradas.values())
+
+    def _listar_janela(self, indice, inicio, fim):
+        # MetricasJanela das entidades ativas na janela, na mesma ordem de _listar.
+        if self._indice_temporal is None:
+            raise ValueError("relatórios por janela exigem largura_bucket no sistema")
+        agregados = self._indice_temporal.agregar(indice, para_epoca(inicio), para_epoca(fim))
+        if indice == 'conteudos':
+            return [MetricasJanela(k, self._arvore_conteudos.buscar(k).nome, *agregados[k])
+                    for k in sorted(agregados)]
+        if indice == 'usuarios':
+            return [MetricasJanela(k, None, *agregados[k]) for k in sorted(agregados)]
+        return [MetricasJanela(None, nome, *agregados[nome])
+                for nome in self._plataformas_registradas if nome in agregados]
+
+    def publicar_vista(self, completa: bool = False):
+        """
+        Publica uma VistaSistema com o estado atual e a retorna. Deve ser
+        chamado pela thread que ingere; com publicar_vistas=True os caminhos
+        de ingestão já publicam periodicamente. Sem rastreamento de
+        alterações (ou com `completa`, após cargas em massa) todas as
+        entidades são recongeladas.
+        """
+        from analise.vista import VistaSistema
+        if completa or self._vista is None or self._alterados is None:
+            vista = VistaSistema.capturar(self)
+        else:
+            vista = self._vista.atualizar(self, *self._alterados)
+        if self._alterados is not None:
+            self._alterados = (set(), set(), set())
+        self._vista = vista
+        self._vista_publicada_em = time.monotonic()
+        return vista
+
+    def obter_vista(self):
+        """
+        Última VistaSistema publicada (vazia se nenhuma foi publicada). Seguro
+        para chamar de outras threads durante a ingestão: não usa lock e a
+        vista retornada nunca muda.
+        """
+        vista = self._vista
+        if vista is None:
+            from analise.vista import VistaSistema
+            vista = VistaSistema()
+        return vista
+
+    # Navegação em ordem de ID, sem montar a lista de todas as entidades
+    def iterar_conteudos(self, inicio: int = None, fim: int = None):
+        """Gera sob demanda os conteúdos com inicio <= ID <= fim (None = sem limite), em ordem de ID."""
+        return (v for _, v in self._arvore_conteudos.intervalo(inicio, fim))
+
+    def iterar_usuarios(self, inicio: int = None, fim: int = None):
+        """Gera sob demanda os usuários com inicio <= ID <= fim (None = sem limite), em ordem de ID."""
+        return (v for _, v in self._arvore_usuarios.intervalo(inicio, fim))
+
+    def pagina_conteudos(self, pagina: int, tamanho: int = 20) -> list:
+        """Conteúdos da página (a partir de 0) em ordem de ID: O(h + tamanho)."""
+        return self._pagina(self._arvore_conteudos, pagina, tamanho)
+
+    def pagina_usuarios(self, pagina: int, tamanho: int = 20) -> list:
+        """Usuários da página (a partir de 0) em ordem de ID: O(h + tamanho)."""
+        return self._pagina(self._arvore_usuarios, pagina, tamanho)
+
+    @staticmethod
+    def _pagina(arvore, pagina, tamanho):
+        # select localiza a primeira chave da página; o intervalo gera só as seguintes.
+        if pagina < 0 or tamanho <= 0:
+            raise ValueError("pagina deve ser >= 0 e tamanho positivo")
+        deslocamento = pagina * tamanho
+        if deslocamento >= len(arvore):
+            return []
+        primeira, _ = arvore.select(deslocamento)
+        return [v for _, v in islice(arvore.intervalo(primeira), tamanho)]
 
-    def calcular_tempo_medio_consumo_por_plataforma(self):
+    def reconstruir_placares(self):
+        """Recalcula os placares a partir de todas as entidades (ex.: após mesclar parciais)."""
+        for nome, placar in self._placares.items():
+            indice, atributo = RANKINGS[nome]
+            novo = Placar(placar.capacidade)
+            for entidade in self._listar(indice):
+                novo.atualizar(entidade.id, getattr(entidade, atributo), entidade)
+            self._placares[nome] = novo
+
+    def _atualizar_placares(self, conteudo, usuario):
+        for nome, placar in self._placares.items():
+            indice, atributo = RANKINGS[nome]
+            entidade = conteudo if indice == 'conteudos' else usuario
+            placar.atualizar(entidade.id, getattr(entidade, atributo), entidade)
+
+    def calcular_tempo_medio_consumo_por_plataforma(self, inicio=None, fim=None):
+        inicio, fim = para_epoca(inicio), para_epoca(fim)
+        return self._em_cache(('tempo_medio_plataformas', None, inicio, fim),
+                              self._calcular_tempo_medio_por_plataforma, inicio, fim)
+
+    def _calcular_tempo_medio_por_plataforma(self, inicio, fim):
         medias = {}
-        for p in self._plataformas_registradas.values():
-            contagem = p.calcular_contagem_por_tipo_interacao()
-            qtd_views = contagem.get('view_start', 0)
+        plataformas = (self._plataformas_registradas.values() if inicio is None and fim is None
+                       else self._listar_janela('plataformas', inicio, fim))
+        for p in plataformas:
+            qtd_views = p.total_visualizacoes
             medias[p.nome] = (p.tempo_total_consumo / qtd_views) if qtd_views else 0.0
         return medias
 
-    def contar_comentarios_por_conteudo(self):
+    def contar_comentarios_por_conteudo(self, inicio=None, fim=None):
+        inicio, fim = para_epoca(inicio), para_epoca(fim)
+        return self._em_cache(('comentarios_conteudos', None, inicio, fim),
+                              self._contar_comentarios, inicio, fim)
+
+    def _contar_comentarios(self, inicio, fim):
+        if inicio is not None or fim is not None:
+            return {m.nome: m.total_comentarios for m in self._listar_janela('conteudos', inicio, fim)}
         pares = self._arvore_conteudos.percurso_em_ordem()
-        return {v.nome: v.calcular_contagem_por_tipo_interacao().get('comment', 0) for _, v in pares}
+        return {v.nome: v.total_comentarios for _, v in pares}
+
+    # Estimativas dos sketches (erro_distintos / erro_frequentes)
+    def estimar_usuarios_distintos_por_conteudo(self) -> dict:
+        """{nome do conteúdo: usuários distintos estimados}, em ordem de ID."""
+        return self._em_cache(('distintos_conteudos', None, None, None), self._estimar_distintos,
+                              [v for _, v in self._arvore_conteudos.percurso_em_ordem()])
+
+    def estimar_usuarios_distintos_por_plataforma(self) -> dict:
+        """{plataforma: usuários distintos estimados}, em ordem de primeira ocorrência."""
+        return self._em_cache(('distintos_plataformas', None, None, None), self._estimar_distintos,
+                              list(self._plataformas_registradas.values()))
+
+    def usuarios_mais_ativos_por_conteudo(self, id_conteudo: int, n: int = 10) -> list:
+        """Até n triplas (id_usuario, interações estimadas, erro máximo) do conteúdo."""
+        return self._usuarios_frequentes(self._arvore_conteudos.buscar(id_conteudo), n)
+
+    def usuarios_mais_ativos_por_plataforma(self, nome: str, n: int = 10) -> list:
+        """Até n triplas (id_usuario, interações estimadas, erro máximo) da plataforma."""
+        return self._usuarios_frequentes(self._plataformas_registradas.get(nome), n)
+
+    def _estimar_distintos(self, entidades):
+        if not self._erro_distintos:
+            raise ValueError("estimativa de usuários distintos exige erro_distintos no sistema")
+        return {e.nome: e.usuarios_distintos.estimar() if e.usuarios_distintos is not None else 0
+                for e in entidades}
+
+    def _usuarios_frequentes(self, entidade, n):
+        if not self._erro_frequentes:
+            raise ValueError("usuários mais ativos exigem erro_frequentes no sistema")
+        if entidade is None or entidade.usuarios_frequentes is None:
+            return []
+        return entidade.usuarios_frequentes.top(n)
+
+    def buscar_conteudos_por_comentario(self, consulta: str) -> list:
+        """
+        Conteúdos (em ordem de ID) com comentários que mencionam todos os
+        termos da consulta, sem diferenciar maiúsculas nem acentos.
+        """
+        ids = self._exigir_indice_comentarios().conteudos(consulta)
+        return [self._arvore_conteudos.buscar(i) for i in ids]
+
+    def termos_frequentes(self, id_conteudo: int, n: int = 10) -> list:
+        """Até n pares (termo, ocorrências) mais frequentes nos comentários do conteúdo."""
+        return self._exigir_indice_comentarios().termos_frequentes(id_conteudo, n)
+
+    def _exigir_indice_comentarios(self):
+        if self._indice_comentarios is None:
+            raise ValueError("busca em comentários exige indexar_comentarios=True no sistema")
+        return self._indice_comentarios
+
+    def conteudos_similares(self, id_conteudo: int, k: int = 10) -> list:
+        """
+        Até k pares (conteúdo, similaridade) dos conteúdos com mais usuários
+        em comum com `id_conteudo`, pelo cosseno (ver analise.coengajamento);
+        empates em ordem de ID.
+        """
+        similares = self._exigir_coengajamento().conteudos_similares(id_conteudo, k)
+        return [(self._arvore_conteudos.buscar(i), similaridade) for i, similaridade, _ in similares]
+
+    def usuarios_em_comum(self, id_a: int, id_b: int) -> int:
+        """Usuários distintos que interagiram com os dois conteúdos."""
+        return self._exigir_coengajamento().usuarios_em_comum(id_a, id_b)
+
+    def _exigir_coengajamento(self):
+        if self._coengajamento is None:
+            raise ValueError("conteúdos similares exigem coengajamento=True no sistema")
+        return self._coengajamento
+
+    @contextmanager
+    def _alterando_estado(self):
+        # Toda mudança do estado agregado: a geração avança ao entrar e ao sair, e
+        # _em_cache não guarda o que foi calculado com uma alteração em curso.
+        self._alteracoes_em_curso += 1
+        self._geracao += 1
+        try:
+            yield
+        finally:
+            self._geracao += 1
+            self._alteracoes_em_curso -= 1
+
+    def _em_cache(self, chave, calcular, *args):
+        # Resultado memorizado (LRU); o cache inteiro é descartado quando a geração muda.
+        instr = self._instrumentacao
+        if instr is not None:
+            calcular = self._medir_relatorio(chave[0], calcular, instr)
+        if not self._tamanho_cache:
+            return calcular(*args)
+        cache = self._cache_relatorios
+        with self._trava_cache:
+            geracao = self._geracao
+            estavel = not self._alteracoes_em_curso
+            if self._cache_geracao != geracao:
+                cache.clear()
+                self._cache_geracao = geracao
+            resultado = cache.get(chave)
+            if resultado is not None:
+                cache.move_to_end(chave)
+        if resultado is not None:
+            if instr is not None:
+                instr.contar('cache_acertos')
+            return resultado
+        resultado = calcular(*args)
+        with self._trava_cache:
+            # Só guarda o que foi calculado sem alteração do estado antes, durante ou depois.
+            if (estavel and not self._alteracoes_em_curso
+                    and self._cache_geracao == geracao == self._geracao):
+                cache[chave] = resultado
+                if len(cache) > self._tamanho_cache:
+                    cache.popitem(last=False)
+        return resultado
+
+    @staticmethod
+    def _medir_relatorio(nome, calcular, instr):
+        def medido(*args):
+            with instr.cronometrar(f'relatorio.{nome}'):
+                return calcular(*args)
+        return medido
+
+    # Instrumentação
+    def ativar_instrumentacao(self, amostragem: int = AMOSTRAGEM_BUSCAS):
+        """Liga (ou reinicia) a instrumentação e a retorna."""
+        self._instrumentacao = Instrumentacao(amostragem)
+        return self._instrumentacao
+
+    def desativar_instrumentacao(self):
+        self._instrumentacao = None
+
+    def estatisticas(self) -> dict:
+        """
+        Tamanho e altura dos índices (altura None para RegistroHash), fila,
+        cache e ingestão; com a instrumentação ligada, também os contadores e
+        tempos em 'instrumentacao'. Altura da BST simples: O(n).
+        """
+        indices = {}
+        for nome, arvore in (('conteudos', self._arvore_conteudos), ('usuarios', self._arvore_usuarios)):
+            altura = arvore.altura() if hasattr(arvore, 'altura') else None
+            indices[nome] = {'tipo': type(arvore).__name__, 'nos': len(arvore), 'altura': altura}
+        indices['plataformas'] = len(self._plataformas_registradas)
+        resultado = {'indices': indices, 'fila': len(self._fila_interacoes_brutas),
+                     'cache': len(self._cache_relatorios), 'ingestao': self.resumo_ingestao()}
+        if self._instrumentacao is not None:
+            resultado['instrumentacao'] = self._instrumentacao.estatisticas()
+        return resultado
 
     def obter_fila_interacoes(self):
         return self._fila_interacoes_brutas
 
     def limpar_fila_interacoes(self):
-        while not self._fila_interacoes_brutas.esta_vazia():
-            self._fila_interacoes_brutas.desenfileirar()
+        self._fila_interacoes_brutas.limpar()
 
     def esta_fila_vazia(self):
         return self._fila_interacoes_brutas.esta_vazia()
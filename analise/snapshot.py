@@ -0,0 +1,385 @@
+"""
+Snapshot binário do estado agregado de SistemaAnaliseEngajamento.
+
+O arquivo guarda apenas o estado agregado (entidades, contadores, comentários
+e registro de plataformas), nunca as interações brutas, então o tempo de
+carga é proporcional ao número de entidades e não ao de eventos. A leitura
+usa `mmap` e `struct.iter_unpack` sobre regiões de tamanho fixo.
+
+Layout (little-endian), seções em sequência logo após o cabeçalho:
+
+    cabeçalho      CABECALHO (magic, versão e quantidades de cada seção)
+    strings        n_strings + 1 offsets uint64 e o blob UTF-8 concatenado
+    conteúdos      REG_CONTEUDO por conteúdo, em ordem de ID
+    usuários       REG_USUARIO por usuário, em ordem de ID
+    plataformas    REG_PLATAFORMA por plataforma, em ordem de registro
+    contagens      n_contagens uint32 (índice do tipo na tabela de strings;
+                   SEM_TIPO para interações sem tipo_interacao)
+                   seguidos de n_contagens int64 (quantidade), na ordem de
+                   primeira ocorrência de cada tipo na entidade
+    comentários    n_comentarios uint32 (índice na tabela de strings)
+    extras         JSON UTF-8 com metadados (resumo da ingestão e checkpoints
+                   da ingestão incremental)
+    diretório      SECAO (nome, tamanho uint64) por seção opcional
+    seções         conteúdo de cada seção, na ordem do diretório
+
+As seções opcionais guardam o estado dos recursos ligados no sistema
+(índices temporal e de comentários, sketches, matriz de coengajamento).
+Cada uma é a estrutura exportada pelo módulo com os `array`/`bytes`
+trocados por referências a buffers binários:
+
+    ESTRUTURA_SECAO (tamanho do JSON, n_buffers), JSON UTF-8 da estrutura,
+    n_buffers + 1 offsets uint64 e os bytes dos buffers concatenados
+
+Na carga, o diretório é lido e só as seções dos recursos ligados no sistema
+de destino são decodificadas; as demais são puladas sem leitura. Um recurso
+ligado sem seção (ou gravado com outra configuração) torna o snapshot
+inválido para esse sistema: SnapshotInvalido, e o estado vem do CSV.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from analise.coengajamento import MatrizCoengajamento
+from analise.indice_comentarios import IndiceComentarios
+from analise.indice_temporal import IndiceTemporal
+from entidades.conteudo import Conteudo, Video, Podcast, Artigo
+from entidades.plataforma import Plataforma
+from entidades.usuario import Usuario
+from estruturas_dados.sketches import HyperLogLog, SpaceSaving
+
+MAGIC = b'GLOBOSNP'
+VERSAO = 3
+
+# magic, versão, n_strings, n_conteudos, n_usuarios, n_plataformas,
+# n_contagens, n_comentarios, tamanho do blob, tamanho dos extras, n_secoes
+CABECALHO = struct.Struct('<8sHxxIIIIIIQQI')
+# nome da seção (ASCII, completado com zeros), tamanho em bytes
+SECAO = struct.Struct('<32sQ')
+# tamanho do JSON da estrutura, quantidade de buffers binários
+ESTRUTURA_SECAO = struct.Struct('<QQ')
+# id, classe (str), nome (str), tempo, total, engajamento, views, comentários,
+# início/qtd em contagens, início/qtd em comentários
+REG_CONTEUDO = struct.Struct('<qIIdqqqqIHII')
+# id, tempo, total, engajamento, views, comentários, início/qtd em contagens
+REG_USUARIO = struct.Struct('<qdqqqqIH')
+# nome (str), tempo, total, engajamento, views, comentários, início/qtd em contagens
+REG_PLATAFORMA = struct.Struct('<IdqqqqIH')
+
+# Índice de contagem para o tipo None (linha sem tipo_interacao, aceita na ingestão).
+SEM_TIPO = 0xFFFFFFFF
+
+CLASSES_CONTEUDO = {cls.__name__: cls for cls in (Conteudo, Video, Podcast, Artigo)}
+
+
+class SnapshotInvalido(ValueError):
+    """Arquivo não é um snapshot reconhecido (magic ou versão incompatíveis)."""
+
+
+class _TabelaStrings:
+    # Deduplica strings e atribui índices na ordem de inserção.
+    def __init__(self):
+        self.indices = {}
+
+    def indice(self, texto: str) -> int:
+        idx = self.indices.get(texto)
+        if idx is None:
+            idx = self.indices[texto] = len(self.indices)
+        return idx
+
+
+def salvar_snapshot(sistema, caminho: str, extras: dict = None):
+    """Grava o estado agregado de `sistema` em `caminho` (escrita atômica)."""
+    strings = _TabelaStrings()
+    cont_tipos, cont_qtds, comentarios = array('I'), array('q'), array('I')
+
+    def contagens(entidade):
+        inicio = len(cont_tipos)
+        for tipo, qtd in entidade.contagens_por_tipo.items():
+            cont_tipos.append(strings.indice(tipo) if tipo is not None else SEM_TIPO)
+            cont_qtds.append(qtd)
+        return inicio, len(cont_tipos) - inicio
+
+    def metricas(e):
+        return (e.tempo_total_consumo, e.total_interacoes, e.total_engajamento,
+                e.total_visualizacoes, e.total_comentarios)
+
+    regs_conteudo = bytearray()
+    n_conteudos = 0
+    for _, c in sistema._arvore_conteudos.percurso_em_ordem():
+        com_inicio = len(comentarios)
+        comentarios.extend(strings.indice(t) for t in c.listar_comentarios())
+        regs_conteudo += REG_CONTEUDO.pack(
+            c.id, strings.indice(type(c).__name__), strings.indice(c.nome), *metricas(c),
+            *contagens(c), com_inicio, len(comentarios) - com_inicio)
+        n_conteudos += 1
+
+    regs_usuario = bytearray()
+    n_usuarios = 0
+    for _, u in sistema._arvore_usuarios.percurso_em_ordem():
+        regs_usuario += REG_USUARIO.pack(u.id, *metricas(u), *contagens(u))
+        n_usuarios += 1
+
+    regs_plataforma = bytearray()
+    for p in sistema._plataformas_registradas.values():
+        regs_plataforma += REG_PLATAFORMA.pack(strings.indice(p.nome), *metricas(p), *contagens(p))
+
+    dados_extras = {'registradas': sistema._total_registradas,
+                    'rejeitadas': sistema._linhas_rejeitadas,
+                    'checkpoints': sistema._checkpoints}
+    dados_extras.update(extras or {})
+    bytes_extras = json.dumps(dados_extras).encode('utf-8')
+
+    secoes = {}
+    if sistema._indice_temporal is not None:
+        secoes['indice_temporal'] = sistema._indice_temporal.exportar()
+    if sistema._indice_comentarios is not None:
+        secoes['indice_comentarios'] = sistema._indice_comentarios.exportar()
+    if sistema._coengajamento is not None:
+        secoes['coengajamento'] = sistema._coengajamento.exportar()
+    if sistema._sketches:
+        secoes['sketches'] = {
+            'conteudos': [[c.id, *_exportar_sketches(c)] for _, c in sistema._arvore_conteudos.percurso_em_ordem()],
+            'plataformas': [[p.nome, *_exportar_sketches(p)] for p in sistema._plataformas_registradas.values()],
+        }
+    secoes = {nome: _empacotar_secao(dados) for nome, dados in secoes.items()}
+
+    offsets = array('Q', [0])
+    blob = bytearray()
+    for texto in strings.indices:
+        blob += texto.encode('utf-8')
+        offsets.append(len(blob))
+
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(CABECALHO.pack(
+            MAGIC, VERSAO, len(strings.indices), n_conteudos, n_usuarios,
+            len(sistema._plataformas_registradas), len(cont_tipos), len(comentarios),
+            len(blob), len(bytes_extras), len(secoes)))
+        arquivo.write(_little_endian(offsets))
+        arquivo.write(blob)
+        arquivo.write(regs_conteudo)
+        arquivo.write(regs_usuario)
+        arquivo.write(regs_plataforma)
+        arquivo.write(_little_endian(cont_tipos))
+        arquivo.write(_little_endian(cont_qtds))
+        arquivo.write(_little_endian(comentarios))
+        arquivo.write(bytes_extras)
+        for nome, partes in secoes.items():
+            arquivo.write(SECAO.pack(nome.encode('ascii'), sum(memoryview(p).nbytes for p in partes)))
+        for partes in secoes.values():
+            for parte in partes:
+                arquivo.write(parte)
+    os.replace(temporario, caminho)
+
+
+def carregar_snapshot(caminho: str, sistema):
+    """
+    Restaura em `sistema` (recém-criado, vazio) o estado gravado em `caminho`.
+    Retorna o dicionário de extras.
+    """
+    with open(caminho, 'rb') as arquivo:
+        if os.fstat(arquivo.fileno()).st_size < CABECALHO.size:
+            raise SnapshotInvalido("arquivo menor que o cabeçalho")
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mm, sistema._alterando_estado():
+            return _restaurar(mm, sistema)
+
+
+def _restaurar(buf, sistema):
+    # `buf` é o mmap: unpack_from lê no lugar e fatias viram bytes só da região usada.
+    (magic, versao, n_strings, n_conteudos, n_usuarios, n_plataformas,
+     n_contagens, n_comentarios, tam_blob, tam_extras, n_secoes) = CABECALHO.unpack_from(buf, 0)
+    if magic != MAGIC or versao != VERSAO:
+        raise SnapshotInvalido(f"snapshot incompatível (magic={magic!r}, versão={versao})")
+    pos = CABECALHO.size
+
+    offsets = _ler_array(buf, pos, 'Q', n_strings + 1)
+    pos += 8 * (n_strings + 1)
+    blob = buf[pos:pos + tam_blob]
+    pos += tam_blob
+    strings = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(n_strings)]
+
+    def regiao(estrutura, qtd):
+        nonlocal pos
+        inicio = pos
+        pos += estrutura.size * qtd
+        return estrutura.iter_unpack(buf[inicio:pos])
+
+    regs_conteudo = regiao(REG_CONTEUDO, n_conteudos)
+    regs_usuario = regiao(REG_USUARIO, n_usuarios)
+    regs_plataforma = regiao(REG_PLATAFORMA, n_plataformas)
+    cont_tipos = [strings[i] if i != SEM_TIPO else None
+                  for i in _ler_array(buf, pos, 'I', n_contagens)]
+    pos += 4 * n_contagens
+    cont_qtds = _ler_array(buf, pos, 'q', n_contagens)
+    pos += 8 * n_contagens
+    comentarios = _ler_array(buf, pos, 'I', n_comentarios)
+    pos += 4 * n_comentarios
+    extras = json.loads(buf[pos:pos + tam_extras].decode('utf-8'))
+    pos += tam_extras
+    # Seção -> (início, tamanho); o conteúdo só é lido por _ler_secao.
+    secoes = {}
+    inicio_secao = pos + SECAO.size * n_secoes
+    for nome, tamanho in SECAO.iter_unpack(buf[pos:inicio_secao]):
+        secoes[nome.rstrip(b'\0').decode('ascii')] = (inicio_secao, tamanho)
+        inicio_secao += tamanho
+    # Um recurso ligado sem a sua seção ficaria vazio, e os checkpoints impediriam
+    # a ingestão incremental de preenchê-lo: o snapshot não serve a este sistema.
+    ligados = {'indice_temporal': sistema._indice_temporal, 'indice_comentarios': sistema._indice_comentarios,
+               'coengajamento': sistema._coengajamento, 'sketches': sistema._sketches}
+    ausentes = [nome for nome, recurso in ligados.items() if recurso is not None and nome not in secoes]
+    if ausentes:
+        raise SnapshotInvalido(f"snapshot sem as seções dos recursos ligados: {', '.join(ausentes)}")
+
+    def preencher(entidade, tempo, total, engaj, views, coment, c_ini, c_qtd):
+        entidade.tempo_total_consumo = tempo
+        entidade.total_interacoes = total
+        entidade.total_engajamento = engaj
+        entidade.total_visualizacoes = views
+        entidade.total_comentarios = coment
+        entidade.contagens_por_tipo = {cont_tipos[i]: cont_qtds[i]
+                                       for i in range(c_ini, c_ini + c_qtd)}
+        return entidade
+
+    guardar = sistema._guardar_interacoes
+    # Os registros estão em ordem de ID (percurso_em_ordem): os índices são montados em O(n).
+    conteudos = []
+    for id_c, classe, nome, *metricas, com_ini, com_qtd in regs_conteudo:
+        classe = CLASSES_CONTEUDO[strings[classe]]
+        if classe is Conteudo or id_c in sistema._tipos_declarados:
+            # Snapshots anteriores aos tipos gravam a classe base; o tipo declarado prevalece.
+            classe = sistema._classe_conteudo(id_c, strings[nome])
+        conteudo = classe(id_c, strings[nome], guardar, sistema._guardar_comentarios)
+        preencher(conteudo, *metricas)
+        if conteudo._comentarios is not None:
+            conteudo._comentarios = [strings[i] for i in comentarios[com_ini:com_ini + com_qtd]]
+        conteudos.append((id_c, conteudo))
+    sistema._arvore_conteudos.carregar_ordenados(conteudos)
+    sistema.reconstruir_indice_tipos()
+    sistema._arvore_usuarios.carregar_ordenados(
+        (id_u, preencher(Usuario(id_u, guardar), *metricas)) for id_u, *metricas in regs_usuario)
+    for nome, *metricas in regs_plataforma:
+        sistema._plataformas_registradas[strings[nome]] = preencher(
+            Plataforma(strings[nome], guardar), *metricas)
+
+    sistema._total_registradas = extras.get('registradas', 0)
+    sistema._linhas_rejeitadas.update(extras.get('rejeitadas', {}))
+    sistema._checkpoints = extras.get('checkpoints', {})
+    if sistema._indice_temporal is not None:
+        indice = IndiceTemporal.importar(_ler_secao(buf, *secoes['indice_temporal']))
+        if (indice.largura_bucket, indice.largura_bucket_usuarios) != (
+                sistema._largura_bucket, sistema._largura_bucket_usuarios):
+            raise SnapshotInvalido("índice temporal gravado com outras larguras de bucket")
+        sistema._indice_temporal = indice
+    if sistema._indice_comentarios is not None:
+        sistema._indice_comentarios = IndiceComentarios.importar(_ler_secao(buf, *secoes['indice_comentarios']))
+    if sistema._coengajamento is not None:
+        sistema._coengajamento = MatrizCoengajamento.importar(_ler_secao(buf, *secoes['coengajamento']))
+    if sistema._sketches:
+        _restaurar_sketches(sistema, _ler_secao(buf, *secoes['sketches']))
+    sistema.reconstruir_placares()
+    if sistema._publicar_vistas:
+        sistema.publicar_vista(completa=True)
+    return extras
+
+
+def _little_endian(valores):
+    # O arquivo é little-endian; em máquinas big-endian o array é copiado e invertido.
+    if sys.byteorder == 'big':
+        valores = array(valores.typecode, valores)
+        valores.byteswap()
+    return valores
+
+
+def _ler_array(buf, pos, tipo, qtd):
+    # Lê `qtd` valores little-endian do tipo `tipo` a partir de `pos`.
+    valores = array(tipo)
+    valores.frombytes(buf[pos:pos + qtd * valores.itemsize])
+    if sys.byteorder == 'big':
+        valores.byteswap()
+    return valores
+
+
+def _empacotar_secao(dados) -> list:
+    # Partes da seção: cabeçalho, JSON da estrutura (arrays e bytes viram
+    # {'$b': índice do buffer, 't': typecode}), offsets e buffers.
+    buffers = []
+
+    def trocar(valor):
+        if isinstance(valor, (array, bytes, bytearray)):
+            tipo = valor.typecode if isinstance(valor, array) else ''
+            buffers.append(_little_endian(valor) if tipo else valor)
+            return {'$b': len(buffers) - 1, 't': tipo}
+        if isinstance(valor, dict):
+            return {chave: trocar(v) for chave, v in valor.items()}
+        if isinstance(valor, (list, tuple)):
+            return [trocar(v) for v in valor]
+        return valor
+
+    estrutura = json.dumps(trocar(dados)).encode('utf-8')
+    offsets = array('Q', [0])
+    for buffer in buffers:
+        offsets.append(offsets[-1] + memoryview(buffer).nbytes)
+    return [ESTRUTURA_SECAO.pack(len(estrutura), len(buffers)), estrutura,
+            _little_endian(offsets), *buffers]
+
+
+def _ler_secao(buf, inicio, tamanho):
+    # Decodifica uma seção gravada por _empacotar_secao; os buffers voltam como array ou bytearray.
+    tam_estrutura, n_buffers = ESTRUTURA_SECAO.unpack_from(buf, inicio)
+    pos = inicio + ESTRUTURA_SECAO.size
+    estrutura = json.loads(buf[pos:pos + tam_estrutura].decode('utf-8'))
+    pos += tam_estrutura
+    offsets = _ler_array(buf, pos, 'Q', n_buffers + 1)
+    pos += 8 * (n_buffers + 1)
+    if pos + offsets[-1] != inicio + tamanho:
+        raise SnapshotInvalido("seção com tamanho inconsistente")
+
+    def restaurar(valor):
+        if isinstance(valor, dict):
+            if '$b' in valor:
+                i, tipo = valor['$b'], valor['t']
+                if not tipo:
+                    return bytearray(buf[pos + offsets[i]:pos + offsets[i + 1]])
+                return _ler_array(buf, pos + offsets[i], tipo,
+                                  (offsets[i + 1] - offsets[i]) // array(tipo).itemsize)
+            return {chave: restaurar(v) for chave, v in valor.items()}
+        if isinstance(valor, list):
+            return [restaurar(v) for v in valor]
+        return valor
+
+    return restaurar(estrutura)
+
+
+def _exportar_sketches(entidade):
+    hll, ss = entidade.usuarios_distintos, entidade.usuarios_frequentes
+    return (hll.exportar() if hll is not None else None,
+            ss.exportar() if ss is not None else None)
+
+
+def _restaurar_sketches(sistema, dados):
+    # Ativa os sketches de conteúdos e plataformas e recupera os gravados; todos
+    # precisam existir com a mesma configuração, senão ficariam vazios.
+    precisao, capacidade = sistema._sketches
+    entidades = {('c', c.id): c for _, c in sistema._arvore_conteudos.percurso_em_ordem()}
+    entidades.update((('p', p.nome), p) for p in sistema._plataformas_registradas.values())
+    for entidade in entidades.values():
+        entidade.ativar_sketches(precisao, capacidade)
+    gravados = [('c', *r) for r in dados.get('conteudos', ())] + [('p', *r) for r in dados.get('plataformas', ())]
+    restauradas = 0
+    for dimensao, chave, hll, ss in gravados:
+        entidade = entidades.get((dimensao, chave))
+        if entidade is None:
+            continue
+        if (hll and hll['precisao']) != precisao or (ss and ss['capacidade']) != capacidade:
+            raise SnapshotInvalido("sketches gravados com outra configuração de erro")
+        if hll is not None:
+            entidade.usuarios_distintos = HyperLogLog.importar(hll)
+        if ss is not None:
+            entidade.usuarios_frequentes = SpaceSaving.importar(ss)
+        restauradas += 1
+    if restauradas != len(entidades):
+        raise SnapshotInvalido("snapshot sem os sketches de todas as entidades")
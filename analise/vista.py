@@ -0,0 +1,240 @@
+"""
+Visões imutáveis (point-in-time) do estado agregado para leitura concorrente.
+
+A thread de ingestão publica uma VistaSistema nova entre lotes processados
+(no máximo a cada `intervalo_vistas` segundos e sempre ao esvaziar a fila);
+a publicação é só a troca de uma referência, então leitores em outras
+threads pegam a vista corrente (SistemaAnaliseEngajamento.obter_vista) sem
+lock e geram relatórios sobre ela enquanto a ingestão continua, sem nunca
+bloqueá-la.
+
+Cada dimensão (conteúdos, usuários, plataformas) é uma tabela colunar: a
+chave de cada linha e uma coluna `array` por métrica, com os mesmos nomes
+dos atributos das entidades, divididas em páginas de PAGINA linhas. A
+publicação é copy-on-write: a vista nova copia só a lista de páginas da
+anterior e, ao regravar as linhas das entidades alteradas desde a última
+publicação, copia apenas as páginas que as contêm; as demais são
+compartilhadas entre as vistas. Como as páginas de métricas e de IDs são
+arrays, publicar cria poucos objetos rastreados pelo gc (as listas de
+páginas), sem pressão de coleta na thread de ingestão. Os relatórios
+concatenam as páginas de uma coluna na primeira consulta da vista e montam
+registros MetricasJanela apenas para as linhas devolvidas.
+
+Uma vista nunca é modificada depois de publicada, e `eventos` diz quantas
+interações registradas ela contém: as métricas correspondem exatamente a
+esse prefixo do fluxo.
+"""
+import heapq
+from array import array
+
+from analise.indice_temporal import MetricasJanela
+from analise.sistema import RANKINGS
+
+METRICAS = ('tempo_total_consumo', 'total_interacoes', 'total_visualizacoes',
+            'total_engajamento', 'total_comentarios')
+
+
+# Linhas por página das colunas de uma _Tabela.
+PAGINA = 512
+
+
+class _Tabela:
+    """
+    Linhas de uma dimensão em colunas paginadas: `chaves` (array('q') para
+    IDs, lista para nomes de plataforma), `nomes` (só em conteúdos) e as
+    METRICAS são listas de páginas de até PAGINA linhas. Uma tabela derivada
+    compartilha as páginas da original e copia cada página na primeira
+    escrita (`_proprias`), então as páginas de uma vista publicada nunca mudam.
+
+    `posicoes` (chave -> linha) só serve à escrita: as linhas nunca mudam de
+    posição, então a tabela derivada herda o mesmo dicionário e a original o
+    perde. Os leitores usam coluna(), que concatena as páginas uma vez por vista.
+    """
+    __slots__ = ('linhas', 'chaves', 'nomes', 'posicoes', '_texto', '_proprias', '_planas', '_ordem') + METRICAS
+
+    def __init__(self, chaves_texto=False, com_nomes=False):
+        self.linhas = 0
+        self.chaves = []
+        self.nomes = [] if com_nomes else None
+        self.posicoes = {}
+        self._texto = chaves_texto
+        self._proprias = set()
+        self._planas = {}
+        self._ordem = None
+        for metrica in METRICAS:
+            setattr(self, metrica, [])
+
+    def _vazia(self, coluna):
+        # Página (ou coluna plana) vazia do tipo da coluna.
+        if coluna == 'nomes' or (coluna == 'chaves' and self._texto):
+            return []
+        return array('d' if coluna == 'tempo_total_consumo' else 'q')
+
+    def _colunas(self):
+        return ('chaves', 'nomes') + METRICAS if self.nomes is not None else ('chaves',) + METRICAS
+
+    def derivar(self):
+        # Tabela nova que compartilha as páginas desta; O(linhas / PAGINA).
+        nova = _Tabela.__new__(_Tabela)
+        nova.linhas = self.linhas
+        for coluna in self._colunas():
+            setattr(nova, coluna, getattr(self, coluna)[:])
+        if self.nomes is None:
+            nova.nomes = None
+        posicoes = self.posicoes
+        if posicoes is None:
+            # Esta tabela já foi derivada: o dicionário compartilhado pode ter linhas a mais.
+            posicoes = {chave: i for i, chave in enumerate(self.coluna('chaves'))}
+        self.posicoes = None
+        nova.posicoes = posicoes
+        nova._texto = self._texto
+        nova._proprias = set()
+        nova._planas = {}
+        nova._ordem = None
+        return nova
+
+    def _pagina(self, p):
+        # Garante que a página p de todas as colunas pertence a esta tabela.
+        if p not in self._proprias:
+            self._proprias.add(p)
+            if p == len(self.chaves):
+                for coluna in self._colunas():
+                    getattr(self, coluna).append(self._vazia(coluna))
+            else:
+                for coluna in self._colunas():
+                    paginas = getattr(self, coluna)
+                    paginas[p] = paginas[p][:]
+
+    def gravar(self, chave, entidade, nome=None):
+        i = self.posicoes.get(chave)
+        if i is None:
+            i = self.posicoes[chave] = self.linhas
+            self.linhas += 1
+            p = i // PAGINA
+            self._pagina(p)
+            self.chaves[p].append(chave)
+            if self.nomes is not None:
+                self.nomes[p].append(nome)
+            self.tempo_total_consumo[p].append(entidade.tempo_total_consumo)
+            self.total_interacoes[p].append(entidade.total_interacoes)
+            self.total_visualizacoes[p].append(entidade.total_visualizacoes)
+            self.total_engajamento[p].append(entidade.total_engajamento)
+            self.total_comentarios[p].append(entidade.total_comentarios)
+        else:
+            p, j = divmod(i, PAGINA)
+            self._pagina(p)
+            self.tempo_total_consumo[p][j] = entidade.tempo_total_consumo
+            self.total_interacoes[p][j] = entidade.total_interacoes
+            self.total_visualizacoes[p][j] = entidade.total_visualizacoes
+            self.total_engajamento[p][j] = entidade.total_engajamento
+            self.total_comentarios[p][j] = entidade.total_comentarios
+
+    def coluna(self, nome):
+        # Coluna inteira (páginas concatenadas), montada na primeira leitura da vista.
+        plana = self._planas.get(nome)
+        if plana is None:
+            plana = self._vazia(nome)
+            for pagina in getattr(self, nome):
+                plana.extend(pagina)
+            self._planas[nome] = plana
+        return plana
+
+    def ordem(self, por_chave):
+        # Índices das linhas por chave crescente (ou ordem de inserção), calculados uma vez.
+        if self._ordem is None:
+            linhas = range(self.linhas)
+            self._ordem = sorted(linhas, key=self.coluna('chaves').__getitem__) if por_chave else list(linhas)
+        return self._ordem
+
+    def registro(self, i, dimensao):
+        chave = self.coluna('chaves')[i]
+        metricas = tuple(self.coluna(m)[i] for m in METRICAS)
+        if dimensao == 'conteudos':
+            return MetricasJanela(chave, self.coluna('nomes')[i], *metricas)
+        if dimensao == 'usuarios':
+            return MetricasJanela(chave, None, *metricas)
+        return MetricasJanela(None, chave, *metricas)
+
+
+class VistaSistema:
+    """
+    Estado agregado congelado, com os relatórios de SistemaAnaliseEngajamento.
+
+    Os relatórios devolvem MetricasJanela, na mesma ordem dos relatórios do
+    sistema (empates por ID; plataformas por ordem de primeira ocorrência).
+
+    Complexidades:
+        capturar: O(m)
+        atualizar: O(m / PAGINA) + O(PAGINA) por página com entidades
+            alteradas (no máximo O(m)) + O(s) para as s entidades alteradas
+        relatórios: O(m log m) na primeira consulta da vista (ordenação por
+            ID), depois O(m log n) para top-n
+    """
+    __slots__ = ('eventos', '_tabelas')
+
+    def __init__(self, eventos=0, tabelas=None):
+        self.eventos = eventos
+        self._tabelas = tabelas or {'conteudos': _Tabela(com_nomes=True), 'usuarios': _Tabela(),
+                                    'plataformas': _Tabela(chaves_texto=True)}
+
+    @classmethod
+    def capturar(cls, sistema):
+        """Grava todas as entidades do sistema em uma vista nova."""
+        return cls().atualizar(sistema, [c for _, c in sistema._arvore_conteudos.percurso_em_ordem()],
+                               [u for _, u in sistema._arvore_usuarios.percurso_em_ordem()],
+                               set(sistema._plataformas_registradas.values()))
+
+    def atualizar(self, sistema, conteudos, usuarios, plataformas):
+        """Nova vista com as entidades indicadas (objetos alterados) regravadas."""
+        tabelas = {dimensao: tabela.derivar() for dimensao, tabela in self._tabelas.items()}
+        gravar = tabelas['conteudos'].gravar
+        for c in conteudos:
+            gravar(c.id, c, c.nome)
+        gravar = tabelas['usuarios'].gravar
+        for u in usuarios:
+            gravar(u.id, u)
+        # Plataformas na ordem de registro (ordem de primeira ocorrência nos relatórios).
+        gravar = tabelas['plataformas'].gravar
+        for nome, p in sistema._plataformas_registradas.items():
+            if p in plataformas:
+                gravar(nome, p)
+        return VistaSistema(sistema._total_registradas, tabelas)
+
+    # Relatórios (mesmos nomes do sistema, sem janela de tempo)
+    def gerar_top_conteudos_por_tempo(self, n=None):
+        return self._ranking('conteudos_tempo', n)
+
+    def gerar_top_usuarios_por_interacoes(self, n=None):
+        return self._ranking('usuarios_interacoes', n)
+
+    def gerar_ranking_usuarios_por_tempo(self, n=None):
+        return self._ranking('usuarios_tempo', n)
+
+    def gerar_ranking_plataformas_por_engajamento(self, n=None):
+        return self._ranking('plataformas_engajamento', n)
+
+    def gerar_ranking_conteudos_por_comentarios(self, n=None):
+        return self._ranking('conteudos_comentarios', n)
+
+    def gerar_conteudos_por_total_interacoes(self, n=None):
+        return self._ranking('conteudos_interacoes', n)
+
+    def calcular_tempo_medio_consumo_por_plataforma(self):
+        t = self._tabelas['plataformas']
+        tempo, views = t.coluna('tempo_total_consumo'), t.coluna('total_visualizacoes')
+        return {nome: (tempo[i] / views[i]) if views[i] else 0.0
+                for i, nome in enumerate(t.coluna('chaves'))}
+
+    def contar_comentarios_por_conteudo(self):
+        t = self._tabelas['conteudos']
+        nomes, comentarios = t.coluna('nomes'), t.coluna('total_comentarios')
+        return {nomes[i]: comentarios[i] for i in t.ordem(True)}
+
+    def _ranking(self, nome, n):
+        # Mesma regra de SistemaAnaliseEngajamento._ranking, sobre índices de linha.
+        dimensao, atributo = RANKINGS[nome]
+        tabela = self._tabelas[dimensao]
+        ordem = tabela.ordem(dimensao != 'plataformas')
+        chave = tabela.coluna(atributo).__getitem__
+        linhas = heapq.nlargest(n, ordem, key=chave) if n else sorted(ordem, key=chave, reverse=True)
+        return [tabela.registro(i, dimensao) for i in linhas]
@@ -0,0 +1,70 @@
+"""
+Benchmark de carga das árvores de índice.
+
+Carrega N chaves em ordem crescente e N chaves embaralhadas, medindo inserção,
+busca de todas as chaves, percurso em ordem e altura final, e compara a
+carga em lote de chaves ordenadas (carregar_ordenados, O(n)) com as inserções.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_arvore --n 1000000
+"""
+import argparse
+import random
+import time
+
+from estruturas_dados.arvore_avl import ArvoreAVL
+from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+
+
+def medir(classe, chaves):
+    arvore = classe()
+    inicio = time.perf_counter()
+    for k in chaves:
+        arvore.inserir(k, k)
+    t_inserir = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for k in chaves:
+        arvore.buscar(k)
+    t_buscar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    arvore.percurso_em_ordem()
+    t_percurso = time.perf_counter() - inicio
+
+    altura = arvore.altura() if hasattr(arvore, 'altura') else None
+    return t_inserir, t_buscar, t_percurso, altura
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=1_000_000, help='quantidade de chaves')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    ordenadas = list(range(args.n))
+    aleatorias = ordenadas[:]
+    random.Random(args.seed).shuffle(aleatorias)
+
+    # A BST simples só entra no cenário aleatório: com chaves ordenadas ela
+    # degenera em lista e a inserção recursiva estoura o limite de recursão.
+    cenarios = [
+        ('ArvoreAVL', ArvoreAVL, 'ordenadas', ordenadas),
+        ('ArvoreAVL', ArvoreAVL, 'aleatorias', aleatorias),
+        ('ArvoreBinariaBusca', ArvoreBinariaBusca, 'aleatorias', aleatorias),
+    ]
+    print(f"{'arvore':<20}{'chaves':<12}{'inserir/s':>14}{'buscar/s':>14}{'percurso(s)':>13}{'altura':>8}")
+    for nome, classe, rotulo, chaves in cenarios:
+        t_ins, t_bus, t_per, altura = medir(classe, chaves)
+        print(f"{nome:<20}{rotulo:<12}{args.n / t_ins:>14,.0f}{args.n / t_bus:>14,.0f}"
+              f"{t_per:>13.3f}{altura if altura is not None else '-':>8}")
+    for nome, classe in (('ArvoreAVL', ArvoreAVL), ('ArvoreBinariaBusca', ArvoreBinariaBusca)):
+        arvore = classe()
+        inicio = time.perf_counter()
+        arvore.carregar_ordenados((k, k) for k in ordenadas)
+        t_lote = time.perf_counter() - inicio
+        print(f"{nome:<20}{'em lote':<12}{args.n / t_lote:>14,.0f}{'-':>14}{'-':>13}{arvore.altura():>8}")
+
+
+if __name__ == '__main__':
+    main()
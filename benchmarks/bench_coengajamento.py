@@ -0,0 +1,56 @@
+"""
+Benchmark da matriz de coengajamento: registro, compactação e consultas de similares.
+
+Registra N interações sintéticas (benchmarks.gerador) em uma
+MatrizCoengajamento e mede µs/linha do registro (com as compactações
+automáticas), a compactação final e a latência de conteudos_similares para
+os conteúdos mais populares, com a poda padrão e sem poda (resultado
+exato), além de quantos dos k vizinhos a versão podada acerta.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_coengajamento --linhas 1000000
+    python -m benchmarks.bench_coengajamento --linhas 5000000 --conteudos 100000 --usuarios 10000000
+"""
+import argparse
+import time
+
+from analise.coengajamento import MatrizCoengajamento
+from benchmarks.gerador import adicionar_argumentos, gerador_dos_argumentos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--consultas', type=int, default=20, help='conteúdos mais populares consultados')
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    pares = [(id_u, id_c) for id_c, _, id_u, *_ in gerador_dos_argumentos(args).eventos(args.linhas)]
+    matriz = MatrizCoengajamento()
+    inicio = time.perf_counter()
+    for id_u, id_c in pares:
+        matriz.registrar(id_u, id_c)
+    t_registro = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    matriz.compactar()
+    t_compactar = time.perf_counter() - inicio
+    print(f"{args.linhas} linhas, {len(matriz)} pares distintos: "
+          f"registro {t_registro / args.linhas * 1e6:.2f} µs/linha, compactação final {t_compactar:.3f}s")
+
+    populares = sorted(matriz._conteudos, key=matriz.usuarios_do_conteudo, reverse=True)[:args.consultas]
+    print(f"{'consulta':<12}{'ms/consulta':>14}{'acertos':>10}")
+    exatos = {}
+    for nome, opcoes in (('sem poda', dict(limite_usuarios=1 << 62, limite_linha=1 << 62)), ('com poda', {})):
+        inicio = time.perf_counter()
+        resultados = {c: matriz.conteudos_similares(c, args.k, **opcoes) for c in populares}
+        tempo = (time.perf_counter() - inicio) / len(populares)
+        if not exatos:
+            exatos = {c: {i for i, _, _ in r} for c, r in resultados.items()}
+        acertos = sum(len(exatos[c] & {i for i, _, _ in r}) for c, r in resultados.items())
+        total = sum(map(len, exatos.values())) or 1
+        print(f"{nome:<12}{tempo * 1e3:>14.2f}{acertos / total:>10.1%}")
+
+
+if __name__ == '__main__':
+    main()
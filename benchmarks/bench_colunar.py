@@ -0,0 +1,72 @@
+"""
+Benchmark do armazenamento colunar contra o modelo de objetos.
+
+Mede memória (tracemalloc) por evento e o tempo de cada relatório para N
+eventos sintéticos (benchmarks.gerador) em SistemaAnaliseEngajamento e em
+ArmazenamentoColunar.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_colunar --eventos 1000000
+    python -m benchmarks.bench_colunar --eventos 50000000 --so-colunar
+"""
+import argparse
+import time
+import tracemalloc
+
+from analise.armazenamento_colunar import ArmazenamentoColunar, np
+from analise.sistema import SistemaAnaliseEngajamento
+from benchmarks.gerador import adicionar_argumentos, gerador_dos_argumentos
+from estruturas_dados.arvore_avl import ArvoreAVL
+
+RELATORIOS = [
+    ('gerar_top_conteudos_por_tempo', (10,)),
+    ('gerar_top_usuarios_por_interacoes', (10,)),
+    ('gerar_ranking_usuarios_por_tempo', (10,)),
+    ('gerar_ranking_plataformas_por_engajamento', ()),
+    ('gerar_ranking_conteudos_por_comentarios', (10,)),
+    ('gerar_conteudos_por_total_interacoes', (10,)),
+    ('calcular_tempo_medio_consumo_por_plataforma', ()),
+    ('contar_comentarios_por_conteudo', ()),
+]
+
+
+def carregar(motor, gerador, qtd):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    if isinstance(motor, ArmazenamentoColunar):
+        for id_c, nome, id_u, plat, tipo, dur, _, _ in gerador.eventos(qtd):
+            motor.adicionar(id_c, nome, id_u, plat, tipo, dur)
+    else:
+        for registro in gerador.eventos(qtd):
+            motor._registrar(*registro)
+    tempo = time.perf_counter() - inicio
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tempo, memoria
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--eventos', type=int, default=1_000_000)
+    parser.add_argument('--so-colunar', action='store_true', help='não carrega o modelo de objetos')
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    gerador = gerador_dos_argumentos(args)
+
+    motores = [('colunar' + (' (numpy)' if np is not None else ''), ArmazenamentoColunar())]
+    if not args.so_colunar:
+        motores.insert(0, ('objetos', SistemaAnaliseEngajamento(classe_arvore=ArvoreAVL)))
+        motores.insert(1, ('objetos sem lista', SistemaAnaliseEngajamento(classe_arvore=ArvoreAVL,
+                                                                           guardar_interacoes=False)))
+    for nome, motor in motores:
+        tempo, memoria = carregar(motor, gerador, args.eventos)
+        print(f"\n[{nome}] carga: {tempo:.2f}s, memória: {memoria / 2**20:.1f} MiB "
+              f"({memoria / args.eventos:.1f} bytes/evento)")
+        for relatorio, params in RELATORIOS:
+            inicio = time.perf_counter()
+            getattr(motor, relatorio)(*params)
+            print(f"  {relatorio:<45}{time.perf_counter() - inicio:>8.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark da Fila: item a item x em lotes, em memória x com limite e segmentos em disco.
+
+Enfileira e drena N linhas sintéticas (benchmarks.gerador, tuplas na ordem
+de leitor_csv.COLUNAS) de quatro formas:
+
+    item a item   enfileirar/desenfileirar em laço, como a drenagem antiga
+    lotes         enfileirar_lote/desenfileirar_lote em blocos de --lote
+    com limite    lotes com limite_memoria (o excedente vai para o disco)
+
+simulando uma rajada de backfill: a fila é enchida inteira antes de ser
+drenada. O tempo (µs/item) é medido com as linhas já em memória; o pico de
+memória (tracemalloc) em uma segunda passada, com as linhas geradas sob
+demanda, como ao ler o CSV, para que só a fila as retenha.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_fila --linhas 1000000 --limite 100000
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+
+from benchmarks.gerador import adicionar_argumentos, gerador_dos_argumentos
+from estruturas_dados.fila import Fila
+
+
+def item_a_item(fila, linhas, lote):
+    for linha in linhas:
+        fila.enfileirar(linha)
+    while not fila.esta_vazia():
+        fila.desenfileirar()
+
+
+def em_lotes(fila, linhas, lote):
+    linhas = iter(linhas)
+    while True:
+        bloco = list(islice(linhas, lote))
+        if not bloco:
+            break
+        fila.enfileirar_lote(bloco)
+    while fila.desenfileirar_lote(lote):
+        pass
+
+
+def pico_memoria(cenario, fila, linhas, lote):
+    tracemalloc.start()
+    cenario(fila, linhas, lote)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    parser.add_argument('--lote', type=int, default=1024)
+    parser.add_argument('--limite', type=int, default=100_000, help='limite_memoria da fila limitada')
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    gerador = gerador_dos_argumentos(args)
+    linhas = [tuple(map(str, linha)) for linha in gerador.linhas(args.linhas)]
+    print(f"{'cenário':<28}{'µs/item':>10}{'pico (MB)':>12}{'segmentos':>11}")
+    with tempfile.TemporaryDirectory() as diretorio:
+        cenarios = (('item a item', item_a_item, None), ('lotes', em_lotes, None),
+                    ('item a item, com limite', item_a_item, args.limite),
+                    ('lotes, com limite', em_lotes, args.limite))
+        for nome, cenario, limite in cenarios:
+            fila = Fila(limite, diretorio)
+            inicio = time.perf_counter()
+            cenario(fila, linhas, args.lote)
+            tempo = time.perf_counter() - inicio
+            sob_demanda = (tuple(map(str, linha)) for linha in gerador.linhas(args.linhas))
+            pico = pico_memoria(cenario, Fila(limite, diretorio), sob_demanda, args.lote)
+            print(f"{nome:<28}{tempo / args.linhas * 1e6:>10.3f}{pico / 2**20:>12.1f}"
+                  f"{fila.segmentos_gravados:>11}")
+
+
+if __name__ == '__main__':
+    main()
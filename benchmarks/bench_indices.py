@@ -0,0 +1,46 @@
+"""
+Benchmark do custo de ingestão por linha com cada índice de entidades.
+
+Registra N interações sintéticas (benchmarks.gerador) em
+SistemaAnaliseEngajamento usando ArvoreBinariaBusca, ArvoreAVL e
+RegistroHash, com IDs em ordem crescente e aleatória, e mede µs/linha da ingestão e o tempo da primeira
+visão ordenada (percurso_em_ordem) depois dela.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_indices --linhas 500000
+"""
+import argparse
+import time
+
+from analise.sistema import SistemaAnaliseEngajamento
+from benchmarks.gerador import adicionar_argumentos, gerador_dos_argumentos
+from estruturas_dados.arvore_avl import ArvoreAVL
+from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+from estruturas_dados.registro_hash import RegistroHash
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=500_000)
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    # Com IDs ordenados a BST simples degenera e a inserção recursiva estoura a pilha.
+    cenarios = [(ArvoreBinariaBusca, False), (ArvoreAVL, True), (ArvoreAVL, False),
+                (RegistroHash, True), (RegistroHash, False)]
+    print(f"{'índice':<20}{'IDs':<12}{'µs/linha':>10}{'ordenar(s)':>12}")
+    for classe, ordenado in cenarios:
+        dados = list(gerador_dos_argumentos(args, ids_ordenados=ordenado).eventos(args.linhas))
+        sistema = SistemaAnaliseEngajamento(classe_arvore=classe, guardar_interacoes=False)
+        inicio = time.perf_counter()
+        for registro in dados:
+            sistema._registrar(*registro)
+        t_ingestao = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        sistema._arvore_usuarios.percurso_em_ordem()
+        t_ordem = time.perf_counter() - inicio
+        print(f"{classe.__name__:<20}{'ordenados' if ordenado else 'aleatórios':<12}"
+              f"{t_ingestao / args.linhas * 1e6:>10.2f}{t_ordem:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
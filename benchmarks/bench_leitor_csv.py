@@ -0,0 +1,101 @@
+"""
+Benchmark do leitor posicional de CSV contra csv.DictReader.
+
+Mede linhas/s da leitura + validação (csv.DictReader com normalizar_linha
+contra ler_lotes com normalizar_lote) e da ingestão completa
+(carregar_interacoes_csv + processar_interacoes_da_fila) em um CSV
+sintético (benchmarks.gerador), com timestamps variados e comentários
+entre aspas com vírgulas.
+
+A meta de 3x linhas/s sobre o DictReader vale só para a leitura +
+validação, e por pouco: entre 2x e 3,1x conforme a máquina e o tamanho do
+arquivo (20 mil a 300 mil linhas, 1 CPU). A ingestão completa NÃO fica
+significativamente mais rápida (entre 1,1x e 1,4x): nela o tempo é dominado
+por _registrar (busca e inserção nas árvores de conteúdos e usuários,
+criação da Interacao e atualização das entidades e índices), que o leitor
+não altera.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_leitor_csv --linhas 1000000
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from analise.leitor_csv import ler_lotes
+from analise.sistema import LinhaInvalida, SistemaAnaliseEngajamento, normalizar_linha, normalizar_lote
+from benchmarks.gerador import adicionar_argumentos, gerador_dos_argumentos
+from estruturas_dados.arvore_avl import ArvoreAVL
+
+
+def ler_dictreader(caminho):
+    validos = 0
+    with open(caminho, newline='', encoding='utf-8') as arquivo:
+        for linha in csv.DictReader(arquivo):
+            try:
+                normalizar_linha(linha)
+            except LinhaInvalida:
+                continue
+            validos += 1
+    return validos
+
+
+def ler_posicional(caminho):
+    return sum(len(normalizar_lote(lote)[0]) for lote in ler_lotes(caminho))
+
+
+def ingerir_dictreader(caminho):
+    # Caminho anterior: um dicionário por linha na fila, normalizado um a um.
+    sistema = SistemaAnaliseEngajamento(classe_arvore=ArvoreAVL, guardar_interacoes=False)
+    fila = sistema.obter_fila_interacoes()
+    with open(caminho, newline='', encoding='utf-8') as arquivo:
+        for linha in csv.DictReader(arquivo):
+            fila.enfileirar(linha)
+    while not fila.esta_vazia():
+        sistema._processar_linha(fila.desenfileirar())
+    return sistema.resumo_ingestao()['registradas']
+
+
+def ingerir_posicional(caminho):
+    sistema = SistemaAnaliseEngajamento(classe_arvore=ArvoreAVL, guardar_interacoes=False)
+    sistema.carregar_interacoes_csv(caminho)
+    sistema.processar_interacoes_da_fila()
+    return sistema.resumo_ingestao()['registradas']
+
+
+def medir(funcao, caminho, linhas, repeticoes):
+    # Melhor de `repeticoes` execuções, em linhas/s.
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        validos = funcao(caminho)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return validos, linhas / melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'interacoes.csv')
+        gerador_dos_argumentos(args).escrever_csv(caminho, args.linhas)
+        for etapa, antigo, novo in (('leitura + validação', ler_dictreader, ler_posicional),
+                                    ('ingestão completa', ingerir_dictreader, ingerir_posicional)):
+            validos_antigo, taxa_antigo = medir(antigo, caminho, args.linhas, args.repeticoes)
+            validos_novo, taxa_novo = medir(novo, caminho, args.linhas, args.repeticoes)
+            assert validos_antigo == validos_novo
+            print(f"{etapa}:")
+            print(f"  DictReader   {taxa_antigo:>12,.0f} linhas/s")
+            print(f"  posicional   {taxa_novo:>12,.0f} linhas/s  ({taxa_novo / taxa_antigo:.1f}x)")
+        print("obs.: o ganho vale para a leitura; a ingestão completa é dominada pelo registro "
+              "nas árvores e índices e não fica significativamente mais rápida.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark de memória por evento ingerido (tracemalloc): entidades sem
+__slots__ contra as atuais, com __slots__.
+
+Monta um CSV sintético (benchmarks.gerador) em memória, ingere-o com
+csv.DictReader (cada linha traz strings novas, como no arquivo real) e mede
+os bytes retidos por evento depois da ingestão, com e sem a lista bruta de
+interações. A versão sem __slots__ usa cópias de Interacao, Usuario,
+Plataforma e das classes de conteúdo com os mesmos métodos, mas com os
+atributos em __dict__, como antes; o pool de comentários e a internação do
+tipo valem nas duas, então a diferença medida é só a dos __slots__.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_memoria --linhas 200000
+"""
+import argparse
+import csv
+import gc
+import io
+import tracemalloc
+from contextlib import contextmanager
+from unittest import mock
+
+import analise.sistema
+from analise.indice_tipos import TIPOS_CONTEUDO
+from analise.sistema import SistemaAnaliseEngajamento
+from benchmarks.gerador import adicionar_argumentos, gerador_dos_argumentos
+from estruturas_dados.registro_hash import RegistroHash
+
+
+def sem_slots(classe):
+    # Cópia de `classe` com os mesmos métodos (inclusive os herdados), sem __slots__.
+    atributos = {}
+    for base in reversed(classe.__mro__[:-1]):
+        slots = base.__dict__.get('__slots__', ())
+        atributos.update((nome, valor) for nome, valor in vars(base).items()
+                         if nome not in slots and nome not in ('__slots__', '__dict__', '__weakref__'))
+    return type(classe.__name__, (), atributos)
+
+
+@contextmanager
+def entidades_sem_slots():
+    # Troca, durante o bloco, as classes usadas por SistemaAnaliseEngajamento.
+    tipos = {tipo: sem_slots(classe) for tipo, classe in TIPOS_CONTEUDO.items()}
+    with mock.patch.object(analise.sistema, 'Interacao', sem_slots(analise.sistema.Interacao)), \
+            mock.patch.object(analise.sistema, 'Usuario', sem_slots(analise.sistema.Usuario)), \
+            mock.patch.object(analise.sistema, 'Plataforma', sem_slots(analise.sistema.Plataforma)), \
+            mock.patch.dict(TIPOS_CONTEUDO, tipos):
+        yield
+
+
+def medir(texto, linhas, guardar_interacoes):
+    gc.collect()
+    tracemalloc.start()
+    sistema = SistemaAnaliseEngajamento(classe_arvore=RegistroHash,
+                                        guardar_interacoes=guardar_interacoes)
+    for linha in csv.DictReader(io.StringIO(texto)):
+        sistema._processar_linha(linha)
+    gc.collect()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memoria / linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=200_000)
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    texto = gerador_dos_argumentos(args).texto_csv(args.linhas)
+    for guardar in (True, False):
+        rotulo = 'com lista de interações' if guardar else 'só contadores'
+        with entidades_sem_slots():
+            antes = medir(texto, args.linhas, guardar)
+        depois = medir(texto, args.linhas, guardar)
+        print(f"{rotulo}:")
+        print(f"  sem __slots__ {antes:>10.1f} bytes/evento")
+        print(f"  com __slots__ {depois:>10.1f} bytes/evento  ({1 - depois / antes:.0%} menos)")
+
+
+if __name__ == '__main__':
+    main()
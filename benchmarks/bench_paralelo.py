@@ -0,0 +1,57 @@
+"""
+Benchmark da ingestão paralela: linhas/s para 1, 2, 4 e 8 processos.
+
+Gera um CSV sintético (benchmarks.gerador) em um diretório temporário, mede
+a ingestão serial (processar_csv_em_fluxo) e a paralela
+(carregar_csv_paralelo) e confere que os relatórios coincidem.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_paralelo --linhas 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from analise.sistema import SistemaAnaliseEngajamento
+from benchmarks.gerador import adicionar_argumentos, gerador_dos_argumentos
+from estruturas_dados.arvore_avl import ArvoreAVL
+
+def assinatura(sistema):
+    return ([(c.id, c.tempo_total_consumo, c.total_interacoes) for c in sistema.gerar_top_conteudos_por_tempo()],
+            [(u.id, u.total_interacoes) for u in sistema.gerar_top_usuarios_por_interacoes()],
+            sistema.calcular_tempo_medio_consumo_por_plataforma(),
+            sistema.contar_comentarios_por_conteudo())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    parser.add_argument('--processos', type=int, nargs='+', default=[1, 2, 4, 8])
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'interacoes.csv')
+        gerador_dos_argumentos(args).escrever_csv(caminho, args.linhas)
+
+        serial = SistemaAnaliseEngajamento(classe_arvore=ArvoreAVL, guardar_interacoes=False)
+        inicio = time.perf_counter()
+        serial.processar_csv_em_fluxo(caminho)
+        t_serial = time.perf_counter() - inicio
+        referencia = assinatura(serial)
+        print(f"{'modo':<12}{'linhas/s':>14}{'speedup':>10}  relatórios")
+        print(f"{'serial':<12}{args.linhas / t_serial:>14,.0f}{1.0:>10.2f}  referência")
+
+        for processos in args.processos:
+            sistema = SistemaAnaliseEngajamento(classe_arvore=ArvoreAVL, guardar_interacoes=False)
+            inicio = time.perf_counter()
+            sistema.carregar_csv_paralelo(caminho, processos)
+            tempo = time.perf_counter() - inicio
+            iguais = 'iguais' if assinatura(sistema) == referencia else 'DIFERENTES'
+            print(f"{f'{processos} proc':<12}{args.linhas / tempo:>14,.0f}{t_serial / tempo:>10.2f}  {iguais}")
+    print(f"(cpu_count = {os.cpu_count()})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Teste de estresse das vistas publicadas: ingestão e relatórios em threads concorrentes.
+
+Uma thread ingere um CSV sintético (processar_csv_em_fluxo com
+publicar_vistas=True) enquanto outras geram relatórios sobre obter_vista().
+Cada leitor guarda um relatório por prefixo observado, com o número de
+eventos da vista; ao final, o fluxo de eventos é reaplicado e cada amostra é
+comparada com os totais exatos do prefixo correspondente. Com --sem-vista
+os leitores usam o sistema diretamente, para mostrar as leituras
+inconsistentes. tests/test_vista.py roda o mesmo cenário (estressar) em
+tamanho pequeno.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.estresse_vistas --linhas 200000 --leitores 4
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from analise.leitor_csv import ler_lotes
+from analise.sistema import SistemaAnaliseEngajamento, normalizar_lote
+from benchmarks.gerador import adicionar_argumentos, gerador_dos_argumentos
+from estruturas_dados.arvore_avl import ArvoreAVL
+
+
+def amostra(fonte, eventos):
+    # Totais por conteúdo e por plataforma de um relatório + eventos da fonte.
+    conteudos = {c.id: (c.total_interacoes, c.tempo_total_consumo)
+                 for c in fonte.gerar_conteudos_por_total_interacoes()}
+    plataformas = {p.nome: p.total_engajamento for p in fonte.gerar_ranking_plataformas_por_engajamento()}
+    return eventos, conteudos, plataformas
+
+
+def ler(sistema, parar, amostras, sem_vista, contagem):
+    # Gera relatórios sem parar; guarda uma amostra por prefixo observado.
+    while not parar.is_set():
+        if sem_vista:
+            atual = amostra(sistema, sistema._total_registradas)
+        else:
+            vista = sistema.obter_vista()
+            atual = amostra(vista, vista.eventos)
+        contagem[0] += 1
+        if not amostras or amostras[-1][0] != atual[0]:
+            amostras.append(atual)
+
+
+def conferir(caminho, amostras):
+    # Reaplica os eventos em ordem e compara cada amostra com o prefixo de mesmo tamanho.
+    amostras = sorted(amostras, key=lambda a: a[0])
+    conteudos, plataformas = {}, {}
+    eventos = 0
+    erros = 0
+    pendentes = iter(amostras)
+    atual = next(pendentes, None)
+    registros = (r for lote in ler_lotes(caminho) for r in normalizar_lote(lote)[0])
+    while atual is not None:
+        if atual[0] == eventos:
+            esperado = {k: tuple(v) for k, v in conteudos.items()}
+            if atual[1] != esperado or atual[2] != plataformas:
+                erros += 1
+            atual = next(pendentes, None)
+            continue
+        id_c, _, _, plat, tipo, dur, _, _ = next(registros)
+        total = conteudos.setdefault(id_c, [0, 0.0])
+        total[0] += 1
+        plataformas.setdefault(plat, 0)
+        if tipo == 'view_start':
+            total[1] += dur
+        elif tipo in ('like', 'share', 'comment'):
+            plataformas[plat] += 1
+        eventos += 1
+    return erros
+
+
+def estressar(caminho, leitores, sem_vista=False, intervalo_vistas=None):
+    """
+    Ingere `caminho` com `leitores` threads gerando relatórios ao mesmo tempo.
+    Retorna {'segundos', 'relatorios', 'amostras', 'inconsistentes'}.
+    """
+    sistema = SistemaAnaliseEngajamento(classe_arvore=ArvoreAVL, guardar_interacoes=False,
+                                        publicar_vistas=not sem_vista)
+    if intervalo_vistas is not None:
+        sistema.intervalo_vistas = intervalo_vistas
+    parar = threading.Event()
+    amostras = [[] for _ in range(leitores)]
+    contagens = [[0] for _ in range(leitores)]
+    threads = [threading.Thread(target=ler, args=(sistema, parar, a, sem_vista, c))
+               for a, c in zip(amostras, contagens)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    try:
+        sistema.processar_csv_em_fluxo(caminho)
+    finally:
+        parar.set()
+        for thread in threads:
+            thread.join()
+    tempo = time.perf_counter() - inicio
+    todas = [a for lista in amostras for a in lista]
+    return {'segundos': tempo, 'relatorios': sum(c[0] for c in contagens),
+            'amostras': len(todas), 'inconsistentes': conferir(caminho, todas)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=200_000)
+    parser.add_argument('--leitores', type=int, default=4)
+    parser.add_argument('--sem-vista', action='store_true', help='leitores consultam o sistema diretamente')
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'interacoes.csv')
+        gerador_dos_argumentos(args).escrever_csv(caminho, args.linhas)
+        r = estressar(caminho, args.leitores, args.sem_vista)
+        print(f"ingestão: {args.linhas / r['segundos']:,.0f} linhas/s com {args.leitores} leitores")
+        print(f"relatórios: {r['relatorios']}, amostras conferidas: {r['amostras']}, "
+              f"inconsistentes: {r['inconsistentes']}")
+        if r['inconsistentes'] and not args.sem_vista:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
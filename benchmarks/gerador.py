@@ -0,0 +1,166 @@
+"""
+Gerador determinístico (seed) de interações sintéticas no formato de interacoes_globo.csv.
+
+A popularidade dos conteúdos segue uma lei de Zipf (o conteúdo de posto k
+recebe peso 1 / k**zipf), os usuários são uniformes e a mistura de tipos de
+interação é configurável. Os timestamps avançam com o fluxo ao longo de
+`dias` dias, como em um log real. Com `ids_ordenados=True` o conteúdo de
+posto k tem ID k e os usuários aparecem pela primeira vez em ordem crescente
+de ID (pior caso para a BST simples); senão os IDs são embaralhados.
+
+A geração é feita em blocos e por gerador, com memória constante, então
+serve de 10**4 a 10**8 linhas. Os benchmarks usam o mesmo gerador para que
+resultados de commits diferentes sejam comparáveis.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.gerador dados.csv --linhas 1000000 --zipf 1.2
+"""
+import argparse
+import csv
+import io
+import random
+import time
+from itertools import accumulate
+
+from analise.indice_temporal import converter_timestamp
+from analise.leitor_csv import COLUNAS
+
+PLATAFORMAS = ('TV Globo', 'Globoplay', 'G1', 'GE Globo', 'Sportv Play', 'Premiere', 'Spotify')
+MISTURA_PADRAO = {'view_start': 0.6, 'like': 0.2, 'share': 0.1, 'comment': 0.1}
+# Inclui acentos e um texto com aspas e vírgula (exige o módulo csv na leitura).
+COMENTARIOS = ('Muito bom!', 'Adorei, de verdade', 'Ótimo episódio, "recomendo"', 'Que jogaço!',
+               'Não gostei do final', 'Análise perfeita do tema')
+
+_BLOCO = 10_000
+
+
+class GeradorInteracoes:
+    """
+    Fluxo reproduzível de interações: a mesma configuração e a mesma seed
+    produzem sempre as mesmas linhas.
+
+    Complexidades:
+        construção: O(c), c = conteúdos (pesos acumulados de Zipf)
+        cada linha: O(log c) (amostragem por busca binária nos pesos)
+    """
+    def __init__(self, seed: int = 42, conteudos: int = 5000, usuarios: int = 200_000,
+                 zipf: float = 1.1, ids_ordenados: bool = False, mistura: dict = None,
+                 plataformas=PLATAFORMAS, inicio: str = '2024-10-20 00:00:00', dias: int = 7):
+        if conteudos <= 0 or usuarios <= 0 or dias <= 0:
+            raise ValueError("conteudos, usuarios e dias devem ser positivos")
+        self.seed = seed
+        self.conteudos = conteudos
+        self.usuarios = usuarios
+        self.zipf = zipf
+        self.ids_ordenados = ids_ordenados
+        self.mistura = dict(mistura or MISTURA_PADRAO)
+        self.plataformas = tuple(plataformas)
+        self.inicio = converter_timestamp(inicio)
+        self.dias = dias
+
+    def configuracao(self) -> dict:
+        """Parâmetros do gerador em tipos JSON (para registrar junto aos resultados)."""
+        return {'seed': self.seed, 'conteudos': self.conteudos, 'usuarios': self.usuarios,
+                'zipf': self.zipf, 'ids_ordenados': self.ids_ordenados, 'mistura': self.mistura,
+                'plataformas': list(self.plataformas), 'dias': self.dias}
+
+    def eventos(self, linhas: int):
+        """
+        Gera tuplas já normalizadas (id_conteudo, nome_conteudo, id_usuario,
+        plataforma, tipo, duração, comentário, timestamp), na ordem dos
+        argumentos de SistemaAnaliseEngajamento._registrar.
+        """
+        rnd = random.Random(self.seed)
+        ids_conteudo = list(range(1, self.conteudos + 1))
+        if not self.ids_ordenados:
+            rnd.shuffle(ids_conteudo)
+        pesos = list(accumulate(1 / k ** self.zipf for k in range(1, self.conteudos + 1)))
+        tipos, pesos_tipos = zip(*self.mistura.items())
+        pesos_tipos = list(accumulate(pesos_tipos))
+        duracao_janela = self.dias * 86400
+        for base in range(0, linhas, _BLOCO):
+            n = min(_BLOCO, linhas - base)
+            conteudos = rnd.choices(ids_conteudo, cum_weights=pesos, k=n)
+            tipos_bloco = rnd.choices(tipos, cum_weights=pesos_tipos, k=n)
+            plataformas = rnd.choices(self.plataformas, k=n)
+            if self.ids_ordenados:
+                # Primeira aparição dos usuários em ordem crescente de ID.
+                ids_usuario = [1 + (base + i) * self.usuarios // linhas for i in range(n)]
+            else:
+                ids_usuario = [rnd.randrange(self.usuarios) + 1 for _ in range(n)]
+            for i in range(n):
+                id_c = conteudos[i]
+                tipo = tipos_bloco[i]
+                yield (id_c, f"Conteudo {id_c}", ids_usuario[i], plataformas[i], tipo,
+                       float(rnd.randint(10, 7200)) if tipo == 'view_start' else 0.0,
+                       rnd.choice(COMENTARIOS) if tipo == 'comment' else None,
+                       self.inicio + (base + i) * duracao_janela // linhas)
+
+    def linhas(self, linhas: int):
+        """Gera as linhas do CSV como listas de strings na ordem de COLUNAS."""
+        ultimo, texto_ts = None, None
+        for id_c, nome, id_u, plat, tipo, dur, comentario, ts in self.eventos(linhas):
+            if ts != ultimo:
+                ultimo, texto_ts = ts, time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(ts))
+            yield [id_c, nome, id_u, texto_ts, plat, tipo,
+                   f"{dur:.1f}" if tipo == 'view_start' else '', comentario or '']
+
+    def escrever_csv(self, destino, linhas: int):
+        """Escreve cabeçalho e `linhas` linhas em `destino` (caminho ou arquivo texto aberto)."""
+        if isinstance(destino, str):
+            with open(destino, 'w', newline='', encoding='utf-8') as arquivo:
+                self.escrever_csv(arquivo, linhas)
+            return
+        escritor = csv.writer(destino)
+        escritor.writerow(COLUNAS)
+        escritor.writerows(self.linhas(linhas))
+
+    def texto_csv(self, linhas: int) -> str:
+        """O CSV inteiro em memória (para benchmarks sem disco)."""
+        saida = io.StringIO()
+        self.escrever_csv(saida, linhas)
+        return saida.getvalue()
+
+
+def gerar_csv(caminho: str, linhas: int, seed: int = 42, **opcoes):
+    """Atalho: escreve em `caminho` o CSV de um GeradorInteracoes(seed, **opcoes)."""
+    GeradorInteracoes(seed, **opcoes).escrever_csv(caminho, linhas)
+
+
+def adicionar_argumentos(parser):
+    # Opções do gerador compartilhadas pelos benchmarks.
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--conteudos', type=int, default=5000)
+    parser.add_argument('--usuarios', type=int, default=200_000)
+    parser.add_argument('--zipf', type=float, default=1.1, help='expoente da popularidade dos conteúdos')
+    parser.add_argument('--ids-ordenados', action='store_true', help='IDs em ordem crescente de aparição')
+    parser.add_argument('--mistura', type=_ler_mistura, default=None,
+                        help='pesos dos tipos, ex.: view_start=6,like=2,share=1,comment=1')
+
+
+def gerador_dos_argumentos(args, **extras):
+    opcoes = dict(seed=args.seed, conteudos=args.conteudos, usuarios=args.usuarios, zipf=args.zipf,
+                  ids_ordenados=args.ids_ordenados, mistura=args.mistura)
+    opcoes.update(extras)
+    return GeradorInteracoes(**opcoes)
+
+
+def _ler_mistura(texto):
+    try:
+        pares = (item.split('=') for item in texto.split(','))
+        return {tipo.strip(): float(peso) for tipo, peso in pares}
+    except ValueError:
+        raise argparse.ArgumentTypeError("use tipo=peso separados por vírgula") from None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('caminho')
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    gerador_dos_argumentos(args).escrever_csv(args.caminho, args.linhas)
+
+
+if __name__ == '__main__':
+    main()
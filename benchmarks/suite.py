@@ -0,0 +1,209 @@
+"""
+Suíte de benchmarks com saída JSON: ingestão, busca e cada relatório por tamanho e índice.
+
+Para cada quantidade de linhas gera um CSV com benchmarks.gerador (mesma
+seed, mesmos dados) e, para cada índice de entidades, mede:
+
+    fila        enfileirar/desenfileirar de todas as linhas na Fila, item a
+                item e em lotes (enfileirar_lote/desenfileirar_lote)
+    ingestao    carregar_interacoes_csv e processar_interacoes_da_fila (ou,
+                com --ingestao fluxo, processar_csv_em_fluxo, que não guarda
+                o arquivo inteiro na fila e é o modo para 10**7+ linhas)
+    busca       buscas de IDs de conteúdo e de usuário existentes
+    relatorios  cada gerar_* (completo e top-10) e os relatórios por plataforma
+                e por conteúdo, com o cache de relatórios desligado
+
+Os tempos são o melhor de --repeticoes execuções (a ingestão roda uma vez).
+O resultado sai em JSON (stdout ou --saida), com o commit e o ambiente, para
+comparar execuções: --comparar anterior.json lista as métricas que pioraram
+mais que --tolerancia e termina com código 1 se houver alguma.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.suite --linhas 10000 100000 1000000 --saida resultado.json
+    python -m benchmarks.suite --linhas 100000 --comparar resultado.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from analise.sistema import TAMANHO_LOTE_NORMALIZACAO, SistemaAnaliseEngajamento
+from benchmarks.gerador import adicionar_argumentos, gerador_dos_argumentos
+from estruturas_dados.arvore_avl import ArvoreAVL
+from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+from estruturas_dados.fila import Fila
+from estruturas_dados.registro_hash import RegistroHash
+
+ESTRUTURAS = {'bst': ArvoreBinariaBusca, 'avl': ArvoreAVL, 'hash': RegistroHash}
+RELATORIOS = ('gerar_top_conteudos_por_tempo', 'gerar_top_usuarios_por_interacoes',
+              'gerar_ranking_usuarios_por_tempo', 'gerar_ranking_plataformas_por_engajamento',
+              'gerar_ranking_conteudos_por_comentarios', 'gerar_conteudos_por_total_interacoes')
+BUSCAS = 100_000
+
+
+def cronometrar(funcao, repeticoes=1):
+    # Melhor tempo (s) de `repeticoes` chamadas.
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def medir_fila(caminho, repeticoes):
+    with open(caminho, encoding='utf-8') as arquivo:
+        linhas = arquivo.readlines()
+
+    def encher_e_esvaziar():
+        fila = Fila()
+        for linha in linhas:
+            fila.enfileirar(linha)
+        while not fila.esta_vazia():
+            fila.desenfileirar()
+
+    def encher_e_esvaziar_em_lotes():
+        fila = Fila()
+        for i in range(0, len(linhas), TAMANHO_LOTE_NORMALIZACAO):
+            fila.enfileirar_lote(linhas[i:i + TAMANHO_LOTE_NORMALIZACAO])
+        while fila.desenfileirar_lote(TAMANHO_LOTE_NORMALIZACAO):
+            pass
+
+    return {'enfileirar_desenfileirar_s': cronometrar(encher_e_esvaziar, repeticoes),
+            'lotes_s': cronometrar(encher_e_esvaziar_em_lotes, repeticoes)}
+
+
+def medir_estrutura(caminho, linhas, classe, repeticoes, seed, modo='fila'):
+    sistema = SistemaAnaliseEngajamento(classe_arvore=classe, guardar_interacoes=False, tamanho_cache=0)
+    resultado = {}
+    try:
+        if modo == 'fila':
+            t_carga = cronometrar(lambda: sistema.carregar_interacoes_csv(caminho))
+            t_processo = cronometrar(sistema.processar_interacoes_da_fila)
+            resultado['ingestao'] = {'carregar_s': t_carga, 'processar_s': t_processo,
+                                     'linhas_por_s': linhas / (t_carga + t_processo)}
+        else:
+            t_fluxo = cronometrar(lambda: sistema.processar_csv_em_fluxo(caminho))
+            resultado['ingestao'] = {'fluxo_s': t_fluxo, 'linhas_por_s': linhas / t_fluxo}
+    except RecursionError:
+        # BST simples com IDs ordenados: a inserção recursiva estoura a pilha.
+        return {'erro': 'RecursionError'}
+
+    rnd = random.Random(seed)
+    ids_conteudo = [k for k, _ in sistema._arvore_conteudos.percurso_em_ordem()]
+    ids_usuario = [k for k, _ in sistema._arvore_usuarios.percurso_em_ordem()]
+    resultado['busca'] = {}
+    for nome, arvore, ids in (('conteudo', sistema._arvore_conteudos, ids_conteudo),
+                              ('usuario', sistema._arvore_usuarios, ids_usuario)):
+        amostra = rnd.choices(ids, k=BUSCAS)
+        tempo = cronometrar(lambda: [arvore.buscar(k) for k in amostra], repeticoes)
+        resultado['busca'][f'{nome}_us'] = tempo / BUSCAS * 1e6
+
+    relatorios = {}
+    for relatorio in RELATORIOS:
+        gerar = getattr(sistema, relatorio)
+        relatorios[relatorio] = cronometrar(gerar, repeticoes)
+        relatorios[f'{relatorio}_top10'] = cronometrar(lambda: gerar(10), repeticoes)
+    for relatorio in ('calcular_tempo_medio_consumo_por_plataforma', 'contar_comentarios_por_conteudo'):
+        relatorios[relatorio] = cronometrar(getattr(sistema, relatorio), repeticoes)
+    resultado['relatorios_s'] = relatorios
+    resultado['entidades'] = {'conteudos': len(ids_conteudo), 'usuarios': len(ids_usuario)}
+    return resultado
+
+
+def ambiente():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'plataforma': platform.platform(),
+            'cpus': os.cpu_count(), 'data': datetime.now(timezone.utc).isoformat(timespec='seconds')}
+
+
+def metricas_planas(resultado):
+    # {(linhas, estrutura, caminho da métrica): valor} para comparar execuções.
+    planas = {}
+    for execucao in resultado['execucoes']:
+        linhas = execucao['linhas']
+        if 'fila' in execucao:
+            for nome, valor in execucao['fila'].items():
+                planas[(linhas, '-', f'fila.{nome}')] = valor
+        for estrutura, medidas in execucao['estruturas'].items():
+            for grupo, valores in medidas.items():
+                if grupo in ('erro', 'entidades'):
+                    continue
+                for nome, valor in valores.items():
+                    planas[(linhas, estrutura, f'{grupo}.{nome}')] = valor
+    return planas
+
+
+def comparar(atual, anterior, tolerancia):
+    # Métricas piores que a anterior por mais de `tolerancia` (linhas_por_s: maior é melhor).
+    antes = metricas_planas(anterior)
+    regressoes = []
+    for chave, valor in sorted(metricas_planas(atual).items(), key=str):
+        base = antes.get(chave)
+        if not base or not valor:
+            continue
+        razao = base / valor if chave[2].endswith('linhas_por_s') else valor / base
+        if razao > 1 + tolerancia:
+            regressoes.append((chave, base, valor, razao))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--estruturas', nargs='+', choices=sorted(ESTRUTURAS), default=['bst', 'avl', 'hash'])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--ingestao', choices=['fila', 'fluxo'], default='fila')
+    parser.add_argument('--saida', help='arquivo JSON (padrão: stdout)')
+    parser.add_argument('--comparar', help='JSON de uma execução anterior')
+    parser.add_argument('--tolerancia', type=float, default=0.10)
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    gerador = gerador_dos_argumentos(args)
+    resultado = {'ambiente': ambiente(), 'gerador': gerador.configuracao(),
+                 'repeticoes': args.repeticoes, 'ingestao': args.ingestao, 'execucoes': []}
+    with tempfile.TemporaryDirectory() as diretorio:
+        for linhas in args.linhas:
+            caminho = os.path.join(diretorio, f'interacoes_{linhas}.csv')
+            inicio = time.perf_counter()
+            gerador.escrever_csv(caminho, linhas)
+            execucao = {'linhas': linhas, 'geracao_s': time.perf_counter() - inicio, 'estruturas': {}}
+            if args.ingestao == 'fila':
+                execucao['fila'] = medir_fila(caminho, args.repeticoes)
+            for nome in args.estruturas:
+                print(f"{linhas} linhas, {nome}...", file=sys.stderr)
+                execucao['estruturas'][nome] = medir_estrutura(caminho, linhas, ESTRUTURAS[nome],
+                                                               args.repeticoes, args.seed, args.ingestao)
+            resultado['execucoes'].append(execucao)
+            os.remove(caminho)
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto + '\n')
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            regressoes = comparar(resultado, json.load(arquivo), args.tolerancia)
+        for (linhas, estrutura, metrica), antes, depois, razao in regressoes:
+            print(f"REGRESSÃO {linhas} {estrutura} {metrica}: {antes:.6g} -> {depois:.6g} ({razao:.2f}x)",
+                  file=sys.stderr)
+        if regressoes:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,55 +1,122 @@
+from estruturas_dados.sketches import HyperLogLog, SpaceSaving, mesclar_sketches
+
+
 class Conteudo:
     """
     Representa um conteúdo (video, podcast ou artigo) e suas interações.
 
-    Métricas disponíveis:
+    Métricas disponíveis (mantidas incrementalmente em registrar_interacao):
         - tempo_total_consumo: soma de durações de visualizações ('view_start')
         - total_interacoes: contagem de todas as interações
         - total_engajamento: soma de likes, shares e comments
+        - total_visualizacoes: quantidade de 'view_start'
+        - total_comentarios: quantidade de 'comment'
         - contagens_por_tipo: dicionário com quantidade por tipo de interação
         - media de tempo de consumo: tempo_total_consumo / número de visualizações
-        - comentários registrados
+        - comentários registrados (se guardados, ver abaixo)
+        - usuarios_distintos / usuarios_frequentes: sketches opcionais de
+          usuários distintos e mais ativos (ver ativar_sketches)
+
+    `tipo_conteudo` identifica o tipo ('video', 'podcast', 'artigo') nas
+    subclasses; a base, sem tipo definido, usa 'conteudo'.
+
+    Com guardar_interacoes=False a lista bruta de interações não é mantida;
+    todas as métricas continuam disponíveis a partir dos contadores. Os
+    textos de comentário seguem a mesma opção, salvo `guardar_comentarios`
+    explícito; sem eles, listar_comentarios retorna [] (a busca por termos
+    fica no IndiceComentarios do sistema).
 
     Complexidades:
         registrar_interacao: O(1)
-        calcular_total_interacoes_engajamento: O(n)
-        calcular_contagem_por_tipo_interacao: O(n)
-        calcular_media_tempo_consumo: O(n)
-        listar_comentarios: O(n)
+        mesclar_metricas: O(t), mais a mescla dos sketches (se ativos)
+        calcular_total_interacoes_engajamento: O(1)
+        calcular_contagem_por_tipo_interacao: O(t), t = tipos distintos
+        calcular_media_tempo_consumo: O(1)
+        listar_comentarios: O(c), c = comentários do conteúdo
     """
-    def __init__(self, id_conteudo: int, nome: str = None):
+    __slots__ = ('id', 'nome', '_interacoes', '_comentarios', 'tempo_total_consumo',
+                 'total_interacoes', 'total_engajamento', 'total_visualizacoes',
+                 'total_comentarios', 'contagens_por_tipo', 'usuarios_distintos',
+                 'usuarios_frequentes')
+    tipo_conteudo = 'conteudo'
+
+    def __init__(self, id_conteudo: int, nome: str = None, guardar_interacoes: bool = True,
+                 guardar_comentarios: bool = None):
         self.id = id_conteudo
         self.nome = nome or f"conteudo_{id_conteudo}"
-        self._interacoes = []
+        self._interacoes = [] if guardar_interacoes else None
+        if guardar_comentarios is None:
+            guardar_comentarios = guardar_interacoes
+        self._comentarios = [] if guardar_comentarios else None
         self.tempo_total_consumo = 0.0
         self.total_interacoes = 0
+        self.total_engajamento = 0
+        self.total_visualizacoes = 0
+        self.total_comentarios = 0
+        self.contagens_por_tipo = {}
+        self.usuarios_distintos = None
+        self.usuarios_frequentes = None
 
     def registrar_interacao(self, interacao):
         # Adiciona uma interação ao conteúdo e atualiza métricas.
-        self._interacoes.append(interacao)
+        if self._interacoes is not None:
+            self._interacoes.append(interacao)
         self.total_interacoes += 1
-        if interacao.tipo == "view_start":
+        tipo = interacao.tipo
+        self.contagens_por_tipo[tipo] = self.contagens_por_tipo.get(tipo, 0) + 1
+        if tipo == "view_start":
+            self.total_visualizacoes += 1
             self.tempo_total_consumo += interacao.duracao
+        elif tipo in ("like", "share", "comment"):
+            self.total_engajamento += 1
+            if tipo == "comment":
+                self.total_comentarios += 1
+                if interacao.comentario and self._comentarios is not None:
+                    self._comentarios.append(interacao.comentario)
+        if self.usuarios_distintos is not None:
+            self.usuarios_distintos.adicionar(interacao.usuario.id)
+        if self.usuarios_frequentes is not None:
+            self.usuarios_frequentes.adicionar(interacao.usuario.id)
+
+    def mesclar_metricas(self, outro):
+        # Soma as métricas de outra instância da mesma entidade (ex.: agregado parcial de um shard).
+        if self._interacoes is not None and outro._interacoes is not None:
+            self._interacoes.extend(outro._interacoes)
+        if self._comentarios is not None and outro._comentarios is not None:
+            self._comentarios.extend(outro._comentarios)
+        self.tempo_total_consumo += outro.tempo_total_consumo
+        self.total_interacoes += outro.total_interacoes
+        self.total_engajamento += outro.total_engajamento
+        self.total_visualizacoes += outro.total_visualizacoes
+        self.total_comentarios += outro.total_comentarios
+        for tipo, qtd in outro.contagens_por_tipo.items():
+            self.contagens_por_tipo[tipo] = self.contagens_por_tipo.get(tipo, 0) + qtd
+        self.usuarios_distintos = mesclar_sketches(self.usuarios_distintos, outro.usuarios_distintos)
+        self.usuarios_frequentes = mesclar_sketches(self.usuarios_frequentes, outro.usuarios_frequentes)
+
+    def ativar_sketches(self, precisao_distintos: int = None, capacidade_frequentes: int = None):
+        # Passa a estimar usuários distintos (HyperLogLog) e mais ativos (SpaceSaving), com memória fixa.
+        if precisao_distintos:
+            self.usuarios_distintos = HyperLogLog(precisao_distintos)
+        if capacidade_frequentes:
+            self.usuarios_frequentes = SpaceSaving(capacidade_frequentes)
 
     def calcular_total_interacoes_engajamento(self) -> int:
         # Retorna a soma de likes, shares e comments.
-        return sum(1 for i in self._interacoes if i.tipo in {"like", "share", "comment"})
+        return self.total_engajamento
 
     def calcular_contagem_por_tipo_interacao(self) -> dict:
         # Retorna um dicionário {tipo: contagem} para todos os tipos de interação.
-        contagens = {}
-        for i in self._interacoes:
-            contagens[i.tipo] = contagens.get(i.tipo, 0) + 1
-        return contagens
+        return dict(self.contagens_por_tipo)
 
     def calcular_media_tempo_consumo(self) -> float:
         # Retorna o tempo médio de consumo (view_start) em segundos.
-        qtd_views = sum(1 for i in self._interacoes if i.tipo == "view_start")
+        qtd_views = self.total_visualizacoes
         return (self.tempo_total_consumo / qtd_views) if qtd_views > 0 else 0.0
 
     def listar_comentarios(self) -> list:
-        # Retorna uma lista de todos os textos de comentários.
-        return [i.comentario for i in self._interacoes if i.tipo == "comment" and i.comentario]
+        # Retorna uma lista de todos os textos de comentários ([] se não são guardados).
+        return list(self._comentarios) if self._comentarios is not None else []
 
     def __repr__(self):
         return f"<Conteudo id={self.id} nome='{self.nome}'>"
@@ -57,14 +124,17 @@ class Conteudo:
 
 class Video(Conteudo):
     # Conteúdo do tipo Vídeo.
-    pass
+    __slots__ = ()
+    tipo_conteudo = 'video'
 
 
 class Podcast(Conteudo):
     # Conteúdo do tipo Podcast.
-    pass
+    __slots__ = ()
+    tipo_conteudo = 'podcast'
 
 
 class Artigo(Conteudo):
     # Conteúdo do tipo Artigo.
-    pass
+    __slots__ = ()
+    tipo_conteudo = 'artigo'
@@ -1,3 +1,31 @@
+import sys
+
+# Pool compartilhado de textos de comentário: textos repetidos passam a ser
+# um único objeto. O pool para de crescer ao atingir o limite, então a
+# memória usada por ele é limitada mesmo com milhões de comentários distintos.
+# SistemaAnaliseEngajamento o esvazia ao (re)iniciar o estado, para que os
+# textos de um sistema descartado não fiquem presos durante todo o processo.
+LIMITE_POOL_COMENTARIOS = 100_000
+_pool_comentarios = {}
+
+
+def limpar_pool_comentarios():
+    # Esvazia o pool; textos já compartilhados continuam válidos nas interações existentes.
+    _pool_comentarios.clear()
+
+
+def compartilhar_comentario(texto):
+    # Retorna a instância compartilhada do texto ('' e None viram None).
+    if not texto:
+        return None
+    existente = _pool_comentarios.get(texto)
+    if existente is not None:
+        return existente
+    if len(_pool_comentarios) < LIMITE_POOL_COMENTARIOS:
+        _pool_comentarios[texto] = texto
+    return texto
+
+
 class Interacao:
     """
     Representa uma interação de um usuário com um conteúdo em uma plataforma.
@@ -6,10 +34,13 @@ class Interacao:
         usuario (Usuario): objeto Usuário que realizou a interação.
         conteudo (Conteudo): objeto Conteúdo alvo da interação.
         plataforma (Plataforma): plataforma onde ocorreu a interação.
-        tipo (str): tipo de interação ('view_start', 'like', 'share', 'comment', etc.).
-        duracao (int): duração em segundos de visualização (apenas para 'view_start').
-        comentario (str, opcional): texto do comentário, se houver.
+        tipo (str): tipo de interação ('view_start', 'like', 'share', 'comment', etc.), internado.
+        duracao (int): duração em segundos de visualização (apenas para 'view_start'; 0 nos demais).
+        comentario (str, opcional): texto do comentário, se houver (compartilhado pelo pool).
+        timestamp (int): instante da interação em segundos desde a época (None se desconhecido).
     """
+    __slots__ = ('usuario', 'conteudo', 'plataforma', 'tipo', 'duracao', 'comentario', 'timestamp')
+
     def __init__(
         self,
         usuario,
@@ -17,14 +48,16 @@ class Interacao:
         plataforma,
         tipo: str,
         duracao: int = 0,
-        comentario: str = None
+        comentario: str = None,
+        timestamp: int = None
     ):
         self.usuario = usuario
         self.conteudo = conteudo
         self.plataforma = plataforma
-        self.tipo = tipo
-        self.duracao = duracao
-        self.comentario = comentario
+        self.tipo = sys.intern(tipo) if tipo else tipo
+        self.duracao = duracao if tipo == 'view_start' else 0
+        self.comentario = compartilhar_comentario(comentario)
+        self.timestamp = timestamp
 
     def __repr__(self):
         base = f"<Interacao tipo={self.tipo} usuario={self.usuario.id} conteudo={self.conteudo.id}"  
@@ -1,40 +1,89 @@
+from estruturas_dados.sketches import HyperLogLog, SpaceSaving, mesclar_sketches
+
+
 class Plataforma:
     """
     Representa uma plataforma de mídia onde ocorrem interações.
 
-    Métricas disponíveis:
+    Métricas disponíveis (mantidas incrementalmente em registrar_interacao):
         - tempo_total_consumo: soma de durações de visualizações ('view_start')
         - total_interacoes: quantidade total de interações registradas
         - total_engajamento: soma de likes, shares e comments
+        - total_visualizacoes: quantidade de 'view_start'
+        - total_comentarios: quantidade de 'comment'
         - contagens_por_tipo: dicionário com a contagem de cada tipo de interação
+        - usuarios_distintos / usuarios_frequentes: sketches opcionais de
+          usuários distintos e mais ativos (ver ativar_sketches)
+    Com guardar_interacoes=False a lista bruta de interações não é mantida.
     Complexidades:
         registrar_interacao: O(1)
-        calcular_total_interacoes_engajamento: O(n)
-        calcular_contagem_por_tipo_interacao: O(n)
+        mesclar_metricas: O(t), mais a mescla dos sketches (se ativos)
+        calcular_total_interacoes_engajamento: O(1)
+        calcular_contagem_por_tipo_interacao: O(t), t = tipos distintos
     """
-    def __init__(self, nome: str):
+    __slots__ = ('nome', '_interacoes', 'tempo_total_consumo', 'total_interacoes',
+                 'total_engajamento', 'total_visualizacoes', 'total_comentarios',
+                 'contagens_por_tipo', 'usuarios_distintos', 'usuarios_frequentes')
+
+    def __init__(self, nome: str, guardar_interacoes: bool = True):
         self.nome = nome
-        self._interacoes = []
+        self._interacoes = [] if guardar_interacoes else None
         self.tempo_total_consumo = 0.0
         self.total_interacoes = 0
+        self.total_engajamento = 0
+        self.total_visualizacoes = 0
+        self.total_comentarios = 0
+        self.contagens_por_tipo = {}
+        self.usuarios_distintos = None
+        self.usuarios_frequentes = None
 
     def registrar_interacao(self, interacao):
         # Adiciona uma interação à plataforma e atualiza métricas.
-        self._interacoes.append(interacao)
+        if self._interacoes is not None:
+            self._interacoes.append(interacao)
         self.total_interacoes += 1
-        if interacao.tipo == 'view_start':
+        tipo = interacao.tipo
+        self.contagens_por_tipo[tipo] = self.contagens_por_tipo.get(tipo, 0) + 1
+        if tipo == 'view_start':
+            self.total_visualizacoes += 1
             self.tempo_total_consumo += interacao.duracao
+        elif tipo in ('like', 'share', 'comment'):
+            self.total_engajamento += 1
+            if tipo == 'comment':
+                self.total_comentarios += 1
+        if self.usuarios_distintos is not None:
+            self.usuarios_distintos.adicionar(interacao.usuario.id)
+        if self.usuarios_frequentes is not None:
+            self.usuarios_frequentes.adicionar(interacao.usuario.id)
+
+    def mesclar_metricas(self, outro):
+        # Soma as métricas de outra instância da mesma entidade (ex.: agregado parcial de um shard).
+        if self._interacoes is not None and outro._interacoes is not None:
+            self._interacoes.extend(outro._interacoes)
+        self.tempo_total_consumo += outro.tempo_total_consumo
+        self.total_interacoes += outro.total_interacoes
+        self.total_engajamento += outro.total_engajamento
+        self.total_visualizacoes += outro.total_visualizacoes
+        self.total_comentarios += outro.total_comentarios
+        for tipo, qtd in outro.contagens_por_tipo.items():
+            self.contagens_por_tipo[tipo] = self.contagens_por_tipo.get(tipo, 0) + qtd
+        self.usuarios_distintos = mesclar_sketches(self.usuarios_distintos, outro.usuarios_distintos)
+        self.usuarios_frequentes = mesclar_sketches(self.usuarios_frequentes, outro.usuarios_frequentes)
+
+    def ativar_sketches(self, precisao_distintos: int = None, capacidade_frequentes: int = None):
+        # Passa a estimar usuários distintos (HyperLogLog) e mais ativos (SpaceSaving), com memória fixa.
+        if precisao_distintos:
+            self.usuarios_distintos = HyperLogLog(precisao_distintos)
+        if capacidade_frequentes:
+            self.usuarios_frequentes = SpaceSaving(capacidade_frequentes)
 
     def calcular_total_interacoes_engajamento(self) -> int:
         # Retorna a soma de likes, shares e comments.
-        return sum(1 for i in self._interacoes if i.tipo in {'like', 'share', 'comment'})
+        return self.total_engajamento
 
     def calcular_contagem_por_tipo_interacao(self) -> dict:
         # Retorna um dicionário {tipo: contagem} para todos os tipos de interação. 
-        contagens = {}
-        for i in self._interacoes:
-            contagens[i.tipo] = contagens.get(i.tipo, 0) + 1
-        return contagens
+        return dict(self.contagens_por_tipo)
 
     def __repr__(self):
         return (f"<Plataforma nome='{self.nome}' total_interacoes={self.total_interacoes} "
@@ -2,40 +2,69 @@ class Usuario:
     """
     Representa um usuário que realiza interações em conteúdos de plataformas.
 
-    Métricas disponíveis:
+    Métricas disponíveis (mantidas incrementalmente em registrar_interacao):
         - tempo_total_consumo: soma de durações de visualizações ('view_start')
         - total_interacoes: quantidade total de interações realizadas
         - total_engajamento: soma de likes, shares e comments
+        - total_visualizacoes: quantidade de 'view_start'
+        - total_comentarios: quantidade de 'comment'
         - contagens_por_tipo: dicionário com a contagem de cada tipo de interação
+    Com guardar_interacoes=False a lista bruta de interações não é mantida.
     Complexidades:
         registrar_interacao: O(1)
-        calcular_total_interacoes_engajamento: O(n)
-        calcular_contagem_por_tipo_interacao: O(n)
+        mesclar_metricas: O(t)
+        calcular_total_interacoes_engajamento: O(1)
+        calcular_contagem_por_tipo_interacao: O(t), t = tipos distintos
     """
-    def __init__(self, id_usuario: int):
+    __slots__ = ('id', '_interacoes', 'tempo_total_consumo', 'total_interacoes',
+                 'total_engajamento', 'total_visualizacoes', 'total_comentarios',
+                 'contagens_por_tipo')
+
+    def __init__(self, id_usuario: int, guardar_interacoes: bool = True):
         self.id = id_usuario
-        self._interacoes = []
+        self._interacoes = [] if guardar_interacoes else None
         self.tempo_total_consumo = 0.0
         self.total_interacoes = 0
+        self.total_engajamento = 0
+        self.total_visualizacoes = 0
+        self.total_comentarios = 0
+        self.contagens_por_tipo = {}
 
     def registrar_interacao(self, interacao):
         # Adiciona uma interação ao usuário e atualiza métricas.
-        self._interacoes.append(interacao)
+        if self._interacoes is not None:
+            self._interacoes.append(interacao)
         self.total_interacoes += 1
-        if interacao.tipo == 'view_start':
+        tipo = interacao.tipo
+        self.contagens_por_tipo[tipo] = self.contagens_por_tipo.get(tipo, 0) + 1
+        if tipo == 'view_start':
+            self.total_visualizacoes += 1
             self.tempo_total_consumo += interacao.duracao
+        elif tipo in ('like', 'share', 'comment'):
+            self.total_engajamento += 1
+            if tipo == 'comment':
+                self.total_comentarios += 1
+
+    def mesclar_metricas(self, outro):
+        # Soma as métricas de outra instância da mesma entidade (ex.: agregado parcial de um shard).
+        if self._interacoes is not None and outro._interacoes is not None:
+            self._interacoes.extend(outro._interacoes)
+        self.tempo_total_consumo += outro.tempo_total_consumo
+        self.total_interacoes += outro.total_interacoes
+        self.total_engajamento += outro.total_engajamento
+        self.total_visualizacoes += outro.total_visualizacoes
+        self.total_comentarios += outro.total_comentarios
+        for tipo, qtd in outro.contagens_por_tipo.items():
+            self.contagens_por_tipo[tipo] = self.contagens_por_tipo.get(tipo, 0) + qtd
 
     def calcular_total_interacoes_engajamento(self) -> int:
         # Retorna a soma de likes, shares e comments realizadas pelo usuário.
-        return sum(1 for i in self._interacoes if i.tipo in {'like', 'share', 'comment'})
+        return self.total_engajamento
 
     def calcular_contagem_por_tipo_interacao(self) -> dict:
         # Retorna um dicionário {tipo: contagem} para todos os tipos de interação.
-        contagens = {}
-        for i in self._interacoes:
-            contagens[i.tipo] = contagens.get(i.tipo, 0) + 1
-        return contagens
+        return dict(self.contagens_por_tipo)
 
     def __repr__(self):
         return (f"<Usuario id={self.id} total_interacoes={self.total_interacoes} "
-                f"tempo_total_consumo={self.tempo_total_consumo}s>")
\ No newline at end of file
+                f"tempo_total_consumo={self.tempo_total_consumo}s>")
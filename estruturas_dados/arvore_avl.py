@@ -0,0 +1,159 @@
+from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+
+
+class _NoAVL:
+    __slots__ = ('key', 'value', 'left', 'right', 'altura', 'tamanho')
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.altura = 1
+        self.tamanho = 1
+
+
+def _altura(node):
+    return node.altura if node else 0
+
+
+def _atualizar_altura(node):
+    # Recalcula altura e tamanho da subárvore a partir dos filhos.
+    left, right = node.left, node.right
+    hl = left.altura if left else 0
+    hr = right.altura if right else 0
+    node.altura = (hl if hl > hr else hr) + 1
+    node.tamanho = 1 + (left.tamanho if left else 0) + (right.tamanho if right else 0)
+
+
+def _rotacionar_direita(y):
+    x = y.left
+    y.left = x.right
+    x.right = y
+    _atualizar_altura(y)
+    _atualizar_altura(x)
+    return x
+
+
+def _rotacionar_esquerda(x):
+    y = x.right
+    x.right = y.left
+    y.left = x
+    _atualizar_altura(x)
+    _atualizar_altura(y)
+    return y
+
+
+def _balancear(node):
+    # Recalcula a altura e aplica as rotações necessárias; retorna a nova raiz da subárvore.
+    _atualizar_altura(node)
+    fator = _altura(node.left) - _altura(node.right)
+    if fator > 1:
+        if _altura(node.left.left) < _altura(node.left.right):
+            node.left = _rotacionar_esquerda(node.left)
+        return _rotacionar_direita(node)
+    if fator < -1:
+        if _altura(node.right.right) < _altura(node.right.left):
+            node.right = _rotacionar_direita(node.right)
+        return _rotacionar_esquerda(node)
+    return node
+
+
+class ArvoreAVL(ArvoreBinariaBusca):
+    """
+    Árvore AVL (BST auto-balanceada) com a mesma API de ArvoreBinariaBusca.
+
+    Inserção e remoção são iterativas: o caminho da raiz até o ponto alterado
+    é guardado em uma pilha e rebalanceado de baixo para cima, então chaves
+    inseridas em ordem crescente não degeneram a árvore nem esbarram no
+    limite de recursão do Python.
+
+    Complexidades:
+        inserir: O(log n)
+        buscar:  O(log n)
+        remover: O(log n)
+        percurso_em_ordem: O(n)
+        rank, select, contar_intervalo: O(log n)
+        altura: O(1)
+    """
+    _classe_no = _NoAVL
+    _atualizar_no = staticmethod(_atualizar_altura)
+
+    def inserir(self, key: int, value):
+        # Insere ou atualiza o valor associado à chave.
+        if self._root is None:
+            self._root = _NoAVL(key, value)
+            return
+        caminho = []
+        node = self._root
+        while True:
+            caminho.append(node)
+            if key < node.key:
+                if node.left is None:
+                    node.left = _NoAVL(key, value)
+                    break
+                node = node.left
+            elif key > node.key:
+                if node.right is None:
+                    node.right = _NoAVL(key, value)
+                    break
+                node = node.right
+            else:
+                # Atualiza o valor se a chave já existir
+                node.value = value
+                return
+        for node in caminho:
+            node.tamanho += 1
+        self._rebalancear_caminho(caminho)
+
+    def remover(self, key: int):
+        # Remove o nó com a chave especificada (sem efeito se não existir).
+        caminho = []
+        node = self._root
+        while node is not None and node.key != key:
+            caminho.append(node)
+            node = node.left if key < node.key else node.right
+        if node is None:
+            return
+        alvo = node
+        if node.left is not None and node.right is not None:
+            # Nó com dois filhos: copia o sucessor e remove o sucessor
+            caminho.append(node)
+            alvo = node.right
+            while alvo.left is not None:
+                caminho.append(alvo)
+                alvo = alvo.left
+            node.key, node.value = alvo.key, alvo.value
+        filho = alvo.left if alvo.left is not None else alvo.right
+        for ancestral in caminho:
+            ancestral.tamanho -= 1
+        if not caminho:
+            self._root = filho
+        else:
+            pai = caminho[-1]
+            if pai.left is alvo:
+                pai.left = filho
+            else:
+                pai.right = filho
+        self._rebalancear_caminho(caminho)
+
+    def altura(self) -> int:
+        # Retorna a altura da árvore (0 se vazia).
+        return _altura(self._root)
+
+    def _rebalancear_caminho(self, caminho):
+        # Sobe pelo caminho rebalanceando; para quando a subárvore não muda.
+        for i in range(len(caminho) - 1, -1, -1):
+            node = caminho[i]
+            altura_anterior = node.altura
+            nova = _balancear(node)
+            if nova is node and node.altura == altura_anterior:
+                return
+            if i == 0:
+                self._root = nova
+            else:
+                pai = caminho[i - 1]
+                if pai.left is node:
+                    pai.left = nova
+                else:
+                    pai.right = nova
@@ -1,21 +1,43 @@
 class _Node:
-    __slots__ = ('key', 'value', 'left', 'right')
+    __slots__ = ('key', 'value', 'left', 'right', 'tamanho')
 
     def __init__(self, key, value):
         self.key = key
         self.value = value
         self.left = None
         self.right = None
+        # Quantidade de nós da subárvore (aumento para rank/select).
+        self.tamanho = 1
+
+
+def _tamanho(node):
+    return node.tamanho if node else 0
+
+
+def _atualizar_tamanho(node):
+    node.tamanho = 1 + (node.left.tamanho if node.left else 0) + (node.right.tamanho if node.right else 0)
+
 
 class ArvoreBinariaBusca:
     """
     Árvore de Busca Binária (BST) para chaves inteiras.
+
+    Cada nó guarda o tamanho da sua subárvore, o que permite as consultas
+    por posição (rank/select) e a contagem de intervalos em O(h).
+
     Complexidades:
         inserir: O(h) onde h = altura da árvore (médio O(log n), pior O(n))
         buscar:  O(h)
         remover: O(h)
         percurso_em_ordem: O(n)
+        intervalo: O(h + k) para k chaves geradas
+        rank, select, contar_intervalo: O(h)
+        carregar_ordenados: O(n), árvore resultante balanceada
+        altura: O(n)
+        __len__: O(1)
     """
+    _classe_no = _Node
+
     def __init__(self):
         self._root = None
 
@@ -33,6 +55,7 @@ class ArvoreBinariaBusca:
         else:
             # Atualiza o valor se a chave já existir
             node.value = value
+        _atualizar_tamanho(node)
         return node
 
     def buscar(self, key: int):
@@ -69,6 +92,7 @@ class ArvoreBinariaBusca:
             succ = self._min_node(node.right)
             node.key, node.value = succ.key, succ.value
             node.right = self._remove(node.right, succ.key)
+        _atualizar_tamanho(node)
         return node
 
     def _min_node(self, node):
@@ -78,15 +102,122 @@ class ArvoreBinariaBusca:
             current = current.left
         return current
 
+    def carregar_ordenados(self, pares):
+        """
+        Substitui o conteúdo da árvore pelos pares (chave, valor), que devem
+        vir em ordem estritamente crescente de chave (ex.: um snapshot ou um
+        percurso_em_ordem). Monta a árvore balanceada em O(n), sem inserções
+        individuais; lança ValueError se a ordem não for crescente.
+        """
+        pares = list(pares)
+        for i in range(1, len(pares)):
+            if pares[i - 1][0] >= pares[i][0]:
+                raise ValueError("carregar_ordenados exige chaves em ordem estritamente crescente")
+        self._root = self._montar(pares, 0, len(pares))
+
+    def _montar(self, pares, inicio, fim):
+        # Subárvore com pares[inicio:fim], raiz no meio (profundidade da recursão: O(log n)).
+        if inicio >= fim:
+            return None
+        meio = (inicio + fim) // 2
+        node = self._classe_no(*pares[meio])
+        node.left = self._montar(pares, inicio, meio)
+        node.right = self._montar(pares, meio + 1, fim)
+        self._atualizar_no(node)
+        return node
+
+    @staticmethod
+    def _atualizar_no(node):
+        # Recalcula os campos derivados do nó a partir dos filhos.
+        _atualizar_tamanho(node)
+
+    def rank(self, key: int) -> int:
+        # Quantidade de chaves menores que `key` (posição que ela ocupa ou ocuparia).
+        return self._contar_menores(key, False)
+
+    def select(self, posicao: int):
+        # Retorna o par (chave, valor) da posição (0 = menor chave). Lança IndexError fora do intervalo.
+        if not 0 <= posicao < len(self):
+            raise IndexError("posição fora da árvore")
+        node = self._root
+        while True:
+            esquerda = _tamanho(node.left)
+            if posicao < esquerda:
+                node = node.left
+            elif posicao > esquerda:
+                posicao -= esquerda + 1
+                node = node.right
+            else:
+                return node.key, node.value
+
+    def contar_intervalo(self, inicio: int, fim: int) -> int:
+        # Quantidade de chaves em [inicio, fim] (extremos inclusive).
+        if inicio > fim:
+            return 0
+        return self._contar_menores(fim, True) - self._contar_menores(inicio, False)
+
+    def _contar_menores(self, key, inclusive):
+        # Chaves < key (ou <= key, se inclusive), descendo por um único caminho.
+        total = 0
+        node = self._root
+        while node:
+            if key < node.key or (key == node.key and not inclusive):
+                node = node.left
+            else:
+                total += _tamanho(node.left) + 1
+                if key == node.key:
+                    break
+                node = node.right
+        return total
+
+    def intervalo(self, inicio: int = None, fim: int = None):
+        """
+        Gera, sob demanda e em ordem crescente, os pares (chave, valor) com
+        inicio <= chave <= fim (None = sem limite), sem montar a lista inteira.
+        A árvore não deve ser alterada enquanto o gerador é consumido.
+        """
+        pilha = []
+        node = self._root
+        while pilha or node:
+            # Desce à esquerda só enquanto pode haver chaves >= inicio.
+            while node:
+                if inicio is not None and node.key < inicio:
+                    node = node.right
+                else:
+                    pilha.append(node)
+                    node = node.left
+            if not pilha:
+                return
+            node = pilha.pop()
+            if fim is not None and node.key > fim:
+                return
+            yield node.key, node.value
+            node = node.right
+
+    def altura(self) -> int:
+        # Retorna a altura da árvore (0 se vazia), nível a nível, sem recursão.
+        altura = 0
+        nivel = [self._root] if self._root else []
+        while nivel:
+            altura += 1
+            nivel = [filho for node in nivel for filho in (node.left, node.right) if filho]
+        return altura
+
+    def __len__(self) -> int:
+        # Retorna o número de nós (chaves distintas).
+        return _tamanho(self._root)
+
     def percurso_em_ordem(self):
         # Retorna lista de (chave, valor) em ordem crescente de chaves.
+        # Iterativo (pilha explícita) para não depender da altura da árvore.
         result = []
-        self._inorder(self._root, result)
-        return result
-
-    def _inorder(self, node, result):
-        if node:
-            self._inorder(node.left, result)
+        pilha = []
+        node = self._root
+        while pilha or node:
+            while node:
+                pilha.append(node)
+                node = node.left
+            node = pilha.pop()
             result.append((node.key, node.value))
-            self._inorder(node.right, result)
-
+            node = node.right
+        return result
@@ -1,33 +1,146 @@
+import os
+import pickle
+import sys
+import tempfile
 from collections import deque
 
 class Fila:
     """
     Fila FIFO (First-In, First-Out) para processamento de itens em ordem de chegada.
 
+    Com `limite_memoria=k`, no máximo k itens ficam em memória: o excedente
+    é gravado em segmentos de k // 2 itens (arquivos temporários em
+    `diretorio`, serializados com pickle) e relido em ordem FIFO quando a
+    frente da fila se esgota. Sem limite, nada vai para o disco.
+    enfileirar_lote/desenfileirar_lote movem um lote inteiro por chamada
+    (extend e esvaziamento da deque em bloco), sem uma chamada de método por item.
+
     Complexidades:
-        enfileirar: O(1)
-        desenfileirar: O(1)
+        enfileirar: O(1) (amortizado; com limite, uma gravação a cada k // 2 itens excedentes)
+        desenfileirar: O(1) amortizado
+        enfileirar_lote / desenfileirar_lote: O(b) para b itens
         esta_vazia: O(1)
         __len__: O(1)
     """
-    def __init__(self):
-        # Usamos deque para enfileirar/desenfileirar em O(1)
-        self._dados = deque()
+    def __init__(self, limite_memoria: int = None, diretorio: str = None):
+        if limite_memoria is not None and limite_memoria < 2:
+            raise ValueError("limite_memoria deve ser >= 2")
+        self.limite_memoria = limite_memoria
+        self.diretorio = diretorio
+        # Itens lidos primeiro (deque, como na fila sem limite).
+        self._frente = deque()
+        # Excedente, em ordem: segmentos em disco (caminho, quantidade) e a cauda ainda em memória.
+        self._segmentos = deque()
+        self._cauda = []
+        self._em_disco = 0
+        self._tamanho_segmento = limite_memoria // 2 if limite_memoria else None
+        self._limite_frente = limite_memoria - self._tamanho_segmento if limite_memoria else sys.maxsize
+        self.segmentos_gravados = 0
 
     def enfileirar(self, item):
         # Adiciona um item ao final da fila.
-        self._dados.append(item)
+        if self._cauda or self._segmentos or len(self._frente) >= self._limite_frente:
+            self._transbordar([item])
+        else:
+            self._frente.append(item)
+
+    def enfileirar_lote(self, itens):
+        # Adiciona os itens em ordem, de uma vez (o que não cabe em memória vai para o disco).
+        itens = list(itens)
+        if not self._cauda and not self._segmentos:
+            espaco = self._limite_frente - len(self._frente)
+            if espaco >= len(itens):
+                self._frente.extend(itens)
+                return
+            self._frente.extend(itens[:espaco])
+            itens = itens[espaco:]
+        self._transbordar(itens)
 
     def desenfileirar(self):
         # Remove e retorna o item da frente da fila. Lança IndexError se vazia.
-        if self.esta_vazia():
+        if not self._frente and not self._recarregar():
             raise IndexError("Fila vazia")
-        return self._dados.popleft()
+        return self._frente.popleft()
+
+    def desenfileirar_lote(self, maximo: int) -> list:
+        # Remove e retorna até `maximo` itens em ordem de chegada ([] se a fila estiver vazia).
+        lote = []
+        while len(lote) < maximo:
+            frente = self._frente
+            if not frente:
+                if not self._recarregar():
+                    break
+                frente = self._frente
+            falta = maximo - len(lote)
+            if falta >= len(frente):
+                lote += frente
+                frente.clear()
+            else:
+                popleft = frente.popleft
+                lote += [popleft() for _ in range(falta)]
+        return lote
 
     def esta_vazia(self) -> bool:
         # Retorna True se a fila estiver vazia.
-        return not self._dados
+        return not self._frente and not self._segmentos and not self._cauda
+
+    def em_disco(self) -> int:
+        # Itens gravados em segmentos no momento.
+        return self._em_disco
+
+    def limpar(self):
+        # Descarta todos os itens, removendo os segmentos em disco.
+        while self._segmentos:
+            caminho, _ = self._segmentos.popleft()
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+        self._frente.clear()
+        self._cauda = []
+        self._em_disco = 0
 
     def __len__(self) -> int:
         # Retorna o número de itens na fila.
-        return len(self._dados)
+        return len(self._frente) + self._em_disco + len(self._cauda)
+
+    def __del__(self):
+        # Não deixa segmentos órfãos no disco.
+        if getattr(self, '_segmentos', None):
+            self.limpar()
+
+    def _transbordar(self, itens):
+        # Itens que não cabem na frente: acumulam na cauda, gravada em segmentos completos.
+        cauda = self._cauda
+        cauda += itens
+        if self._tamanho_segmento is None:
+            return
+        tamanho = self._tamanho_segmento
+        if len(cauda) >= tamanho:
+            inicio = 0
+            while len(cauda) - inicio >= tamanho:
+                self._gravar_segmento(cauda[inicio:inicio + tamanho])
+                inicio += tamanho
+            self._cauda = cauda[inicio:]
+
+    def _gravar_segmento(self, itens):
+        descritor, caminho = tempfile.mkstemp(prefix='fila_', suffix='.seg', dir=self.diretorio)
+        with os.fdopen(descritor, 'wb') as arquivo:
+            pickle.dump(itens, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        self._segmentos.append((caminho, len(itens)))
+        self._em_disco += len(itens)
+        self.segmentos_gravados += 1
+
+    def _recarregar(self):
+        # Frente esgotada: traz o próximo segmento do disco ou, sem segmentos, a cauda.
+        if self._segmentos:
+            caminho, quantidade = self._segmentos.popleft()
+            with open(caminho, 'rb') as arquivo:
+                self._frente = deque(pickle.load(arquivo))
+            os.remove(caminho)
+            self._em_disco -= quantidade
+        elif self._cauda:
+            self._frente, self._cauda = deque(self._cauda), []
+        else:
+            return False
+        return True
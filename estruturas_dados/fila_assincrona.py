@@ -0,0 +1,59 @@
+import asyncio
+from collections import deque
+
+class FilaAssincrona:
+    """
+    Fila FIFO para corrotinas (contraparte assíncrona de Fila), com capacidade opcional.
+
+    Produtores aguardam enquanto a fila está cheia (backpressure) e
+    consumidores aguardam enquanto ela está vazia, em vez de lançar erro.
+    Com capacidade 0 a fila não tem limite.
+
+    Complexidades:
+        enfileirar / desenfileirar: O(1)
+        enfileirar_lote / desenfileirar_lote: O(k)
+        esta_vazia / esta_cheia / __len__: O(1)
+    """
+    def __init__(self, capacidade: int = 0):
+        if capacidade < 0:
+            raise ValueError("capacidade deve ser >= 0")
+        self.capacidade = capacidade
+        self._dados = deque()
+        self._mudou = asyncio.Condition()
+
+    async def enfileirar(self, item):
+        # Adiciona um item ao final da fila, aguardando espaço se necessário.
+        await self.enfileirar_lote((item,))
+
+    async def enfileirar_lote(self, itens):
+        # Adiciona os itens em ordem; com a fila cheia, libera o consumidor e aguarda.
+        async with self._mudou:
+            for item in itens:
+                while self.esta_cheia():
+                    self._mudou.notify_all()
+                    await self._mudou.wait()
+                self._dados.append(item)
+            self._mudou.notify_all()
+
+    async def desenfileirar(self):
+        # Remove e retorna o item da frente, aguardando se a fila estiver vazia.
+        return (await self.desenfileirar_lote(1))[0]
+
+    async def desenfileirar_lote(self, maximo: int):
+        # Remove e retorna até `maximo` itens (pelo menos um), em ordem de chegada.
+        async with self._mudou:
+            while not self._dados:
+                await self._mudou.wait()
+            dados = self._dados
+            itens = [dados.popleft() for _ in range(min(maximo, len(dados)))]
+            self._mudou.notify_all()
+            return itens
+
+    def esta_vazia(self) -> bool:
+        return not self._dados
+
+    def esta_cheia(self) -> bool:
+        return 0 < self.capacidade <= len(self._dados)
+
+    def __len__(self) -> int:
+        return len(self._dados)
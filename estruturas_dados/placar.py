@@ -0,0 +1,71 @@
+import heapq
+
+
+class Placar:
+    """
+    Placar (leaderboard) que mantém os `capacidade` maiores itens por pontuação.
+
+    Pensado para métricas que só crescem (contadores e tempos acumulados): um
+    item fora do placar só pode entrar quando a sua própria pontuação sobe, e
+    isso é verificado na chamada de `atualizar` daquele item. Empates são
+    desfeitos pela chave inteira crescente, como na ordenação estável de um
+    percurso em ordem.
+
+    Internamente há um dicionário dos membros e um min-heap com o pior membro
+    no topo; entradas desatualizadas do heap são descartadas de forma
+    preguiçosa e o heap é reconstruído quando acumula lixo demais.
+
+    Complexidades:
+        atualizar: O(log k) amortizado
+        top(n): O(k log k)
+    """
+    def __init__(self, capacidade: int):
+        if capacidade <= 0:
+            raise ValueError("capacidade deve ser positiva")
+        self.capacidade = capacidade
+        self._membros = {}
+        self._heap = []
+
+    def atualizar(self, chave: int, pontuacao, item=None):
+        # Registra a nova pontuação (não decrescente) de `chave`.
+        membro = self._membros.get(chave)
+        if membro is not None:
+            if pontuacao != membro[0]:
+                self._membros[chave] = (pontuacao, item)
+                self._empilhar((pontuacao, -chave))
+            return
+        if len(self._membros) < self.capacidade:
+            self._membros[chave] = (pontuacao, item)
+            self._empilhar((pontuacao, -chave))
+            return
+        pior = self._pior()
+        if (pontuacao, -chave) > pior:
+            heapq.heapreplace(self._heap, (pontuacao, -chave))
+            del self._membros[-pior[1]]
+            self._membros[chave] = (pontuacao, item)
+
+    def top(self, n: int = None) -> list:
+        # Retorna até n itens (ou as chaves, se item for None) do maior para o menor.
+        ordem = sorted(self._membros.items(), key=lambda kv: (kv[1][0], -kv[0]), reverse=True)
+        if n is not None:
+            ordem = ordem[:n]
+        return [item if item is not None else chave for chave, (_, item) in ordem]
+
+    def __len__(self) -> int:
+        return len(self._membros)
+
+    def _pior(self):
+        # Descarta entradas desatualizadas até o topo do heap ser um membro válido.
+        heap = self._heap
+        while True:
+            pontuacao, neg_chave = heap[0]
+            membro = self._membros.get(-neg_chave)
+            if membro is not None and membro[0] == pontuacao:
+                return heap[0]
+            heapq.heappop(heap)
+
+    def _empilhar(self, entrada):
+        heapq.heappush(self._heap, entrada)
+        if len(self._heap) > 2 * self.capacidade + 16:
+            self._heap = [(p, -k) for k, (p, _) in self._membros.items()]
+            heapq.heapify(self._heap)
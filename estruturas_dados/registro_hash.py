@@ -0,0 +1,102 @@
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+
+class RegistroHash:
+    """
+    Registro de entidades por ID com a mesma API de ArvoreBinariaBusca.
+
+    A busca e a inserção usam um dicionário (O(1) médio), que é o que importa
+    no caminho quente da ingestão. A visão ordenada por chave é mantida de
+    forma preguiçosa: a lista de chaves ordenadas só é (re)construída quando
+    percurso_em_ordem é chamado e houve inserção ou remoção desde a última
+    vez. Chaves inseridas em ordem crescente são acrescentadas ao final da
+    lista sem invalidá-la.
+
+    Complexidades:
+        inserir: O(1) médio
+        buscar:  O(1) médio
+        remover: O(1) médio
+        percurso_em_ordem: O(n) se a ordem está válida, O(n log n) se suja
+        intervalo: O(log n + k) para k chaves geradas (com a ordem válida)
+        rank, select, contar_intervalo: O(log n) (com a ordem válida)
+        carregar_ordenados: O(n)
+    """
+    def __init__(self):
+        self._dados = {}
+        self._ordenadas = []
+
+    def inserir(self, key: int, value):
+        # Insere ou atualiza o valor associado à chave.
+        dados = self._dados
+        if key not in dados:
+            ordenadas = self._ordenadas
+            if ordenadas is not None and (not ordenadas or key > ordenadas[-1]):
+                ordenadas.append(key)
+            else:
+                self._ordenadas = None
+        dados[key] = value
+
+    def buscar(self, key: int):
+        # Retorna o valor associado à chave, ou None se não existir.
+        return self._dados.get(key)
+
+    def remover(self, key: int):
+        # Remove a chave (sem efeito se não existir).
+        if key in self._dados:
+            del self._dados[key]
+            self._ordenadas = None
+
+    def percurso_em_ordem(self):
+        # Retorna lista de (chave, valor) em ordem crescente de chaves.
+        dados = self._dados
+        return [(k, dados[k]) for k in self._chaves_ordenadas()]
+
+    def carregar_ordenados(self, pares):
+        # Substitui o conteúdo pelos pares (chave, valor) em ordem estritamente crescente.
+        pares = list(pares)
+        ordenadas = [k for k, _ in pares]
+        # A ordem é conferida antes do dict, que descartaria chaves repetidas.
+        if any(a >= b for a, b in zip(ordenadas, ordenadas[1:])):
+            raise ValueError("carregar_ordenados exige chaves em ordem estritamente crescente")
+        self._dados = dict(pares)
+        self._ordenadas = ordenadas
+
+    def intervalo(self, inicio: int = None, fim: int = None):
+        # Gera os pares (chave, valor) com inicio <= chave <= fim, em ordem, sob demanda.
+        ordenadas = self._chaves_ordenadas()
+        a = 0 if inicio is None else bisect_left(ordenadas, inicio)
+        b = len(ordenadas) if fim is None else bisect_right(ordenadas, fim)
+        dados = self._dados
+        for k in islice(ordenadas, a, b):
+            yield k, dados[k]
+
+    def rank(self, key: int) -> int:
+        # Quantidade de chaves menores que `key`.
+        return bisect_left(self._chaves_ordenadas(), key)
+
+    def select(self, posicao: int):
+        # Retorna o par (chave, valor) da posição (0 = menor chave). Lança IndexError fora do intervalo.
+        if not 0 <= posicao < len(self._dados):
+            raise IndexError("posição fora do registro")
+        chave = self._chaves_ordenadas()[posicao]
+        return chave, self._dados[chave]
+
+    def contar_intervalo(self, inicio: int, fim: int) -> int:
+        # Quantidade de chaves em [inicio, fim] (extremos inclusive).
+        if inicio > fim:
+            return 0
+        ordenadas = self._chaves_ordenadas()
+        return bisect_right(ordenadas, fim) - bisect_left(ordenadas, inicio)
+
+    def _chaves_ordenadas(self):
+        if self._ordenadas is None:
+            self._ordenadas = sorted(self._dados)
+        return self._ordenadas
+
+    def valores(self):
+        # Valores em ordem de inserção, sem custo de ordenação.
+        return list(self._dados.values())
+
+    def __len__(self) -> int:
+        return len(self._dados)
@@ -0,0 +1,197 @@
+"""
+Sketches probabilísticos de memória fixa: HyperLogLog (elementos distintos)
+e Space-Saving (elementos mais frequentes).
+
+Ambos são mescláveis (o resultado da mescla de dois sketches equivale, dentro
+da mesma garantia de erro, a um sketch que tivesse visto os dois fluxos), o
+que permite agregá-los por fatia na ingestão paralela. Os elementos são
+inteiros (IDs de usuário).
+"""
+import base64
+import heapq
+import math
+
+_MASCARA = (1 << 64) - 1
+
+
+def mesclar_sketches(destino, origem):
+    """Mescla `origem` em `destino` (qualquer um pode ser None) e retorna o resultado."""
+    if origem is None:
+        return destino
+    if destino is None:
+        return origem
+    destino.mesclar(origem)
+    return destino
+
+
+class HyperLogLog:
+    """
+    Estimativa da quantidade de elementos distintos em 2**precisao bytes.
+
+    Erro padrão relativo ~ 1.04 / sqrt(2**precisao) (precisao=12: ~1,6%,
+    4 KiB); para escolher pela tolerância, use HyperLogLog.para_erro.
+    Contagens pequenas usam a correção por contagem linear.
+
+    Complexidades:
+        adicionar: O(1)
+        estimar: O(m), m = 2**precisao registradores
+        mesclar: O(m)
+    """
+    __slots__ = ('precisao', '_registros', '_resto', '_mascara_resto')
+
+    def __init__(self, precisao: int = 12):
+        if not 4 <= precisao <= 18:
+            raise ValueError("precisao deve estar entre 4 e 18")
+        self.precisao = precisao
+        self._registros = bytearray(1 << precisao)
+        self._resto = 64 - precisao
+        self._mascara_resto = (1 << self._resto) - 1
+
+    @classmethod
+    def para_erro(cls, erro: float):
+        """HyperLogLog com a menor precisão cujo erro padrão não passa de `erro`."""
+        if not 0 < erro < 1:
+            raise ValueError("erro deve estar entre 0 e 1")
+        return cls(min(18, max(4, math.ceil(2 * math.log2(1.04 / erro)))))
+
+    def adicionar(self, elemento: int):
+        # splitmix64 (em linha, é o caminho quente): espalha IDs sequenciais pelos 64 bits.
+        h = (elemento + 0x9E3779B97F4A7C15) & _MASCARA
+        h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA
+        h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASCARA
+        h ^= h >> 31
+        resto = self._resto
+        # Posição do primeiro bit 1 nos `resto` bits finais (1 = bit mais alto).
+        posicao = resto - (h & self._mascara_resto).bit_length() + 1
+        registros = self._registros
+        indice = h >> resto
+        if posicao > registros[indice]:
+            registros[indice] = posicao
+
+    def estimar(self) -> int:
+        m = len(self._registros)
+        alfa = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimativa = alfa * m * m / sum(2.0 ** -r for r in self._registros)
+        vazios = self._registros.count(0)
+        if estimativa <= 2.5 * m and vazios:
+            estimativa = m * math.log(m / vazios)
+        return round(estimativa)
+
+    def mesclar(self, outro):
+        # União: máximo registrador a registrador (mesma precisão).
+        if outro.precisao != self.precisao:
+            raise ValueError("HyperLogLogs com precisões diferentes")
+        self._registros = bytearray(map(max, self._registros, outro._registros))
+
+    def exportar(self) -> dict:
+        """Estado em tipos JSON (registradores em base64)."""
+        return {'precisao': self.precisao, 'registros': base64.b64encode(self._registros).decode('ascii')}
+
+    @classmethod
+    def importar(cls, dados: dict):
+        hll = cls(dados['precisao'])
+        hll._registros = bytearray(base64.b64decode(dados['registros']))
+        return hll
+
+
+class SpaceSaving:
+    """
+    Elementos mais frequentes de um fluxo com `capacidade` contadores.
+
+    Todo elemento com frequência maior que N / capacidade (N = elementos
+    vistos) está entre os monitorados, e a contagem de cada monitorado
+    superestima a real em no máximo o seu `erro`. Com um contador livre o
+    elemento novo entra com contagem 1; senão substitui o de menor contagem
+    e herda essa contagem como erro. O menor é achado em um min-heap com
+    entradas desatualizadas descartadas de forma preguiçosa (as contagens só
+    crescem), como no Placar.
+
+    Complexidades:
+        adicionar: O(1) para monitorados, O(log k) amortizado ao substituir
+        top(n): O(k log k)
+        mesclar: O(k log k)
+    """
+    __slots__ = ('capacidade', 'total', '_contadores', '_heap')
+
+    def __init__(self, capacidade: int = 100):
+        if capacidade <= 0:
+            raise ValueError("capacidade deve ser positiva")
+        self.capacidade = capacidade
+        self.total = 0
+        self._contadores = {}
+        self._heap = []
+
+    @classmethod
+    def para_erro(cls, erro: float):
+        """SpaceSaving cujo erro por elemento não passa de `erro` * N."""
+        if not 0 < erro < 1:
+            raise ValueError("erro deve estar entre 0 e 1")
+        return cls(math.ceil(1 / erro))
+
+    def adicionar(self, elemento: int, quantidade: int = 1):
+        self.total += quantidade
+        contadores = self._contadores
+        contador = contadores.get(elemento)
+        if contador is not None:
+            contador[0] += quantidade
+            return
+        if len(contadores) < self.capacidade:
+            contadores[elemento] = [quantidade, 0]
+            heapq.heappush(self._heap, (quantidade, elemento))
+            return
+        # Substitui o monitorado de menor contagem, que está no topo do heap.
+        heap = self._heap
+        minimo, menor = heap[0]
+        if contadores[menor][0] != minimo:
+            minimo = self._minimo()
+            menor = heap[0][1]
+        del contadores[menor]
+        contadores[elemento] = [minimo + quantidade, minimo]
+        heapq.heapreplace(heap, (minimo + quantidade, elemento))
+
+    def top(self, n: int = None) -> list:
+        """Até n triplas (elemento, contagem estimada, erro máximo); empates por elemento."""
+        ordem = sorted(self._contadores.items(), key=lambda kv: (-kv[1][0], kv[0]))
+        return [(elemento, c, e) for elemento, (c, e) in ordem[:n]]
+
+    def mesclar(self, outro):
+        # Soma os contadores; quem falta em um lado recebe o mínimo daquele lado (se cheio).
+        min_self = self._minimo() if len(self._contadores) >= self.capacidade else 0
+        min_outro = outro._minimo() if len(outro._contadores) >= outro.capacidade else 0
+        somados = {}
+        for elemento in self._contadores.keys() | outro._contadores.keys():
+            c1, e1 = self._contadores.get(elemento, (min_self, min_self))
+            c2, e2 = outro._contadores.get(elemento, (min_outro, min_outro))
+            somados[elemento] = [c1 + c2, e1 + e2]
+        melhores = heapq.nsmallest(self.capacidade, somados.items(), key=lambda kv: (-kv[1][0], kv[0]))
+        self._contadores = dict(melhores)
+        self._heap = [(c, elemento) for elemento, (c, _) in melhores]
+        heapq.heapify(self._heap)
+        self.total += outro.total
+
+    def exportar(self) -> dict:
+        """Estado em tipos JSON."""
+        return {'capacidade': self.capacidade, 'total': self.total,
+                'contadores': [[elemento, c, e] for elemento, (c, e) in self._contadores.items()]}
+
+    @classmethod
+    def importar(cls, dados: dict):
+        ss = cls(dados['capacidade'])
+        ss.total = dados['total']
+        ss._contadores = {elemento: [c, e] for elemento, c, e in dados['contadores']}
+        ss._heap = [(c, elemento) for elemento, c, _ in dados['contadores']]
+        heapq.heapify(ss._heap)
+        return ss
+
+    def _minimo(self) -> int:
+        # Menor contagem entre os monitorados (limpando entradas desatualizadas do heap).
+        heap = self._heap
+        while True:
+            c, elemento = heap[0]
+            atual = self._contadores[elemento][0]
+            if atual == c:
+                return c
+            heapq.heapreplace(heap, (atual, elemento))
+
+    def __len__(self) -> int:
+        return len(self._contadores)
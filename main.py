@@ -1,5 +1,11 @@
+import argparse
 import csv
+from analise.instrumentacao import formatar_estatisticas, perfilar
 from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.arvore_avl import ArvoreAVL
+
+CAMINHO_CSV = 'interacoes_globo.csv'
+CAMINHO_SNAPSHOT = 'interacoes_globo.snapshot'
 
 def formatar_tempo(segundos):
     segundos = int(segundos)
@@ -22,8 +28,19 @@ def listar_usuarios(sistema):
 def listar_plataformas(sistema):
     return list(sistema._plataformas_registradas.values())
 
+def exibir_paginas(obter_pagina, formatar, tamanho=20):
+    # Mostra uma página por vez (em ordem de ID), sem montar a lista inteira.
+    pagina = 0
+    while True:
+        itens = obter_pagina(pagina, tamanho)
+        for item in itens: print(formatar(item))
+        if len(itens) < tamanho or input("Enter para a próxima página, 0 para voltar: ").strip() == '0':
+            break
+        pagina += 1
+
 def listar_conteudos_por_tipo(sistema, tipo):
-    return [c for c in listar_conteudos(sistema) if c.__class__.__name__.lower() == tipo.lower()]
+    # Consulta o índice de tipos do sistema (só os conteúdos do tipo).
+    return sistema.listar_conteudos_por_tipo(tipo)
 
 def menu_metricas(sistema):
     while True:
@@ -34,6 +51,9 @@ def menu_metricas(sistema):
         print("4 - Média de tempo de consumo por conteúdo")
         print("5 - Listar comentários por conteúdo")
         print("6 - Top-5 conteúdos por interações")
+        print("7 - Buscar conteúdos por palavras nos comentários")
+        print("8 - Termos mais frequentes nos comentários por conteúdo")
+        print("9 - Quem viu este conteúdo também viu")
         print("0 - Voltar")
         opc = input("Escolha uma métrica: ").strip()
         if opc == '0': break
@@ -65,8 +85,29 @@ def menu_metricas(sistema):
                     for txt in coms: print(f"  - {txt}")
         elif opc == '6':
             print("\nTop-5 conteúdos por interações:")
-            top5 = sorted(conteudos, key=lambda x:x.total_interacoes, reverse=True)[:5]
-            for c in top5: print(f"{c.nome}: {c.total_interacoes}")
+            for c in sistema.gerar_conteudos_por_total_interacoes(5): print(f"{c.nome}: {c.total_interacoes}")
+        elif opc == '7':
+            consulta = input("Palavras: ").strip()
+            encontrados = sistema.buscar_conteudos_por_comentario(consulta)
+            if not encontrados: print("Nenhum conteúdo encontrado.")
+            for c in encontrados: print(f"ID {c.id}: {c.nome}")
+        elif opc == '8':
+            print("\nTermos mais frequentes nos comentários:")
+            for c in conteudos:
+                termos = sistema.termos_frequentes(c.id, 5)
+                if termos:
+                    print(f"{c.nome}: " + ", ".join(f"{t} ({q})" for t, q in termos))
+        elif opc == '9':
+            try:
+                id_conteudo = int(input("ID do conteúdo: ").strip())
+            except ValueError:
+                print("ID inválido.")
+                continue
+            similares = sistema.conteudos_similares(id_conteudo, 5)
+            if not similares: print("Nenhum conteúdo relacionado.")
+            for c, similaridade in similares:
+                print(f"ID {c.id}: {c.nome} (similaridade {similaridade:.2f}, "
+                      f"{sistema.usuarios_em_comum(id_conteudo, c.id)} usuários em comum)")
         else:
             print("Opção inválida.")
 
@@ -80,6 +121,7 @@ def menu_relatorios_solicitados(sistema):
         print("5 - Total de interações por tipo de conteúdo")
         print("6 - Tempo médio de consumo por plataforma")
         print("7 - Quantidade de comentários por conteúdo")
+        print("8 - Tempo médio por plataforma nos últimos 7 dias")
         print("0 - Voltar")
         opc = input("Escolha um relatório: ").strip()
         if opc == '0': break
@@ -94,15 +136,15 @@ def menu_relatorios_solicitados(sistema):
         elif opc == '3':
             print("\nPlataformas por engajamento:")
             for p in sistema.gerar_ranking_plataformas_por_engajamento():
-                print(f"{p.nome}: {p.calcular_total_interacoes_engajamento()} engajamentos")
+                print(f"{p.nome}: {p.total_engajamento} engajamentos")
         elif opc == '4':
             print("\nConteúdos mais comentados:")
             for c in sistema.gerar_ranking_conteudos_por_comentarios():
-                print(f"{c.nome}: {c.calcular_contagem_por_tipo_interacao().get('comment',0)} comentários")
+                print(f"{c.nome}: {c.total_comentarios} comentários")
         elif opc == '5':
             print("\nTotal de interações por tipo de conteúdo:")
-            for c in sistema.gerar_conteudos_por_total_interacoes():
-                print(f"{c.nome}: {c.total_interacoes}")
+            for tipo, totais in sistema.totais_por_tipo().items():
+                print(f"{tipo}: {totais['total_interacoes']} interações em {totais['conteudos']} conteúdos")
         elif opc == '6':
             print("\nTempo médio de consumo por plataforma:")
             medias = sistema.calcular_tempo_medio_consumo_por_plataforma()
@@ -111,6 +153,15 @@ def menu_relatorios_solicitados(sistema):
             print("\nQuantidade de comentários por conteúdo:")
             coms = sistema.contar_comentarios_por_conteudo()
             for nome, q in coms.items(): print(f"{nome}: {q} comentários")
+        elif opc == '8':
+            print("\nTempo médio de consumo por plataforma (últimos 7 dias dos dados):")
+            intervalo = sistema.intervalo_temporal()
+            if not intervalo:
+                print("Nenhuma interação com data.")
+                continue
+            fim = intervalo[1]
+            medias = sistema.calcular_tempo_medio_consumo_por_plataforma(fim - 7 * 86400, fim)
+            for nome, m in medias.items(): print(f"{nome}: {formatar_tempo(m)}")
         else:
             print("Opção inválida.")
 
@@ -123,6 +174,7 @@ def menu_principal(sistema):
         print("4 - Listar Plataformas")
         print("5 - Listar Podcasts")
         print("6 - Relatórios Solicitados")
+        print("7 - Estatísticas de desempenho")
         print("0 - Sair")
         opc = input("Escolha uma opção: ").strip()
         if opc == '0':
@@ -135,7 +187,7 @@ def menu_principal(sistema):
                 print(f"ID {u.id}: {u.total_interacoes} interações")
         elif opc == '3':
             print("\nConteúdos cadastrados:")
-            for c in listar_conteudos(sistema): print(f"ID {c.id}: {c.nome}")
+            exibir_paginas(sistema.pagina_conteudos, lambda c: f"ID {c.id}: {c.nome}")
         elif opc == '4':
             print("\nPlataformas cadastradas:")
             for p in listar_plataformas(sistema): print(f"{p.nome}: {p.total_interacoes} interações")
@@ -147,12 +199,42 @@ def menu_principal(sistema):
                 print(f"\n{p.nome}:")
                 for t,q in p.calcular_contagem_por_tipo_interacao().items(): print(f"  {t}: {q}")
         elif opc == '6': menu_relatorios_solicitados(sistema)
+        elif opc == '7':
+            print("\nEstatísticas de desempenho:")
+            print(formatar_estatisticas(sistema.estatisticas()))
+            if sistema._instrumentacao is None:
+                # Sem --instrumentar a carga não foi medida; liga agora para os próximos relatórios.
+                sistema.ativar_instrumentacao()
+                print("(inicie com --instrumentar para medir a carga; a partir de agora os relatórios são medidos)")
         else: print("Opção inválida.")
 
+def carregar_sistema(instrumentar=False):
+    # Restaura o snapshot (se houver) e aplica só as linhas novas do CSV desde o último checkpoint.
+    opcoes = dict(classe_arvore=ArvoreAVL, tamanho_placar=10, largura_bucket=3600,
+                  indexar_comentarios=True, instrumentar=instrumentar, coengajamento=True)
+    sistema, resumo = SistemaAnaliseEngajamento.carregar_snapshot_atualizado(CAMINHO_SNAPSHOT, CAMINHO_CSV, **opcoes)
+    if resumo['snapshot'].startswith('ignorado'):
+        print(f"Snapshot {resumo['snapshot']}; CSV recarregado.")
+    if resumo['linhas_novas'] or resumo['modo'] != 'incremental':
+        rejeitadas = sum(resumo['rejeitadas'].values())
+        if rejeitadas:
+            detalhes = ", ".join(f"{m}: {q}" for m, q in resumo['rejeitadas'].items() if q)
+            print(f"{rejeitadas} linhas rejeitadas ({detalhes})")
+    return sistema
+
 def main():
-    sistema = SistemaAnaliseEngajamento()
-    sistema.carregar_interacoes_csv('interacoes_globo.csv')
-    sistema.processar_interacoes_da_fila()
+    parser = argparse.ArgumentParser(description="Análise de engajamento de mídias Globo")
+    parser.add_argument('--perfil', nargs='?', const='', metavar='ARQUIVO.prof',
+                        help='perfila a carga com cProfile (e grava o .prof, se informado)')
+    parser.add_argument('--instrumentar', action='store_true',
+                        help='mede a carga e os relatórios (contadores e tempos na opção 7)')
+    args = parser.parse_args()
+    if args.perfil is None:
+        sistema = carregar_sistema(args.instrumentar)
+    else:
+        with perfilar(args.perfil or None) as perfil:
+            sistema = carregar_sistema(args.instrumentar)
+        print(perfil.resumo())
     menu_principal(sistema)
 
 if __name__ == '__main__':
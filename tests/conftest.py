@@ -0,0 +1,54 @@
+import pytest
+
+from benchmarks.gerador import GeradorInteracoes
+
+METRICAS = ('tempo_total_consumo', 'total_interacoes', 'total_engajamento',
+            'total_visualizacoes', 'total_comentarios')
+
+
+def _metricas(entidade):
+    return tuple(getattr(entidade, m) for m in METRICAS) + (entidade.contagens_por_tipo,)
+
+
+def capturar_estado(sistema) -> dict:
+    """Tudo o que os relatórios enxergam do sistema, em tipos comparáveis com ==."""
+    plataformas = sistema.gerar_ranking_plataformas_por_engajamento()
+    estado = {
+        'ingestao': sistema.resumo_ingestao(),
+        'conteudos': [(c.id, c.nome, c.tipo_conteudo) + _metricas(c) for c in sistema.iterar_conteudos()],
+        'usuarios': [(u.id,) + _metricas(u) for u in sistema.iterar_usuarios()],
+        'plataformas': [(p.nome,) + _metricas(p) for p in plataformas],
+        'tempo_medio': sistema.calcular_tempo_medio_consumo_por_plataforma(),
+        'comentarios': sistema.contar_comentarios_por_conteudo(),
+        'top_conteudos': [c.id for c in sistema.gerar_conteudos_por_total_interacoes(20)],
+        'top_usuarios': [u.id for u in sistema.gerar_ranking_usuarios_por_tempo(20)],
+    }
+    if sistema._indice_temporal is not None:
+        inicio, fim = sistema.intervalo_temporal()
+        meio = (inicio + fim) // 2
+        estado['janela'] = [(m.id, m.total_interacoes, m.tempo_total_consumo)
+                            for m in sistema.gerar_conteudos_por_total_interacoes(None, inicio, meio)]
+    if sistema._coengajamento is not None:
+        estado['similares'] = [[(c.id, similaridade) for c, similaridade in sistema.conteudos_similares(i, 5)]
+                               for i, *_ in estado['conteudos'][:10]]
+    if sistema._indice_comentarios is not None:
+        estado['busca'] = [c.id for c in sistema.buscar_conteudos_por_comentario('recomendo')]
+    return estado
+
+
+@pytest.fixture
+def estado():
+    return capturar_estado
+
+
+@pytest.fixture
+def gerador():
+    # Poucos conteúdos e usuários para que as entidades se repitam entre fatias e lotes.
+    return GeradorInteracoes(seed=7, conteudos=60, usuarios=300, dias=3)
+
+
+@pytest.fixture
+def csv_sintetico(tmp_path, gerador):
+    caminho = tmp_path / 'interacoes.csv'
+    gerador.escrever_csv(str(caminho), 3000)
+    return str(caminho)
@@ -0,0 +1,51 @@
+import pytest
+
+from analise.armazenamento_colunar import ArmazenamentoColunar, np
+from analise.sistema import SistemaAnaliseEngajamento
+
+USAR_NUMPY = [False] + ([True] if np is not None else [])
+
+
+def _relatorios_do_sistema(sistema, n):
+    return {
+        'gerar_top_conteudos_por_tempo':
+            [(c.id, c.nome, c.tempo_total_consumo) for c in sistema.gerar_top_conteudos_por_tempo(n)],
+        'gerar_top_usuarios_por_interacoes':
+            [(u.id, u.total_interacoes) for u in sistema.gerar_top_usuarios_por_interacoes(n)],
+        'gerar_ranking_usuarios_por_tempo':
+            [(u.id, u.tempo_total_consumo) for u in sistema.gerar_ranking_usuarios_por_tempo(n)],
+        'gerar_ranking_plataformas_por_engajamento':
+            [(p.nome, p.total_engajamento) for p in sistema.gerar_ranking_plataformas_por_engajamento(n)],
+        'gerar_ranking_conteudos_por_comentarios':
+            [(c.id, c.nome, c.total_comentarios) for c in sistema.gerar_ranking_conteudos_por_comentarios(n)],
+        'gerar_conteudos_por_total_interacoes':
+            [(c.id, c.nome, c.total_interacoes) for c in sistema.gerar_conteudos_por_total_interacoes(n)],
+    }
+
+
+@pytest.mark.parametrize('usar_numpy', USAR_NUMPY)
+@pytest.mark.parametrize('n', [None, 5])
+def test_relatorios_iguais_aos_do_sistema(csv_sintetico, usar_numpy, n):
+    sistema = SistemaAnaliseEngajamento(guardar_interacoes=False)
+    resumo = sistema.processar_csv_em_fluxo(csv_sintetico)
+    colunar = ArmazenamentoColunar(usar_numpy)
+    assert colunar.carregar_csv(csv_sintetico) == resumo
+
+    for metodo, esperado in _relatorios_do_sistema(sistema, n).items():
+        assert [tuple(linha) for linha in getattr(colunar, metodo)(n)] == esperado, metodo
+    assert colunar.calcular_tempo_medio_consumo_por_plataforma() == \
+        sistema.calcular_tempo_medio_consumo_por_plataforma()
+    assert colunar.contar_comentarios_por_conteudo() == sistema.contar_comentarios_por_conteudo()
+
+
+@pytest.mark.parametrize('usar_numpy', USAR_NUMPY)
+def test_ids_esparsos_e_colunas_compactas(usar_numpy):
+    colunar = ArmazenamentoColunar(usar_numpy)
+    for id_c, id_u, tipo in ((2_000_000_000, 7, 'view_start'), (3, 2_000_000_000, 'like'),
+                             (2_000_000_000, 7, 'comment'), (3, 9, 'view_start')):
+        colunar.adicionar(id_c, f'C{id_c}', id_u, 'G1', tipo, 10.0 if tipo == 'view_start' else 0.0)
+    assert len(colunar) == 4
+    assert colunar.memoria_bytes() == 4 * 23
+    assert colunar.gerar_conteudos_por_total_interacoes() == [(3, 'C3', 2), (2_000_000_000, 'C2000000000', 2)]
+    assert [tuple(x) for x in colunar.gerar_top_usuarios_por_interacoes(1)] == [(7, 2)]
+    assert colunar.contar_comentarios_por_conteudo() == {'C3': 0, 'C2000000000': 1}
@@ -0,0 +1,70 @@
+import random
+
+from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.arvore_avl import ArvoreAVL
+from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+
+
+def _conferir_avl(node):
+    # Retorna (altura, tamanho) da subárvore, conferindo balanceamento, ordem e campos derivados.
+    if node is None:
+        return 0, 0
+    he, te = _conferir_avl(node.left)
+    hd, td = _conferir_avl(node.right)
+    assert abs(he - hd) <= 1
+    assert node.left is None or node.left.key < node.key
+    assert node.right is None or node.right.key > node.key
+    assert node.altura == max(he, hd) + 1
+    assert node.tamanho == te + td + 1
+    return node.altura, node.tamanho
+
+
+def test_insercoes_e_remocoes_aleatorias_mantem_avl():
+    rnd = random.Random(3)
+    arvore, modelo = ArvoreAVL(), {}
+    for passo in range(5000):
+        chave = rnd.randrange(800)
+        if rnd.random() < 0.35:
+            arvore.remover(chave)
+            modelo.pop(chave, None)
+        else:
+            arvore.inserir(chave, passo)
+            modelo[chave] = passo
+        if passo % 250 == 0:
+            _conferir_avl(arvore._root)
+    _conferir_avl(arvore._root)
+    assert arvore.percurso_em_ordem() == sorted(modelo.items())
+    assert len(arvore) == len(modelo)
+    assert all(arvore.buscar(k) == v for k, v in modelo.items())
+    assert arvore.buscar(10_000) is None
+
+
+def test_chaves_crescentes_nao_degeneram():
+    arvore = ArvoreAVL()
+    for chave in range(100_000):
+        arvore.inserir(chave, chave)
+    # Limite da AVL: 1,44 log2(n).
+    assert arvore.altura() <= 24
+    for chave in range(0, 100_000, 2):
+        arvore.remover(chave)
+    _conferir_avl(arvore._root)
+    assert [k for k, _ in arvore.intervalo(0, 9)] == [1, 3, 5, 7, 9]
+
+
+def test_remover_chave_ausente_e_arvore_vazia():
+    arvore = ArvoreAVL()
+    arvore.remover(1)
+    assert arvore.altura() == 0 and len(arvore) == 0
+    arvore.inserir(1, 'a')
+    arvore.inserir(1, 'b')
+    arvore.remover(2)
+    assert arvore.percurso_em_ordem() == [(1, 'b')]
+
+
+def test_sistema_com_avl_iguala_bst(csv_sintetico, estado):
+    sistemas = []
+    for classe in (ArvoreBinariaBusca, ArvoreAVL):
+        sistema = SistemaAnaliseEngajamento(classe_arvore=classe)
+        sistema.processar_csv_em_fluxo(csv_sintetico)
+        sistemas.append(sistema)
+    assert estado(sistemas[0]) == estado(sistemas[1])
@@ -0,0 +1,92 @@
+import threading
+
+from analise.sistema import SistemaAnaliseEngajamento
+
+CABECALHO = ('id_conteudo,nome_conteudo,id_usuario,timestamp_interacao,plataforma,'
+             'tipo_interacao,watch_duration_seconds,comment_text\n')
+
+
+def _registros(*linhas):
+    return [(str(c), f'Conteudo {c}', str(u), '2024-10-20 10:00:00', 'G1', 'view_start', str(d), '')
+            for c, u, d in linhas]
+
+
+def _sistema(**opcoes):
+    sistema = SistemaAnaliseEngajamento(**opcoes)
+    sistema._processar_lote(_registros((1, 10, 100), (2, 10, 50)))
+    return sistema
+
+
+def test_resultado_fica_em_cache_ate_a_proxima_ingestao():
+    sistema = _sistema()
+    primeiro = sistema.gerar_top_conteudos_por_tempo(2)
+    assert sistema.gerar_top_conteudos_por_tempo(2) is primeiro
+    assert [c.id for c in primeiro] == [1, 2]
+
+    sistema._processar_lote(_registros((2, 11, 500)))
+    depois = sistema.gerar_top_conteudos_por_tempo(2)
+    assert depois is not primeiro
+    assert [c.id for c in depois] == [2, 1]
+
+
+def test_cache_invalidado_por_toda_alteracao_de_estado(tmp_path):
+    sistema = _sistema()
+    medias = sistema.calcular_tempo_medio_consumo_por_plataforma()
+    caminho = tmp_path / 'novas.csv'
+    caminho.write_text(CABECALHO + '3,Conteudo 3,12,2024-10-20 11:00:00,G1,view_start,300,\n',
+                       encoding='utf-8')
+    sistema.processar_csv_incremental(str(caminho))
+    assert sistema.calcular_tempo_medio_consumo_por_plataforma() == {'G1': 150.0}
+    assert medias == {'G1': 75.0}
+
+    assert [c.id for c in sistema.gerar_ranking_por_tipo('video')] == [1, 2, 3]
+    sistema.declarar_tipo_conteudo(3, 'podcast')
+    assert [c.id for c in sistema.gerar_ranking_por_tipo('video')] == [1, 2]
+
+
+def test_resultado_calculado_durante_alteracao_nao_e_guardado():
+    sistema = _sistema()
+    with sistema._alterando_estado():
+        durante = sistema.gerar_top_conteudos_por_tempo(2)
+        sistema._registrar(2, 'Conteudo 2', 11, 'G1', 'view_start', 500, None)
+    depois = sistema.gerar_top_conteudos_por_tempo(2)
+    assert depois is not durante
+    assert [c.id for c in depois] == [2, 1]
+    assert sistema.gerar_top_conteudos_por_tempo(2) is depois
+
+
+def test_calculo_concorrente_com_alteracao_nao_e_guardado():
+    # A alteração começa e termina enquanto o relatório é calculado fora da trava.
+    sistema = _sistema()
+    calculando, alterado = threading.Event(), threading.Event()
+    original = sistema._calcular_ranking
+
+    def calcular_lento(*args):
+        resultado = original(*args)
+        calculando.set()
+        alterado.wait(5)
+        return resultado
+
+    sistema._calcular_ranking = calcular_lento
+    resultados = []
+    leitor = threading.Thread(target=lambda: resultados.append(sistema.gerar_top_conteudos_por_tempo(2)))
+    leitor.start()
+    calculando.wait(5)
+    sistema._processar_lote(_registros((2, 11, 500)))
+    alterado.set()
+    leitor.join()
+    sistema._calcular_ranking = original
+
+    assert [c.id for c in resultados[0]] == [1, 2]
+    assert [c.id for c in sistema.gerar_top_conteudos_por_tempo(2)] == [2, 1]
+
+
+def test_cache_limitado_e_desligavel():
+    sistema = _sistema(tamanho_cache=2)
+    for n in (1, 2, 3):
+        sistema.gerar_top_conteudos_por_tempo(n)
+    assert len(sistema._cache_relatorios) == 2
+
+    sem_cache = _sistema(tamanho_cache=0)
+    assert sem_cache.gerar_top_conteudos_por_tempo(2) is not sem_cache.gerar_top_conteudos_por_tempo(2)
+    assert not sem_cache._cache_relatorios
@@ -0,0 +1,99 @@
+import random
+from math import sqrt
+
+import pytest
+
+from analise.coengajamento import MatrizCoengajamento
+from analise.sistema import SistemaAnaliseEngajamento
+
+
+def _pares(seed=8, n=6000):
+    rnd = random.Random(seed)
+    return [(rnd.randrange(1, 500), rnd.randrange(1, 60) * 7) for _ in range(n)]
+
+
+def _matriz(pares, limite_pendentes=64):
+    # Limite de pendentes pequeno: várias compactações durante o registro.
+    matriz = MatrizCoengajamento(limite_pendentes)
+    for u, c in pares:
+        matriz.registrar(u, c)
+    return matriz
+
+
+def _similares_forca_bruta(pares, id_conteudo, k):
+    usuarios = {}
+    for u, c in pares:
+        usuarios.setdefault(c, set()).add(u)
+    alvo = usuarios[id_conteudo]
+    candidatos = []
+    for c, us in usuarios.items():
+        comum = len(alvo & us)
+        if c != id_conteudo and comum:
+            candidatos.append((-comum / sqrt(len(alvo) * len(us)), c, comum))
+    return [(c, -sim, comum) for sim, c, comum in sorted(candidatos)[:k]]
+
+
+def _conferir(matriz, pares):
+    usuarios = {}
+    for u, c in pares:
+        usuarios.setdefault(c, set()).add(u)
+    assert len(matriz) == len(set(pares))
+    for c in list(usuarios)[:15]:
+        assert matriz.usuarios_do_conteudo(c) == len(usuarios[c])
+        obtidos = matriz.conteudos_similares(c, 5)
+        esperados = _similares_forca_bruta(pares, c, 5)
+        assert [(i, comum) for i, _, comum in obtidos] == [(i, comum) for i, _, comum in esperados]
+        assert [s for _, s, _ in obtidos] == pytest.approx([s for _, s, _ in esperados])
+        outro = obtidos[0][0]
+        assert matriz.usuarios_em_comum(c, outro) == len(usuarios[c] & usuarios[outro])
+        assert matriz.similaridade(c, outro) == pytest.approx(obtidos[0][1])
+
+
+def test_similares_iguais_a_forca_bruta():
+    pares = _pares()
+    matriz = _matriz(pares)
+    _conferir(matriz, pares)
+    # Conteúdos do usuário na ordem em que cada conteúdo apareceu pela primeira vez no fluxo.
+    ordem = list(dict.fromkeys(c for _, c in pares))
+    usuario = pares[0][0]
+    assert matriz.conteudos_do_usuario(usuario) == [c for c in ordem if (usuario, c) in set(pares)]
+    assert matriz.conteudos_similares(-1) == [] and matriz.usuarios_em_comum(-1, 7) == 0
+    with pytest.raises(ValueError):
+        matriz.conteudos_similares(7, limite_linha=0)
+
+
+def test_amostragem_estima_o_cosseno():
+    # Todos os usuários veem 1 e metade (sorteada) vê 2: cosseno exato 1/sqrt(2).
+    metade = random.Random(9).sample(range(4000), 2000)
+    matriz = _matriz([(u, 1) for u in range(4000)] + [(u, 2) for u in metade])
+    (id_c, similaridade, comum), = matriz.conteudos_similares(1, limite_usuarios=500)
+    assert id_c == 2
+    assert similaridade == pytest.approx(1 / sqrt(2), rel=0.1)
+    assert comum == pytest.approx(2000, rel=0.1)
+    # Usuários com linhas longas demais não geram candidatos.
+    assert matriz.conteudos_similares(1, limite_linha=1) == []
+
+
+def test_mesclar_e_exportar():
+    pares = _pares()
+    mesclada = _matriz(pares[:2500])
+    mesclada.mesclar(_matriz(pares[2500:]))
+    _conferir(mesclada, pares)
+    importada = MatrizCoengajamento.importar(mesclada.exportar())
+    _conferir(importada, pares)
+
+
+def test_sistema_serial_e_paralelo(csv_sintetico):
+    serial = SistemaAnaliseEngajamento(coengajamento=True)
+    serial.processar_csv_em_fluxo(csv_sintetico)
+    paralelo = SistemaAnaliseEngajamento(coengajamento=True)
+    paralelo.carregar_csv_paralelo(csv_sintetico, 3)
+    pares = [(i.usuario.id, c.id) for c in serial.iterar_conteudos() for i in c._interacoes]
+    for c in serial.iterar_conteudos(1, 10):
+        esperados = _similares_forca_bruta(pares, c.id, 5)
+        assert [(s.id, serial.usuarios_em_comum(c.id, s.id)) for s, _ in serial.conteudos_similares(c.id, 5)] == \
+            [(i, comum) for i, _, comum in esperados]
+        assert [(s.id, sim) for s, sim in paralelo.conteudos_similares(c.id, 5)] == \
+            [(s.id, sim) for s, sim in serial.conteudos_similares(c.id, 5)]
+    with pytest.raises(ValueError):
+        SistemaAnaliseEngajamento().conteudos_similares(1)
@@ -0,0 +1,58 @@
+from collections import Counter
+
+from analise.sistema import SistemaAnaliseEngajamento
+from entidades.conteudo import Video
+from entidades.interacao import Interacao
+from entidades.plataforma import Plataforma
+from entidades.usuario import Usuario
+
+
+def _recontar(interacoes):
+    # Métricas recalculadas do zero a partir da lista bruta de interações.
+    tipos = Counter(i.tipo for i in interacoes)
+    return {
+        'total_interacoes': len(interacoes),
+        'total_visualizacoes': tipos['view_start'],
+        'tempo_total_consumo': sum(i.duracao for i in interacoes if i.tipo == 'view_start'),
+        'total_engajamento': tipos['like'] + tipos['share'] + tipos['comment'],
+        'total_comentarios': tipos['comment'],
+        'contagens_por_tipo': dict(tipos),
+    }
+
+
+def _metricas(entidade):
+    return {m: getattr(entidade, m) for m in ('total_interacoes', 'total_visualizacoes', 'tempo_total_consumo',
+                                              'total_engajamento', 'total_comentarios', 'contagens_por_tipo')}
+
+
+def test_contadores_incrementais_iguais_a_recontagem(csv_sintetico):
+    sistema = SistemaAnaliseEngajamento()
+    sistema.processar_csv_em_fluxo(csv_sintetico)
+    entidades = (list(sistema.iterar_conteudos()) + list(sistema.iterar_usuarios())
+                 + sistema.gerar_ranking_plataformas_por_engajamento())
+    for entidade in entidades:
+        assert _metricas(entidade) == _recontar(entidade._interacoes)
+    for conteudo in sistema.iterar_conteudos():
+        esperados = [i.comentario for i in conteudo._interacoes if i.tipo == 'comment' and i.comentario]
+        assert conteudo.listar_comentarios() == esperados
+
+
+def test_contadores_sem_lista_de_interacoes(csv_sintetico, estado):
+    com_lista = SistemaAnaliseEngajamento()
+    com_lista.processar_csv_em_fluxo(csv_sintetico)
+    sem_lista = SistemaAnaliseEngajamento(guardar_interacoes=False)
+    sem_lista.processar_csv_em_fluxo(csv_sintetico)
+    assert estado(sem_lista) == estado(com_lista)
+    assert all(c._interacoes is None and c.listar_comentarios() == [] for c in sem_lista.iterar_conteudos())
+
+
+def test_mesclar_metricas_soma_contadores():
+    usuario, plat = Usuario(1), Plataforma('G1')
+    a, b = Video(5, 'V'), Video(5, 'V')
+    for destino, tipo, duracao in ((a, 'view_start', 30), (a, 'like', 0), (b, 'comment', 0), (b, 'view_start', 12)):
+        destino.registrar_interacao(Interacao(usuario, destino, plat, tipo, duracao, 'oi'))
+    a.mesclar_metricas(b)
+    assert _metricas(a) == _recontar(a._interacoes)
+    assert a.listar_comentarios() == ['oi']
+    assert a.calcular_total_interacoes_engajamento() == 2
+    assert a.calcular_media_tempo_consumo() == 21
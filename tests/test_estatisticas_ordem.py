@@ -0,0 +1,78 @@
+import random
+from bisect import bisect_left, bisect_right
+
+import pytest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.arvore_avl import ArvoreAVL
+from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+from estruturas_dados.registro_hash import RegistroHash
+
+ESTRUTURAS = [ArvoreBinariaBusca, ArvoreAVL, RegistroHash]
+
+
+def _conferir(arvore, chaves, rnd):
+    # rank/select/contar_intervalo/intervalo contra a lista ordenada de chaves.
+    assert len(arvore) == len(chaves)
+    for posicao, chave in enumerate(chaves):
+        assert arvore.select(posicao) == (chave, f'v{chave}')
+    for _ in range(200):
+        a, b = sorted(rnd.randrange(-10, 2010) for _ in range(2))
+        assert arvore.rank(a) == bisect_left(chaves, a)
+        assert arvore.contar_intervalo(a, b) == bisect_right(chaves, b) - bisect_left(chaves, a)
+        if a < b:
+            assert arvore.contar_intervalo(b, a) == 0
+        assert [k for k, _ in arvore.intervalo(a, b)] == chaves[bisect_left(chaves, a):bisect_right(chaves, b)]
+    assert [k for k, _ in arvore.intervalo()] == chaves
+    for fora in (-1, len(chaves)):
+        with pytest.raises(IndexError):
+            arvore.select(fora)
+
+
+@pytest.mark.parametrize('classe', ESTRUTURAS)
+def test_ordem_apos_insercoes_e_remocoes(classe):
+    rnd = random.Random(11)
+    arvore = classe()
+    chaves = set()
+    for _ in range(3):
+        for chave in rnd.sample(range(2000), 600):
+            arvore.inserir(chave, f'v{chave}')
+            chaves.add(chave)
+        for chave in rnd.sample(sorted(chaves), 250):
+            arvore.remover(chave)
+            chaves.discard(chave)
+        _conferir(arvore, sorted(chaves), rnd)
+
+
+@pytest.mark.parametrize('classe', ESTRUTURAS)
+def test_carregar_ordenados(classe):
+    rnd = random.Random(12)
+    chaves = sorted(rnd.sample(range(2000), 1500))
+    arvore = classe()
+    arvore.inserir(5000, 'descartado')
+    arvore.carregar_ordenados((k, f'v{k}') for k in chaves)
+    _conferir(arvore, chaves, rnd)
+    if hasattr(arvore, 'altura'):
+        assert arvore.altura() == len(chaves).bit_length()
+    # A árvore carregada continua aceitando inserções e remoções.
+    arvore.inserir(2500, 'v2500')
+    arvore.remover(chaves[0])
+    _conferir(arvore, chaves[1:] + [2500], rnd)
+    for pares in ([(1, 'a'), (1, 'b')], [(2, 'a'), (1, 'b')]):
+        with pytest.raises(ValueError):
+            classe().carregar_ordenados(pares)
+
+
+@pytest.mark.parametrize('classe', ESTRUTURAS)
+def test_paginas_e_iteracao_do_sistema(classe, csv_sintetico):
+    sistema = SistemaAnaliseEngajamento(classe_arvore=classe)
+    sistema.processar_csv_em_fluxo(csv_sintetico)
+    ids = [u.id for u in sistema.iterar_usuarios()]
+    assert ids == sorted(ids)
+    paginas = [u.id for p in range(len(ids) // 7 + 1) for u in sistema.pagina_usuarios(p, 7)]
+    assert paginas == ids
+    assert sistema.pagina_conteudos(1000) == []
+    assert [c.id for c in sistema.iterar_conteudos(10, 20)] == \
+        [c.id for c in sistema.iterar_conteudos() if 10 <= c.id <= 20]
+    with pytest.raises(ValueError):
+        sistema.pagina_conteudos(-1)
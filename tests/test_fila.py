@@ -0,0 +1,75 @@
+import gc
+import os
+import random
+from collections import deque
+
+import pytest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.fila import Fila
+
+
+@pytest.mark.parametrize('limite', [None, 4, 16, 101])
+def test_fila_igual_a_deque(limite, tmp_path):
+    rnd = random.Random(limite)
+    fila, modelo = Fila(limite, str(tmp_path)), deque()
+    proximo = 0
+    for _ in range(2000):
+        operacao = rnd.random()
+        if operacao < 0.35:
+            fila.enfileirar(proximo)
+            modelo.append(proximo)
+            proximo += 1
+        elif operacao < 0.6:
+            lote = list(range(proximo, proximo + rnd.randrange(40)))
+            fila.enfileirar_lote(lote)
+            modelo.extend(lote)
+            proximo += len(lote)
+        elif operacao < 0.8:
+            if modelo:
+                assert fila.desenfileirar() == modelo.popleft()
+            else:
+                with pytest.raises(IndexError):
+                    fila.desenfileirar()
+        else:
+            maximo = rnd.randrange(1, 50)
+            assert fila.desenfileirar_lote(maximo) == [modelo.popleft() for _ in range(min(maximo, len(modelo)))]
+        assert len(fila) == len(modelo)
+        assert fila.esta_vazia() == (not modelo)
+        # Em memória ficam no máximo `limite` itens; o resto está nos segmentos do diretório.
+        if limite is not None:
+            assert len(fila) - fila.em_disco() <= limite
+        assert len(os.listdir(tmp_path)) == len(fila._segmentos)
+    if limite is not None and limite < 101:
+        assert fila.segmentos_gravados > 0
+    assert fila.desenfileirar_lote(len(modelo) + 1) == list(modelo)
+    assert os.listdir(tmp_path) == [] and fila.em_disco() == 0
+
+
+def test_limpar_e_coleta_removem_os_segmentos(tmp_path):
+    fila = Fila(4, str(tmp_path))
+    fila.enfileirar_lote(range(50))
+    assert fila.em_disco() > 0 and os.listdir(tmp_path)
+    fila.limpar()
+    assert fila.esta_vazia() and len(fila) == 0 and os.listdir(tmp_path) == []
+    fila.enfileirar_lote(range(50))
+    assert fila.desenfileirar_lote(3) == [0, 1, 2]
+    del fila
+    gc.collect()
+    assert os.listdir(tmp_path) == []
+    with pytest.raises(ValueError):
+        Fila(1)
+
+
+def test_sistema_com_fila_em_disco(csv_sintetico, tmp_path, estado):
+    segmentos = tmp_path / 'segmentos'
+    segmentos.mkdir()
+    em_disco = SistemaAnaliseEngajamento(limite_memoria_fila=64, diretorio_fila=str(segmentos))
+    em_disco.carregar_interacoes_csv(csv_sintetico)
+    fila = em_disco.obter_fila_interacoes()
+    assert len(fila) == 3000 and fila.em_disco() > 0
+    em_disco.processar_interacoes_da_fila()
+    assert os.listdir(segmentos) == []
+    memoria = SistemaAnaliseEngajamento()
+    memoria.processar_csv_em_fluxo(csv_sintetico)
+    assert estado(em_disco) == estado(memoria)
@@ -0,0 +1,49 @@
+from collections import Counter
+
+import pytest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from benchmarks.gerador import GeradorInteracoes
+from benchmarks.suite import comparar
+
+
+def test_mesma_seed_mesmo_csv():
+    assert GeradorInteracoes(seed=1, conteudos=50).texto_csv(2000) == \
+        GeradorInteracoes(seed=1, conteudos=50).texto_csv(2000)
+    assert GeradorInteracoes(seed=1, conteudos=50).texto_csv(2000) != \
+        GeradorInteracoes(seed=2, conteudos=50).texto_csv(2000)
+
+
+def test_csv_ingerido_igual_aos_eventos(gerador, csv_sintetico, estado):
+    direto = SistemaAnaliseEngajamento()
+    for evento in gerador.eventos(3000):
+        direto._registrar(*evento)
+    lido = SistemaAnaliseEngajamento()
+    lido.processar_csv_em_fluxo(csv_sintetico)
+    assert lido.resumo_ingestao()['registradas'] == 3000
+    assert estado(lido) == estado(direto)
+
+
+def test_mistura_popularidade_e_ids_ordenados():
+    gerador = GeradorInteracoes(seed=3, conteudos=100, usuarios=500, ids_ordenados=True,
+                                mistura={'view_start': 3, 'like': 1})
+    eventos = list(gerador.eventos(20_000))
+    tipos = Counter(tipo for _, _, _, _, tipo, _, _, _ in eventos)
+    assert tipos.keys() == {'view_start', 'like'}
+    assert abs(tipos['view_start'] / len(eventos) - 0.75) < 0.02
+    # Zipf: o conteúdo 1 é o mais popular e os IDs aparecem pela primeira vez em ordem.
+    assert Counter(e[0] for e in eventos).most_common(1)[0][0] == 1
+    usuarios = [e[2] for e in eventos]
+    assert usuarios == sorted(usuarios)
+    assert [e[7] for e in eventos] == sorted(e[7] for e in eventos)
+    with pytest.raises(ValueError):
+        GeradorInteracoes(conteudos=0)
+
+
+def test_comparar_aponta_regressoes():
+    def resultado(linhas_por_s, segundos):
+        return {'execucoes': [{'linhas': 1000, 'estruturas': {'AVL': {
+            'ingestao': {'linhas_por_s': linhas_por_s, 'segundos': segundos}}}}]}
+    regressoes = comparar(resultado(800, 1.0), resultado(1000, 1.0), 0.1)
+    assert [chave for chave, *_ in regressoes] == [(1000, 'AVL', 'ingestao.linhas_por_s')]
+    assert comparar(resultado(1000, 1.05), resultado(1000, 1.0), 0.1) == []
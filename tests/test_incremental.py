@@ -0,0 +1,86 @@
+from analise.sistema import SistemaAnaliseEngajamento
+
+CABECALHO = ('id_conteudo,nome_conteudo,id_usuario,timestamp_interacao,plataforma,'
+             'tipo_interacao,watch_duration_seconds,comment_text\r\n')
+
+
+def _texto_e_linhas(csv_sintetico):
+    with open(csv_sintetico, newline='', encoding='utf-8') as arquivo:
+        texto = arquivo.read()
+    return texto, texto.split('\r\n')[1:-1]
+
+
+def test_anexos_sucessivos_igualam_a_serial(tmp_path, csv_sintetico, estado):
+    texto, linhas = _texto_e_linhas(csv_sintetico)
+    caminho = tmp_path / 'crescendo.csv'
+    caminho.write_text(CABECALHO, encoding='utf-8', newline='')
+    sistema = SistemaAnaliseEngajamento()
+    modos = []
+    for inicio in range(0, len(linhas), 700):
+        with open(caminho, 'a', newline='', encoding='utf-8') as arquivo:
+            arquivo.write(''.join(linha + '\r\n' for linha in linhas[inicio:inicio + 700]))
+        resumo = sistema.processar_csv_incremental(str(caminho), tamanho_lote=64)
+        modos.append((resumo['modo'], resumo['linhas_novas']))
+    assert modos[0] == ('completo', 700)
+    assert all(modo == 'incremental' for modo, _ in modos[1:])
+    assert sum(novas for _, novas in modos) == len(linhas)
+    assert sistema.processar_csv_incremental(str(caminho))['linhas_novas'] == 0
+
+    serial = SistemaAnaliseEngajamento()
+    serial.processar_csv_em_fluxo(csv_sintetico)
+    assert estado(sistema) == estado(serial)
+    checkpoint = sistema.obter_checkpoint(str(caminho))
+    assert checkpoint['offset'] == len(texto.encode('utf-8')) and checkpoint['linhas'] == len(linhas)
+
+
+def test_registro_incompleto_espera_o_restante(tmp_path):
+    caminho = tmp_path / 'parcial.csv'
+    sistema = SistemaAnaliseEngajamento()
+    caminho.write_text(CABECALHO[:20], encoding='utf-8', newline='')
+    assert sistema.processar_csv_incremental(str(caminho))['modo'] == 'sem_dados'
+
+    partes = [CABECALHO[20:] + '1,Jornal,10,2024-10-20 10:00:00,G1,view_start,60,\r\n2,Nov',
+              'ela,11,2024-10-20 10:01:00,G1,comment,,"primeira\r\n',
+              'segunda"\r\n']
+    novas = []
+    for parte in partes:
+        with open(caminho, 'a', newline='', encoding='utf-8') as arquivo:
+            arquivo.write(parte)
+        novas.append(sistema.processar_csv_incremental(str(caminho))['linhas_novas'])
+    assert novas == [1, 0, 1]
+    conteudo = sistema._arvore_conteudos.buscar(2)
+    assert conteudo.nome == 'Novela' and conteudo.listar_comentarios() == ['primeira\r\nsegunda']
+
+
+def test_truncamento_e_rotacao_recarregam_sem_contar_duas_vezes(tmp_path):
+    caminho = tmp_path / 'rotacionado.csv'
+    linha = '{0},Conteudo {0},10,2024-10-20 10:00:00,G1,like,,\r\n'
+    caminho.write_text(CABECALHO + ''.join(linha.format(i) for i in range(1, 6)), encoding='utf-8', newline='')
+    sistema = SistemaAnaliseEngajamento()
+    sistema.processar_csv_incremental(str(caminho))
+
+    # Truncado: menor que o offset.
+    caminho.write_text(CABECALHO + linha.format(7), encoding='utf-8', newline='')
+    resumo = sistema.processar_csv_incremental(str(caminho))
+    assert resumo['modo'] == 'recarga' and resumo['registradas'] == 1
+    assert [c.id for c in sistema.iterar_conteudos()] == [7]
+
+    # Rotacionado: maior que o offset, mas com outros bytes antes dele.
+    caminho.write_text(CABECALHO + linha.format(8) + linha.format(9), encoding='utf-8', newline='')
+    resumo = sistema.processar_csv_incremental(str(caminho))
+    assert resumo['modo'] == 'recarga' and resumo['registradas'] == 2
+
+    # Cabeçalho diferente.
+    caminho.write_text(CABECALHO.replace('comment_text', 'comentario') + linha.format(8) + linha.format(9),
+                       encoding='utf-8', newline='')
+    assert sistema.processar_csv_incremental(str(caminho))['modo'] == 'recarga'
+
+
+def test_checkpoint_devolvido_e_copia(tmp_path):
+    caminho = tmp_path / 'a.csv'
+    caminho.write_text(CABECALHO + '1,C,10,,G1,like,,\r\n', encoding='utf-8', newline='')
+    sistema = SistemaAnaliseEngajamento()
+    assert sistema.obter_checkpoint(str(caminho)) is None
+    sistema.processar_csv_incremental(str(caminho))
+    sistema.obter_checkpoint(str(caminho))['offset'] = 0
+    assert sistema.processar_csv_incremental(str(caminho))['modo'] == 'incremental'
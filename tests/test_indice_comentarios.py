@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from analise.indice_comentarios import IndiceComentarios, tokenizar
+from analise.sistema import SistemaAnaliseEngajamento
+from benchmarks.gerador import COMENTARIOS
+
+PALAVRAS = ('gol', 'jogo', 'final', 'ótimo', 'episódio', 'análise', 'ação', 'novela', 'x', 'de', 'muito')
+
+
+def _comentarios(seed=3, n=3000):
+    rnd = random.Random(seed)
+    return [(rnd.randrange(1, 80), rnd.randrange(1, 400),
+             ' '.join(rnd.choices(PALAVRAS, k=rnd.randint(1, 5))).capitalize() + '!')
+            for _ in range(n)]
+
+
+def _esperado(comentarios, consulta):
+    # Conteúdos que mencionam cada termo da consulta em algum comentário.
+    termos = set(tokenizar(consulta))
+    if not termos:
+        return []
+    por_termo = {t: {c for c, _, texto in comentarios if t in tokenizar(texto)} for t in termos}
+    return sorted(set.intersection(*por_termo.values()))
+
+
+def _indice(comentarios, **limites):
+    indice = IndiceComentarios(**limites)
+    for c, u, texto in comentarios:
+        indice.registrar(c, u, texto)
+    return indice
+
+
+CONSULTAS = ('gol', 'Ótimo episódio', 'ANALISE acao', 'novela final jogo', 'de muito x', 'inexistente')
+
+
+def test_tokenizar_normaliza_e_descarta_stopwords():
+    assert tokenizar('Ótimo episódio, "recomendo"') == ['otimo', 'episodio', 'recomendo']
+    assert tokenizar('Não gostei do final!') == ['gostei', 'final']
+    assert tokenizar('a x de é') == []
+
+
+@pytest.mark.parametrize('limites', [{}, {'limite_postings': 30}, {'limite_postings_total': 500}])
+def test_busca_igual_a_forca_bruta(limites):
+    comentarios = _comentarios()
+    indice = _indice(comentarios, **limites)
+    for consulta in CONSULTAS:
+        assert indice.conteudos(consulta) == _esperado(comentarios, consulta)
+    if limites:
+        # Os limites saturam termos sem mudar o resultado da busca.
+        assert indice.saturado('gol')
+        assert len(indice.pares('gol')) <= limites.get('limite_postings', 500)
+    else:
+        assert indice.pares('gol') == [(c, u) for c, u, texto in comentarios if 'gol' in tokenizar(texto)]
+
+
+def test_termos_frequentes_contam_ocorrencias():
+    comentarios = _comentarios()
+    indice = _indice(comentarios)
+    contagem = {}
+    for c, _, texto in comentarios:
+        if c == 5:
+            for termo in tokenizar(texto):
+                contagem[termo] = contagem.get(termo, 0) + 1
+    esperado = sorted(contagem.items(), key=lambda item: (-item[1], item[0]))
+    assert indice.termos_frequentes(5, 3) == esperado[:3]
+    assert indice.termos_frequentes(999) == []
+
+
+def test_limites_de_vocabulario_e_de_termos_por_conteudo():
+    indice = _indice([(1, 1, 'gol jogo'), (1, 2, 'novela final'), (2, 3, 'novela gol')],
+                     limite_vocabulario=3, limite_termos_conteudo=2)
+    assert len(indice) == 3
+    assert indice.termos_ignorados == 1
+    assert indice.conteudos('final') == []
+    # 'novela' chegou depois dos dois termos do conteúdo 1: fica na busca, mas não nos frequentes.
+    assert indice.conteudos('novela') == [1, 2]
+    assert indice.termos_frequentes(1) == [('gol', 1), ('jogo', 1)]
+    with pytest.raises(ValueError):
+        IndiceComentarios(limite_postings=0)
+
+
+@pytest.mark.parametrize('limites', [{}, {'limite_postings': 30}])
+def test_mesclar_igual_a_indice_unico(limites):
+    comentarios = _comentarios()
+    unico = _indice(comentarios, **limites)
+    mesclado = _indice(comentarios[:1200], **limites)
+    mesclado.mesclar(_indice(comentarios[1200:], **limites))
+    for consulta in CONSULTAS:
+        assert mesclado.conteudos(consulta) == unico.conteudos(consulta)
+    assert mesclado.pares('jogo') == unico.pares('jogo')
+    assert mesclado.termos_frequentes(7) == unico.termos_frequentes(7)
+    assert mesclado.comentarios == unico.comentarios
+
+
+def test_exportar_importar():
+    indice = _indice(_comentarios(), limite_postings=30)
+    copia = IndiceComentarios.importar(indice.exportar())
+    assert copia.exportar() == indice.exportar()
+    assert copia.conteudos('gol final') == indice.conteudos('gol final')
+
+
+def test_sistema_busca_nos_comentarios_do_csv(csv_sintetico):
+    sistema = SistemaAnaliseEngajamento(indexar_comentarios=True)
+    sistema.processar_csv_em_fluxo(csv_sintetico)
+    comentarios = [(c.id, None, i.comentario) for c in sistema.iterar_conteudos()
+                   for i in c._interacoes if i.tipo == 'comment' and i.comentario]
+    for consulta in [COMENTARIOS[2], 'gostei final', 'análise']:
+        assert [c.id for c in sistema.buscar_conteudos_por_comentario(consulta)] == \
+            _esperado(comentarios, consulta)
+    with pytest.raises(ValueError):
+        SistemaAnaliseEngajamento().termos_frequentes(1)
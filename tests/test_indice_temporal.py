@@ -0,0 +1,107 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from analise.indice_temporal import converter_timestamp, converter_timestamps, para_epoca
+from analise.sistema import SistemaAnaliseEngajamento
+
+HORA = 3600
+
+
+@pytest.fixture
+def csv_fora_de_ordem(tmp_path, csv_sintetico):
+    # Mesmo CSV com as linhas embaralhadas: muitos eventos chegam atrasados.
+    with open(csv_sintetico, newline='', encoding='utf-8') as arquivo:
+        cabecalho, *linhas = arquivo.read().split('\r\n')[:-1]
+    random.Random(5).shuffle(linhas)
+    caminho = tmp_path / 'embaralhado.csv'
+    caminho.write_text('\r\n'.join([cabecalho] + linhas) + '\r\n', encoding='utf-8', newline='')
+    return str(caminho)
+
+
+def _recontar(interacoes, chave, inicio, fim):
+    # Métricas da janela recontadas das interações brutas, como em MetricasJanela.
+    total = {}
+    for i in interacoes:
+        if not inicio <= i.timestamp < fim:
+            continue
+        m = total.setdefault(chave(i), [0.0, 0, 0, 0, 0])
+        m[1] += 1
+        if i.tipo == 'view_start':
+            m[0] += i.duracao
+            m[2] += 1
+        elif i.tipo in ('like', 'share', 'comment'):
+            m[3] += 1
+            m[4] += i.tipo == 'comment'
+    return total
+
+
+def _janela(entidades):
+    return {e.id if e.id is not None else e.nome: [e.tempo_total_consumo, e.total_interacoes,
+                                                   e.total_visualizacoes, e.total_engajamento,
+                                                   e.total_comentarios]
+            for e in entidades}
+
+
+def test_janelas_iguais_a_recontagem(csv_fora_de_ordem):
+    sistema = SistemaAnaliseEngajamento(largura_bucket=HORA, largura_bucket_usuarios=HORA)
+    sistema.processar_csv_em_fluxo(csv_fora_de_ordem)
+    interacoes = [i for c in sistema.iterar_conteudos() for i in c._interacoes]
+    primeiro, ultimo = sistema.intervalo_temporal()
+    assert primeiro % HORA == 0 and ultimo % HORA == 0
+    assert primeiro <= min(i.timestamp for i in interacoes) < max(i.timestamp for i in interacoes) < ultimo
+
+    for inicio, fim in ((primeiro, ultimo), (primeiro + 5 * HORA, primeiro + 30 * HORA),
+                        (primeiro + 40 * HORA, primeiro + 41 * HORA)):
+        assert _janela(sistema.gerar_conteudos_por_total_interacoes(None, inicio, fim)) == \
+            _recontar(interacoes, lambda i: i.conteudo.id, inicio, fim)
+        assert _janela(sistema.gerar_ranking_usuarios_por_tempo(None, inicio, fim)) == \
+            _recontar(interacoes, lambda i: i.usuario.id, inicio, fim)
+        plataformas = _recontar(interacoes, lambda i: i.plataforma.nome, inicio, fim)
+        assert _janela(sistema.gerar_ranking_plataformas_por_engajamento(None, inicio, fim)) == plataformas
+        assert sistema.calcular_tempo_medio_consumo_por_plataforma(inicio, fim) == \
+            {p: m[0] / m[2] if m[2] else 0.0 for p, m in plataformas.items()}
+
+    # A janela inteira coincide com os totais sem janela.
+    tudo = sistema.gerar_conteudos_por_total_interacoes(10, primeiro, ultimo)
+    assert [c.id for c in tudo] == [c.id for c in sistema.gerar_conteudos_por_total_interacoes(10)]
+
+
+def test_janela_alinhada_ao_bucket_e_instantes_em_varios_formatos(tmp_path):
+    caminho = tmp_path / 'a.csv'
+    caminho.write_text(
+        'id_conteudo,nome_conteudo,id_usuario,timestamp_interacao,plataforma,tipo_interacao,'
+        'watch_duration_seconds,comment_text\n'
+        '1,A,10,2024-10-20 10:59:59,G1,like,,\n'
+        '1,A,10,2024-10-20T11:00:00,G1,like,,\n'
+        '2,B,10,2024-10-20 12:30:00,G1,like,,\n'
+        '2,B,10,,G1,like,,\n', encoding='utf-8')
+    sistema = SistemaAnaliseEngajamento(largura_bucket=HORA)
+    sistema.processar_csv_em_fluxo(str(caminho))
+    # O bucket que contém `inicio` entra inteiro; `fim` é exclusivo.
+    [antes_das_11] = sistema.gerar_conteudos_por_total_interacoes(None, '2024-10-20 10:30:00',
+                                                                  '2024-10-20 11:00:00')
+    assert (antes_das_11.id, antes_das_11.total_interacoes) == (1, 1)
+    for inicio, fim in (('2024-10-20 11:00:00', '2024-10-20 13:00:00'),
+                        (datetime(2024, 10, 20, 11), datetime(2024, 10, 20, 13)),
+                        (para_epoca('2024-10-20T11:00:00'), para_epoca('2024-10-20 13:00:00'))):
+        assert {c.id: c.total_interacoes
+                for c in sistema.gerar_conteudos_por_total_interacoes(None, inicio, fim)} == {1: 1, 2: 1}
+    assert sistema.contar_comentarios_por_conteudo('2024-10-21 00:00:00', None) == {}
+    with pytest.raises(ValueError):
+        sistema.gerar_ranking_usuarios_por_tempo(None, '2024-10-20 10:00:00', None)
+    with pytest.raises(ValueError):
+        sistema.gerar_conteudos_por_total_interacoes(None, 'ontem', None)
+    with pytest.raises(ValueError):
+        SistemaAnaliseEngajamento().gerar_conteudos_por_total_interacoes(None, 0, 10)
+
+
+def test_conversao_de_timestamps():
+    textos = ['2024-10-20 10:00:05', '2024-10-20T10:00:05', '2024-10-20X10:00:05',
+              '2024-13-01 10:00:00', '2024-10-20 10:00:61', '', None, '2024-10-20']
+    esperados = [1729418405, 1729418405, None, None, None, None, None, 1729382400]
+    assert [converter_timestamp(t) for t in textos] == esperados
+    assert converter_timestamps(textos) == esperados
+    # Segunda chamada: minutos já memorizados.
+    assert converter_timestamps(textos[:2]) == esperados[:2]
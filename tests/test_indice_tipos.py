@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from analise.indice_tipos import inferir_tipo_conteudo, validar_tipo
+from analise.sistema import SistemaAnaliseEngajamento
+from entidades.conteudo import Artigo, Podcast, Video
+
+NOMES = ('Podcast GE Tabelando', 'Matéria: bastidores da final', 'Novela das nove', 'Episódio 3',
+         'Notícias do dia', 'Jogo completo')
+
+
+def _registros(seed=4, n=2000):
+    rnd = random.Random(seed)
+    tipos = ('view_start', 'like', 'share', 'comment')
+    registros = []
+    for _ in range(n):
+        c = rnd.randrange(1, 40)
+        tipo = rnd.choice(tipos)
+        registros.append((str(c), NOMES[c % len(NOMES)], str(rnd.randrange(1, 200)), '2024-10-20 10:00:00',
+                          'G1', tipo, str(rnd.randint(1, 600)) if tipo == 'view_start' else '',
+                          'ótimo' if tipo == 'comment' else ''))
+    return registros
+
+
+def _totais_recontados(sistema):
+    totais = {}
+    for c in sistema.iterar_conteudos():
+        t = totais.setdefault(c.tipo_conteudo, {'conteudos': 0, 'total_interacoes': 0, 'tempo_total_consumo': 0.0})
+        t['conteudos'] += 1
+        t['total_interacoes'] += c.total_interacoes
+        t['tempo_total_consumo'] += c.tempo_total_consumo
+    return totais
+
+
+def _conferir_totais(sistema):
+    recontados = _totais_recontados(sistema)
+    totais = sistema.totais_por_tipo()
+    for tipo, esperado in recontados.items():
+        assert {k: totais[tipo][k] for k in esperado} == esperado
+    assert all(totais[t]['conteudos'] == 0 for t in totais.keys() - recontados.keys())
+
+
+def test_inferir_e_validar_tipo():
+    assert [inferir_tipo_conteudo(n) for n in NOMES] == \
+        ['podcast', 'artigo', 'video', 'podcast', 'artigo', 'video']
+    assert inferir_tipo_conteudo(None) == 'video'
+    assert validar_tipo(' Vídeo') == 'video' and validar_tipo('PODCAST') == 'podcast'
+    with pytest.raises(ValueError):
+        validar_tipo('live')
+
+
+def test_indice_por_tipo_igual_a_recontagem():
+    sistema = SistemaAnaliseEngajamento(tipos_conteudo={6: 'artigo'})
+    sistema._processar_lote(_registros())
+    classes = {'video': Video, 'podcast': Podcast, 'artigo': Artigo}
+    for tipo, classe in classes.items():
+        esperados = [c for c in sistema.iterar_conteudos() if c.tipo_conteudo == tipo]
+        assert sistema.listar_conteudos_por_tipo(tipo) == esperados
+        assert all(type(c) is classe for c in esperados)
+    # A declaração prevalece sobre o nome ('Jogo completo' seria vídeo).
+    assert sistema._arvore_conteudos.buscar(6).tipo_conteudo == 'artigo'
+    _conferir_totais(sistema)
+
+    ranking = sistema.gerar_ranking_por_tipo('Podcast', 'conteudos_tempo', 3)
+    podcasts = sorted(sistema.listar_conteudos_por_tipo('podcast'), key=lambda c: -c.tempo_total_consumo)
+    assert [c.tempo_total_consumo for c in ranking] == [c.tempo_total_consumo for c in podcasts[:3]]
+    with pytest.raises(ValueError):
+        sistema.gerar_ranking_por_tipo('video', 'usuarios_tempo')
+
+
+def test_declarar_tipo_reclassifica_com_os_totais():
+    sistema = SistemaAnaliseEngajamento()
+    registros = _registros()
+    sistema._processar_lote(registros[:1000])
+    # 2 ('Novela das nove') seria vídeo e 1 ('Matéria: ...') seria artigo.
+    sistema.declarar_tipo_conteudo('2', 'podcast')
+    sistema.declarar_tipo_conteudo(1, 'video')
+    sistema.declarar_tipo_conteudo(999, 'artigo')
+    sistema._processar_lote(registros[1000:])
+    assert isinstance(sistema._arvore_conteudos.buscar(2), Podcast)
+    assert isinstance(sistema._arvore_conteudos.buscar(1), Video)
+    _conferir_totais(sistema)
+    with pytest.raises(ValueError):
+        sistema.declarar_tipo_conteudo('abc', 'video')
+
+
+def test_paralelo_e_snapshot_mantem_os_tipos(tmp_path):
+    caminho = tmp_path / 'tipos.csv'
+    linhas = ['id_conteudo,nome_conteudo,id_usuario,timestamp_interacao,plataforma,'
+              'tipo_interacao,watch_duration_seconds,comment_text']
+    linhas += [','.join(f'"{v}"' for v in registro) for registro in _registros()]
+    caminho.write_text('\n'.join(linhas) + '\n', encoding='utf-8')
+    serial = SistemaAnaliseEngajamento()
+    serial.processar_csv_em_fluxo(str(caminho))
+    paralelo = SistemaAnaliseEngajamento()
+    paralelo.carregar_csv_paralelo(str(caminho), 2)
+    assert paralelo.totais_por_tipo() == serial.totais_por_tipo()
+    serial.salvar_snapshot(str(tmp_path / 'tipos.snapshot'))
+    restaurado = SistemaAnaliseEngajamento.carregar_snapshot(str(tmp_path / 'tipos.snapshot'))
+    assert restaurado.totais_por_tipo() == serial.totais_por_tipo()
+    assert [c.id for c in restaurado.listar_conteudos_por_tipo('artigo')] == \
+        [c.id for c in serial.listar_conteudos_por_tipo('artigo')]
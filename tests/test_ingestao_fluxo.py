@@ -0,0 +1,54 @@
+import pytest
+
+from analise.sistema import SistemaAnaliseEngajamento
+
+CSV = """id_conteudo,nome_conteudo,id_usuario,timestamp_interacao,plataforma,tipo_interacao,watch_duration_seconds,comment_text
+1,Jornal,10,2024-10-20 10:00:00,G1,view_start,60,
+,Sem conteúdo,11,2024-10-20 10:01:00,G1,like,,
+2,Novela,,2024-10-20 10:02:00,G1,like,,
+x,Novela,12,2024-10-20 10:03:00,G1,like,,
+3,Podcast,1.5,2024-10-20 10:04:00,G1,like,,
+4,Esporte,13,2024-10-20 10:05:00,,like,,
+5,,14,2024-10-20 10:06:00,Globoplay,view_start,abc,
+1,Jornal,15,,G1,comment,,Bom
+"""
+
+
+def test_linhas_invalidas_sao_contadas_por_motivo(tmp_path):
+    caminho = tmp_path / 'misto.csv'
+    caminho.write_text(CSV, encoding='utf-8')
+    sistema = SistemaAnaliseEngajamento()
+    resumo = sistema.processar_csv_em_fluxo(str(caminho), tamanho_lote=3, limite_fila=4)
+    assert resumo == {'registradas': 3,
+                      'rejeitadas': {'id_ausente': 2, 'id_invalido': 2, 'plataforma_ausente': 1}}
+    # Nome ausente vira conteudo_<id> e duração inválida vira 0.
+    conteudo = sistema._arvore_conteudos.buscar(5)
+    assert conteudo.nome == 'conteudo_5' and conteudo.tempo_total_consumo == 0
+    assert sistema.contar_comentarios_por_conteudo() == {'Jornal': 1, 'conteudo_5': 0}
+
+
+@pytest.mark.parametrize('tamanho_lote,limite_fila', [(1, 1), (7, 20), (1000, 10000)])
+def test_fluxo_limita_a_fila_e_iguala_a_carga_completa(csv_sintetico, estado, monkeypatch,
+                                                      tamanho_lote, limite_fila):
+    completo = SistemaAnaliseEngajamento()
+    completo.carregar_interacoes_csv(csv_sintetico)
+    completo.processar_interacoes_da_fila()
+
+    sistema = SistemaAnaliseEngajamento()
+    fila = sistema.obter_fila_interacoes()
+    enfileirar_lote, pico = fila.enfileirar_lote, [0]
+
+    def medir(itens):
+        enfileirar_lote(itens)
+        pico[0] = max(pico[0], len(fila))
+
+    monkeypatch.setattr(fila, 'enfileirar_lote', medir)
+    sistema.processar_csv_em_fluxo(csv_sintetico, tamanho_lote, limite_fila)
+    assert pico[0] <= limite_fila + tamanho_lote
+    assert sistema.esta_fila_vazia()
+    assert estado(sistema) == estado(completo)
+
+
+def test_parametros_invalidos(csv_sintetico):
+    with pytest.raises(ValueError):
+        SistemaAnaliseEngajamento().processar_csv_em_fluxo(csv_sintetico, tamanho_lote=0)
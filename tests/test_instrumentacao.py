@@ -0,0 +1,56 @@
+import main
+from analise.instrumentacao import formatar_estatisticas, perfilar
+from analise.sistema import SistemaAnaliseEngajamento
+
+
+def test_medicao_nao_muda_o_resultado(csv_sintetico, estado):
+    medido = SistemaAnaliseEngajamento(instrumentar=True)
+    medido.processar_csv_em_fluxo(csv_sintetico)
+    simples = SistemaAnaliseEngajamento()
+    simples.processar_csv_em_fluxo(csv_sintetico)
+    assert estado(medido) == estado(simples)
+
+    medicoes = medido.estatisticas()['instrumentacao']
+    resumo = medido.resumo_ingestao()
+    assert medicoes['contadores']['linhas_lidas'] == 3000
+    assert medicoes['contadores']['linhas_registradas'] == resumo['registradas']
+    assert medicoes['contadores']['conteudos_criados'] == len(medido._arvore_conteudos)
+    assert {'leitura_csv', 'normalizacao', 'registro', 'busca_conteudo'} <= medicoes['tempos'].keys()
+    assert 'instrumentacao' not in simples.estatisticas()
+
+
+def test_relatorios_medidos_e_acertos_de_cache(csv_sintetico):
+    sistema = SistemaAnaliseEngajamento()
+    sistema.processar_csv_em_fluxo(csv_sintetico)
+    assert "instrumentação desligada" in formatar_estatisticas(sistema.estatisticas())
+    sistema.ativar_instrumentacao()
+    sistema.gerar_top_conteudos_por_tempo(5)
+    sistema.gerar_top_conteudos_por_tempo(5)
+    medicoes = sistema.estatisticas()['instrumentacao']
+    assert sum(t['chamadas'] for nome, t in medicoes['tempos'].items() if nome.startswith('relatorio.')) == 1
+    assert medicoes['contadores']['cache_acertos'] == 1
+    sistema.desativar_instrumentacao()
+    assert 'instrumentacao' not in sistema.estatisticas()
+
+
+def test_perfilar_grava_o_perfil(csv_sintetico, tmp_path):
+    destino = tmp_path / 'carga.prof'
+    with perfilar(str(destino)) as perfil:
+        SistemaAnaliseEngajamento().processar_csv_em_fluxo(csv_sintetico)
+    assert destino.stat().st_size > 0
+    assert 'processar_csv_em_fluxo' in perfil.resumo()
+
+
+def test_main_so_instrumenta_com_a_opcao(csv_sintetico, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(main, 'CAMINHO_CSV', csv_sintetico)
+    monkeypatch.setattr(main, 'CAMINHO_SNAPSHOT', str(tmp_path / 'interacoes.snapshot'))
+    assert main.carregar_sistema(instrumentar=True)._instrumentacao is not None
+    sistema = main.carregar_sistema()
+    assert sistema._instrumentacao is None
+
+    # Sem --instrumentar, a opção 7 avisa e liga a medição dos relatórios seguintes.
+    respostas = iter(['7', '0'])
+    monkeypatch.setattr('builtins.input', lambda _: next(respostas))
+    main.menu_principal(sistema)
+    assert '--instrumentar' in capsys.readouterr().out
+    assert sistema._instrumentacao is not None
@@ -0,0 +1,42 @@
+import pytest
+
+import entidades.interacao as modulo_interacao
+from analise.sistema import SistemaAnaliseEngajamento
+from entidades.conteudo import Artigo, Conteudo, Podcast, Video
+from entidades.interacao import Interacao, compartilhar_comentario
+from entidades.plataforma import Plataforma
+from entidades.usuario import Usuario
+
+
+@pytest.mark.parametrize('entidade', [Usuario(1), Plataforma('G1'), Conteudo(1), Video(1), Podcast(1), Artigo(1),
+                                      Interacao(None, None, None, 'like')])
+def test_entidades_sem_dict(entidade):
+    assert not hasattr(entidade, '__dict__')
+
+
+def test_campos_normalizados_e_compartilhados():
+    usuario, conteudo, plat = Usuario(1), Video(2), Plataforma('G1')
+    a = Interacao(usuario, conteudo, plat, ''.join(['com', 'ment']), 35, ''.join(['Muito ', 'bom']))
+    b = Interacao(usuario, conteudo, plat, 'comment', 0, ''.join(['Muito ', 'bo', 'm']))
+    assert a.tipo is b.tipo
+    assert a.comentario is b.comentario
+    assert a.duracao == 0
+    assert Interacao(usuario, conteudo, plat, 'view_start', 35).duracao == 35
+    assert Interacao(usuario, conteudo, plat, 'comment', 0, '').comentario is None
+
+
+def test_pool_limitado_e_esvaziado_ao_reiniciar(monkeypatch):
+    monkeypatch.setattr(modulo_interacao, 'LIMITE_POOL_COMENTARIOS', 3)
+    SistemaAnaliseEngajamento()
+    for i in range(10):
+        compartilhar_comentario(f'texto {i}')
+    assert len(modulo_interacao._pool_comentarios) == 3
+    # Textos fora do pool continuam sendo devolvidos, só não são compartilhados.
+    assert compartilhar_comentario('texto 9') == 'texto 9'
+
+    sistema = SistemaAnaliseEngajamento()
+    assert not modulo_interacao._pool_comentarios
+    sistema._registrar(1, 'C', 2, 'G1', 'comment', 0, 'oi')
+    assert modulo_interacao._pool_comentarios == {'oi': 'oi'}
+    sistema._reiniciar_estado()
+    assert not modulo_interacao._pool_comentarios
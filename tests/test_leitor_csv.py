@@ -0,0 +1,90 @@
+import csv
+
+import pytest
+
+from analise.leitor_csv import COLUNAS, ler_lotes, ler_registros
+from analise.sistema import LinhaInvalida, normalizar_lote, normalizar_registro
+
+CABECALHO = ','.join(COLUNAS)
+
+LINHAS = [
+    '1,Jornal Nacional,10,2024-10-20 20:00:00,TV Globo,view_start,1800,',
+    '2,Podcast X,11,2024-10-20 20:01:00,Spotify,comment,,"Adorei, de verdade"',
+    '3,"Novela, capítulo 1",12,2024-10-20 20:02:00,Globoplay,comment,,"primeira linha\nsegunda linha"',
+    '4,GE,13,2024-10-20 20:03:00,GE Globo,comment,,"aspas ""duplas"" e\r\nCRLF dentro"',
+    '5,Curta,14',
+    '',
+    '6,G1,15,2024-10-20 20:04:00,G1,like,,',
+    '7,"Várias\n\nlinhas",16,2024-10-20 20:05:00,G1,comment,,"a\nb\nc, d"',
+]
+
+
+def _dictreader(caminho):
+    with open(caminho, newline='', encoding='utf-8') as arquivo:
+        return [tuple(linha.get(c) for c in COLUNAS) for linha in csv.DictReader(arquivo)]
+
+
+def _escrever(tmp_path, terminador, cabecalho=CABECALHO, final=True):
+    caminho = tmp_path / 'entrada.csv'
+    texto = terminador.join([cabecalho] + LINHAS)
+    caminho.write_bytes((texto + (terminador if final else '')).encode('utf-8'))
+    return str(caminho)
+
+
+@pytest.mark.parametrize('terminador', ['\n', '\r\n'])
+@pytest.mark.parametrize('tamanho_bloco', [1, 7, 64, 1 << 16])
+@pytest.mark.parametrize('final', [True, False])
+def test_leitor_iguala_dictreader(tmp_path, terminador, tamanho_bloco, final):
+    caminho = _escrever(tmp_path, terminador, final=final)
+    esperado = _dictreader(caminho)
+    assert len(esperado) == 7
+    assert list(ler_registros(caminho, tamanho_bloco)) == esperado
+
+
+def test_leitor_com_colunas_fora_de_ordem_e_ausentes(tmp_path):
+    caminho = tmp_path / 'entrada.csv'
+    caminho.write_text('plataforma,id_usuario,extra,id_conteudo\r\n'
+                       'G1,10,x,1\r\nGloboplay,"11",y,"2"\r\nSpotify\r\n', encoding='utf-8', newline='')
+    assert list(ler_registros(str(caminho), 5)) == _dictreader(str(caminho))
+
+
+def test_leitor_iguala_dictreader_em_csv_sintetico(csv_sintetico):
+    registros = [r for lote in ler_lotes(csv_sintetico, 4096) for r in lote]
+    assert registros == _dictreader(csv_sintetico)
+
+
+def test_arquivo_so_com_cabecalho_ou_vazio(tmp_path):
+    caminho = tmp_path / 'vazio.csv'
+    for texto in ('', CABECALHO + '\r\n', CABECALHO):
+        caminho.write_text(texto, encoding='utf-8', newline='')
+        assert list(ler_registros(str(caminho))) == []
+
+
+@pytest.mark.parametrize('tamanho_bloco', [3, 64, 1 << 16])
+def test_leitor_com_terminadores_misturados(tmp_path, tamanho_bloco):
+    caminho = tmp_path / 'misturado.csv'
+    texto = CABECALHO + '\r\n' + ''.join(linha + ('\r\n' if i % 2 else '\n') for i, linha in enumerate(LINHAS))
+    caminho.write_bytes(texto.encode('utf-8'))
+    assert list(ler_registros(str(caminho), tamanho_bloco)) == _dictreader(str(caminho))
+
+
+def test_normalizar_lote_iguala_normalizacao_por_linha(csv_sintetico):
+    for lote in ler_lotes(csv_sintetico, 4096):
+        assert normalizar_lote(lote) == ([normalizar_registro(*r) for r in lote], [])
+
+
+def test_normalizar_lote_com_invalidos_mantem_ordem_e_motivos():
+    lote = [
+        ('1', 'A', '10', '2024-10-20 10:00:00', 'G1', 'view_start', '30', ''),
+        ('', 'B', '11', '2024-10-20 10:00:01', 'G1', 'like', '', ''),
+        ('3', None, '12', 'quando?', 'G1', 'view_start', 'abc', None),
+        ('4', 'D', 'x', '2024-10-20 10:00:02', 'G1', 'like', '', ''),
+        ('5', 'E', '13', '2024-10-20 10:00:03', '', 'like', '', ''),
+    ]
+    validos, motivos = normalizar_lote(lote)
+    assert validos == [(1, 'A', 10, 'G1', 'view_start', 30.0, '', 1729418400),
+                       (3, 'conteudo_3', 12, 'G1', 'view_start', 0.0, None, None)]
+    assert motivos == ['id_ausente', 'id_invalido', 'plataforma_ausente']
+    for registro in lote[1:2] + lote[3:]:
+        with pytest.raises(LinhaInvalida):
+            normalizar_registro(*registro)
@@ -0,0 +1,71 @@
+import csv
+
+import pytest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.arvore_avl import ArvoreAVL
+
+OPCOES = dict(classe_arvore=ArvoreAVL, tamanho_placar=10, largura_bucket=3600,
+              largura_bucket_usuarios=3600, indexar_comentarios=True, coengajamento=True)
+
+
+@pytest.fixture
+def csv_com_aspas(tmp_path, gerador):
+    # CSV sintético com comentários de várias linhas espalhados, para cortes de fatia entre aspas.
+    # Com 20 mil linhas sobre 60 conteúdos e 300 usuários, as listas de interações
+    # das entidades são longas o bastante para estourar a recursão se fossem serializadas.
+    caminho = str(tmp_path / 'aspas.csv')
+    linhas = list(gerador.linhas(20000))
+    for i in range(0, len(linhas), 97):
+        linhas[i][5], linhas[i][6] = 'comment', ''
+        linhas[i][7] = f'linha {i}\nsegue, "entre aspas"\r\nfim'
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(['id_conteudo', 'nome_conteudo', 'id_usuario', 'timestamp_interacao',
+                           'plataforma', 'tipo_interacao', 'watch_duration_seconds', 'comment_text'])
+        escritor.writerows(linhas)
+    return caminho
+
+
+def _interacoes(sistema):
+    # Interações de cada conteúdo, e se todas apontam para as entidades do próprio sistema.
+    usuarios = {u.id: u for u in sistema.iterar_usuarios()}
+    plataformas = {p.nome: p for p in sistema.gerar_ranking_plataformas_por_engajamento()}
+    resultado = []
+    for conteudo in sistema.iterar_conteudos():
+        for i in conteudo._interacoes:
+            assert i.conteudo is conteudo
+            assert i.usuario is usuarios[i.usuario.id]
+            assert i.plataforma is plataformas[i.plataforma.nome]
+            resultado.append((conteudo.id, i.usuario.id, i.plataforma.nome, i.tipo, i.duracao,
+                              i.comentario, i.timestamp))
+    return resultado
+
+
+@pytest.mark.parametrize('processos', [1, 3])
+def test_paralelo_iguala_serial(csv_com_aspas, estado, processos):
+    serial = SistemaAnaliseEngajamento(guardar_interacoes=False, **OPCOES)
+    serial.processar_csv_em_fluxo(csv_com_aspas)
+    paralelo = SistemaAnaliseEngajamento(guardar_interacoes=False, **OPCOES)
+    paralelo.carregar_csv_paralelo(csv_com_aspas, processos)
+    assert estado(paralelo) == estado(serial)
+
+
+@pytest.mark.parametrize('processos', [1, 2, 3])
+def test_paralelo_guarda_interacoes_como_serial(csv_com_aspas, estado, processos):
+    # Opções padrão: guardar_interacoes=True.
+    serial = SistemaAnaliseEngajamento()
+    serial.processar_csv_em_fluxo(csv_com_aspas)
+    paralelo = SistemaAnaliseEngajamento()
+    paralelo.carregar_csv_paralelo(csv_com_aspas, processos)
+
+    assert estado(paralelo) == estado(serial)
+    assert _interacoes(paralelo) == _interacoes(serial)
+    for a, b in zip(paralelo.iterar_conteudos(), serial.iterar_conteudos()):
+        assert a.listar_comentarios() == b.listar_comentarios()
+    for a, b in zip(paralelo.iterar_usuarios(), serial.iterar_usuarios()):
+        assert [i.conteudo.id for i in a._interacoes] == [i.conteudo.id for i in b._interacoes]
+    for a, b in zip(paralelo.gerar_ranking_plataformas_por_engajamento(),
+                    serial.gerar_ranking_plataformas_por_engajamento()):
+        assert [(i.usuario.id, i.timestamp) for i in a._interacoes] == \
+            [(i.usuario.id, i.timestamp) for i in b._interacoes]
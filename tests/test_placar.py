@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from analise.relatorios_lote import METODOS
+from analise.sistema import RANKINGS, SistemaAnaliseEngajamento
+from estruturas_dados.placar import Placar
+
+
+def test_placar_iguala_ordenacao_completa():
+    rnd = random.Random(11)
+    placar, pontuacoes = Placar(10), {}
+    for _ in range(5000):
+        chave = rnd.randrange(300)
+        # Pontuações só crescem, com empates frequentes.
+        pontuacoes[chave] = pontuacoes.get(chave, 0) + rnd.choice((0, 1, 1, 2))
+        placar.atualizar(chave, pontuacoes[chave])
+        esperado = sorted(pontuacoes, key=lambda k: (-pontuacoes[k], k))[:10]
+        assert placar.top() == esperado
+    assert placar.top(3) == esperado[:3]
+    assert len(placar) == 10
+    assert len(placar._heap) <= 2 * placar.capacidade + 16
+
+
+def test_placar_devolve_itens_e_rejeita_capacidade_invalida():
+    placar = Placar(2)
+    for chave, pontos in ((1, 5), (2, 5), (3, 4), (3, 6)):
+        placar.atualizar(chave, pontos, f'item{chave}')
+    assert placar.top() == ['item3', 'item1']
+    with pytest.raises(ValueError):
+        Placar(0)
+
+
+@pytest.mark.parametrize('n', [1, 5, 10, 50, None])
+def test_rankings_com_placar_iguais_aos_sem_placar(csv_sintetico, n):
+    com_placar = SistemaAnaliseEngajamento(tamanho_placar=10)
+    sem_placar = SistemaAnaliseEngajamento()
+    for sistema in (com_placar, sem_placar):
+        sistema.processar_csv_em_fluxo(csv_sintetico)
+    for nome, (dimensao, _) in RANKINGS.items():
+        metodo = METODOS[nome]
+        chave = 'nome' if dimensao == 'plataformas' else 'id'
+        obtido = [getattr(e, chave) for e in getattr(com_placar, metodo)(n)]
+        assert obtido == [getattr(e, chave) for e in getattr(sem_placar, metodo)(n)], nome
+
+
+def test_placares_reconstruidos(csv_sintetico):
+    sistema = SistemaAnaliseEngajamento(tamanho_placar=5)
+    sistema.processar_csv_em_fluxo(csv_sintetico)
+    antes = [u.id for u in sistema.gerar_ranking_usuarios_por_tempo(5)]
+    sistema.reconstruir_placares()
+    assert [u.id for u in sistema.gerar_ranking_usuarios_por_tempo(5)] == antes
@@ -0,0 +1,60 @@
+import random
+
+from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.arvore_avl import ArvoreAVL
+from estruturas_dados.registro_hash import RegistroHash
+
+
+def test_operacoes_aleatorias_iguais_a_avl():
+    rnd = random.Random(2)
+    registro, arvore = RegistroHash(), ArvoreAVL()
+    for passo in range(4000):
+        chave = rnd.randrange(500)
+        if rnd.random() < 0.3:
+            registro.remover(chave)
+            arvore.remover(chave)
+        else:
+            registro.inserir(chave, passo)
+            arvore.inserir(chave, passo)
+        if passo % 100 == 0:
+            # Consultas ordenadas intercaladas com alterações (ordem preguiçosa suja e refeita).
+            assert registro.percurso_em_ordem() == arvore.percurso_em_ordem()
+        assert registro.buscar(chave) == arvore.buscar(chave)
+    assert registro.percurso_em_ordem() == arvore.percurso_em_ordem()
+    assert list(registro.intervalo(100, 200)) == list(arvore.intervalo(100, 200))
+    assert len(registro) == len(arvore)
+
+
+def test_chaves_crescentes_nao_invalidam_a_ordem():
+    registro = RegistroHash()
+    for chave in range(1000):
+        registro.inserir(chave, str(chave))
+        registro.inserir(chave, str(chave))
+    ordenadas = registro._ordenadas
+    assert ordenadas == list(range(1000))
+    registro.inserir(5000, 'x')
+    assert registro._ordenadas is ordenadas
+    registro.inserir(3, 'y')
+    assert registro._ordenadas is ordenadas
+    registro.inserir(2500, 'z')
+    assert registro._ordenadas is None
+    assert [k for k, _ in registro.percurso_em_ordem()][-2:] == [2500, 5000]
+
+
+def test_valores_na_ordem_de_insercao():
+    registro = RegistroHash()
+    for chave in (5, 1, 3):
+        registro.inserir(chave, chave * 10)
+    registro.remover(1)
+    registro.remover(99)
+    assert registro.valores() == [50, 30]
+    assert registro.buscar(1) is None
+
+
+def test_sistema_com_registro_hash_iguala_avl(csv_sintetico, estado):
+    sistemas = []
+    for classe in (ArvoreAVL, RegistroHash):
+        sistema = SistemaAnaliseEngajamento(classe_arvore=classe)
+        sistema.processar_csv_em_fluxo(csv_sintetico)
+        sistemas.append(sistema)
+    assert estado(sistemas[0]) == estado(sistemas[1])
@@ -0,0 +1,63 @@
+import csv
+import json
+import sys
+
+import pytest
+
+from analise.relatorios_lote import RELATORIOS, cabecalho, gerar_relatorios, linhas_relatorio, main
+from analise.sistema import SistemaAnaliseEngajamento
+
+
+@pytest.fixture
+def sistema(csv_sintetico):
+    sistema = SistemaAnaliseEngajamento(guardar_interacoes=False, largura_bucket=3600)
+    sistema.processar_csv_em_fluxo(csv_sintetico)
+    return sistema
+
+
+def _como_texto(linhas):
+    # Valores como o csv.writer os grava.
+    return [[str(valor) for valor in linha] for linha in linhas]
+
+
+@pytest.mark.parametrize('trabalhadores', [1, 3])
+def test_exporta_csv_e_json_iguais_aos_relatorios(sistema, tmp_path, trabalhadores):
+    resumos = gerar_relatorios(sistema, RELATORIOS, str(tmp_path / 'csv'), 'csv', n=5,
+                               trabalhadores=trabalhadores)
+    assert [r['relatorio'] for r in resumos] == list(RELATORIOS)
+    for resumo in resumos:
+        esperado = list(linhas_relatorio(sistema, resumo['relatorio'], 5))
+        with open(resumo['caminho'], newline='', encoding='utf-8') as arquivo:
+            linhas = list(csv.reader(arquivo))
+        assert linhas[0] == list(cabecalho(resumo['relatorio']))
+        assert linhas[1:] == _como_texto(esperado)
+        assert resumo['linhas'] == len(esperado) <= 5
+
+    resumos = gerar_relatorios(sistema, ['usuarios_tempo'], str(tmp_path / 'json'), 'json',
+                               trabalhadores=trabalhadores)
+    with open(resumos[0]['caminho'], encoding='utf-8') as arquivo:
+        objetos = json.load(arquivo)
+    assert [tuple(o.values()) for o in objetos] == list(linhas_relatorio(sistema, 'usuarios_tempo'))
+
+
+def test_janela_e_parametros_invalidos(sistema, tmp_path):
+    inicio, fim = sistema.intervalo_temporal()
+    meio = (inicio + fim) // 2
+    resumos = gerar_relatorios(sistema, ['conteudos_interacoes'], str(tmp_path), inicio=inicio,
+                               fim=meio, trabalhadores=2)
+    esperado = list(linhas_relatorio(sistema, 'conteudos_interacoes', None, inicio, meio))
+    assert resumos[0]['linhas'] == len(esperado) > 0
+    with pytest.raises(ValueError):
+        gerar_relatorios(sistema, ['inexistente'], str(tmp_path))
+    with pytest.raises(ValueError):
+        gerar_relatorios(sistema, RELATORIOS, str(tmp_path), formato='xml')
+
+
+def test_cli_recusa_processos_com_snapshot(csv_sintetico, tmp_path, monkeypatch):
+    snapshot = tmp_path / 'estado.snapshot'
+    SistemaAnaliseEngajamento().salvar_snapshot(str(snapshot))
+    monkeypatch.setattr(sys, 'argv', ['relatorios_lote', '--csv', csv_sintetico, '--snapshot',
+                                      str(snapshot), '--processos', '2', '--saida', str(tmp_path)])
+    with pytest.raises(SystemExit) as erro:
+        main()
+    assert erro.value.code == 2
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+from analise.servico_ingestao import ServicoIngestao
+from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.fila_assincrona import FilaAssincrona
+
+
+def _linhas(csv_sintetico):
+    with open(csv_sintetico, newline='', encoding='utf-8') as arquivo:
+        cabecalho, *linhas = arquivo.read().split('\r\n')[:-1]
+    return cabecalho + '\r\n', [linha + '\r\n' for linha in linhas]
+
+
+def _anexar(caminho, texto):
+    with open(caminho, 'a', newline='', encoding='utf-8') as arquivo:
+        arquivo.write(texto)
+
+
+async def _aguardar(condicao, limite=20.0):
+    fim = time.monotonic() + limite
+    while not condicao():
+        assert time.monotonic() < fim, "tempo esgotado aguardando o serviço"
+        await asyncio.sleep(0.01)
+
+
+def test_acompanha_arquivos_que_crescem_e_aparecem(tmp_path, csv_sintetico, estado):
+    cabecalho, linhas = _linhas(csv_sintetico)
+    a, b = str(tmp_path / 'a.csv'), str(tmp_path / 'b.csv')
+    metade = len(linhas) // 2
+    _anexar(a, cabecalho + ''.join(linhas[:1000]))
+    sistema = SistemaAnaliseEngajamento()
+
+    async def cenario():
+        servico = ServicoIngestao(sistema, [a], diretorio=str(tmp_path), padrao='b*.csv',
+                                  capacidade_fila=50, intervalo=0.01, tamanho_lote=64)
+        tarefa = asyncio.create_task(servico.executar())
+        await _aguardar(lambda: servico.metricas()['registros_processados'] == 1000)
+        # Relatórios atendidos no mesmo loop durante a ingestão.
+        assert sum(c.total_interacoes for c in sistema.gerar_conteudos_por_total_interacoes()) == 1000
+        _anexar(a, ''.join(linhas[1000:metade]))
+        _anexar(b, cabecalho + ''.join(linhas[metade:]))
+        await _aguardar(lambda: servico.metricas()['registros_processados'] == len(linhas))
+        metricas = servico.metricas()
+        servico.parar()
+        return await tarefa, metricas
+
+    resumo, metricas = asyncio.run(cenario())
+    assert resumo['registradas'] == len(linhas)
+    assert metricas['profundidade_fila'] <= metricas['capacidade_fila']
+    assert metricas['registros_lidos'] == len(linhas) and not metricas['arquivos_recusados']
+    assert sistema.obter_checkpoint(a)['linhas'] == metade
+    assert sistema.obter_checkpoint(b)['linhas'] == len(linhas) - metade
+
+    serial = SistemaAnaliseEngajamento()
+    serial.processar_csv_em_fluxo(csv_sintetico)
+    assert estado(sistema)['conteudos'] == estado(serial)['conteudos']
+    assert estado(sistema)['usuarios'] == estado(serial)['usuarios']
+
+
+def test_retoma_do_checkpoint_e_recusa_arquivo_truncado(tmp_path, csv_sintetico):
+    cabecalho, linhas = _linhas(csv_sintetico)
+    caminho = str(tmp_path / 'a.csv')
+    _anexar(caminho, cabecalho + ''.join(linhas[:300]))
+    sistema = SistemaAnaliseEngajamento()
+
+    async def executar_ate(processados, antes_de_parar=None):
+        servico = ServicoIngestao(sistema, [caminho], intervalo=0.01, tamanho_lote=32)
+        tarefa = asyncio.create_task(servico.executar())
+        await _aguardar(lambda: servico.metricas()['registros_processados'] == processados)
+        if antes_de_parar is not None:
+            await antes_de_parar(servico)
+        servico.parar()
+        await tarefa
+        return servico.metricas()
+
+    asyncio.run(executar_ate(300))
+    # Um serviço novo sobre o mesmo sistema lê só o que foi acrescentado.
+    _anexar(caminho, ''.join(linhas[300:400]))
+    asyncio.run(executar_ate(100))
+    assert sistema.resumo_ingestao()['registradas'] == 400
+
+    async def truncar(servico):
+        with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+            arquivo.write(cabecalho + ''.join(linhas[:10]))
+        await _aguardar(lambda: servico.metricas()['arquivos_recusados'])
+
+    metricas = asyncio.run(executar_ate(0, truncar))
+    assert metricas['arquivos_recusados'] == [caminho]
+    assert sistema.resumo_ingestao()['registradas'] == 400
+
+
+def test_fila_assincrona_segura_o_produtor():
+    async def cenario():
+        fila = FilaAssincrona(2)
+        produtor = asyncio.create_task(fila.enfileirar_lote(range(5)))
+        await asyncio.sleep(0.01)
+        assert len(fila) == 2 and not produtor.done()
+        recebidos = []
+        while len(recebidos) < 5:
+            recebidos += await fila.desenfileirar_lote(10)
+        await produtor
+        return recebidos
+
+    assert asyncio.run(cenario()) == [0, 1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        ServicoIngestao(SistemaAnaliseEngajamento(), capacidade_fila=0)
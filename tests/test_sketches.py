@@ -0,0 +1,100 @@
+import random
+from collections import Counter
+
+import pytest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.sketches import HyperLogLog, SpaceSaving
+
+
+def _fluxo_zipf(seed, n, universo=5000):
+    rnd = random.Random(seed)
+    pesos = [1 / k for k in range(1, universo + 1)]
+    return rnd.choices(range(1, universo + 1), weights=pesos, k=n)
+
+
+def _hll(elementos, precisao=12):
+    hll = HyperLogLog(precisao)
+    for elemento in elementos:
+        hll.adicionar(elemento)
+    return hll
+
+
+@pytest.mark.parametrize('distintos', [10, 1000, 50_000])
+def test_hyperloglog_dentro_do_erro(distintos):
+    hll = _hll(list(range(distintos)) * 2)
+    # Até 4 erros padrão (~1,6% com precisao=12); contagens pequenas são quase exatas.
+    assert abs(hll.estimar() - distintos) <= max(1, 4 * 0.0163 * distintos)
+
+
+def test_hyperloglog_mesclar_e_exportar():
+    a, b = _hll(range(0, 30_000)), _hll(range(20_000, 60_000))
+    a.mesclar(b)
+    assert a._registros == _hll(range(60_000))._registros
+    assert HyperLogLog.importar(a.exportar())._registros == a._registros
+    with pytest.raises(ValueError):
+        a.mesclar(HyperLogLog(10))
+    assert HyperLogLog.para_erro(0.02).precisao == 12
+    for invalido in (lambda: HyperLogLog(3), lambda: HyperLogLog.para_erro(0)):
+        with pytest.raises(ValueError):
+            invalido()
+
+
+def _conferir_space_saving(ss, reais):
+    n = sum(reais.values())
+    monitorados = {elemento: (c, e) for elemento, c, e in ss.top()}
+    for elemento, (c, e) in monitorados.items():
+        assert c - e <= reais[elemento] <= c
+    for elemento, qtd in reais.items():
+        if qtd > n / ss.capacidade:
+            assert elemento in monitorados
+
+
+def test_space_saving_garante_os_frequentes():
+    fluxo = _fluxo_zipf(5, 40_000)
+    ss = SpaceSaving(50)
+    for elemento in fluxo:
+        ss.adicionar(elemento)
+    assert ss.total == len(fluxo) and len(ss) == 50
+    _conferir_space_saving(ss, Counter(fluxo))
+    assert [e for e, _, _ in ss.top(3)] == [e for e, _ in Counter(fluxo).most_common(3)]
+
+
+def test_space_saving_mesclar_e_exportar():
+    fluxo = _fluxo_zipf(6, 40_000)
+    a, b = SpaceSaving(50), SpaceSaving(50)
+    for i, elemento in enumerate(fluxo):
+        (a if i % 3 else b).adicionar(elemento)
+    a.mesclar(b)
+    assert a.total == len(fluxo) and len(a) == 50
+    _conferir_space_saving(a, Counter(fluxo))
+    copia = SpaceSaving.importar(a.exportar())
+    copia.adicionar(fluxo[0])
+    a.adicionar(fluxo[0])
+    assert copia.top() == a.top()
+    assert SpaceSaving.para_erro(0.01).capacidade == 100
+    with pytest.raises(ValueError):
+        SpaceSaving(0)
+
+
+def test_estimativas_do_sistema(csv_sintetico):
+    sistema = SistemaAnaliseEngajamento(erro_distintos=0.02, erro_frequentes=0.05)
+    sistema.processar_csv_em_fluxo(csv_sintetico)
+    distintos = sistema.estimar_usuarios_distintos_por_plataforma()
+    for plat in sistema.gerar_ranking_plataformas_por_engajamento():
+        reais = len({i.usuario.id for i in plat._interacoes})
+        assert abs(distintos[plat.nome] - reais) <= 0.1 * reais
+    conteudo = sistema.gerar_conteudos_por_total_interacoes(1)[0]
+    reais = Counter(i.usuario.id for i in conteudo._interacoes)
+    for id_usuario, c, e in sistema.usuarios_mais_ativos_por_conteudo(conteudo.id, 5):
+        assert c - e <= reais[id_usuario] <= c
+    assert sistema.usuarios_mais_ativos_por_conteudo(-1) == []
+
+    paralelo = SistemaAnaliseEngajamento(erro_distintos=0.02, erro_frequentes=0.05)
+    paralelo.carregar_csv_paralelo(csv_sintetico, 2)
+    # A união de HyperLogLogs é exata: as estimativas não dependem das fatias.
+    assert paralelo.estimar_usuarios_distintos_por_conteudo() == sistema.estimar_usuarios_distintos_por_conteudo()
+    with pytest.raises(ValueError):
+        SistemaAnaliseEngajamento().estimar_usuarios_distintos_por_conteudo()
+    with pytest.raises(ValueError):
+        SistemaAnaliseEngajamento().usuarios_mais_ativos_por_plataforma('G1')
@@ -0,0 +1,73 @@
+import pytest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from analise.snapshot import SnapshotInvalido
+from estruturas_dados.arvore_avl import ArvoreAVL
+
+OPCOES = dict(classe_arvore=ArvoreAVL, guardar_interacoes=False, guardar_comentarios=True,
+              tamanho_placar=10, largura_bucket=3600, largura_bucket_usuarios=3600,
+              indexar_comentarios=True, coengajamento=True, erro_distintos=0.05, erro_frequentes=0.05)
+
+
+def _serial(caminho, **opcoes):
+    sistema = SistemaAnaliseEngajamento(**opcoes)
+    sistema.processar_csv_em_fluxo(caminho)
+    return sistema
+
+
+def _sketches(sistema):
+    return (sistema.estimar_usuarios_distintos_por_conteudo(),
+            sistema.estimar_usuarios_distintos_por_plataforma(),
+            [sistema.usuarios_mais_ativos_por_conteudo(c.id, 3) for c in sistema.iterar_conteudos()])
+
+
+def _dividir_csv(origem, destino, linhas_iniciais):
+    # Grava em `destino` o cabeçalho e as primeiras linhas; retorna o restante do texto.
+    with open(origem, newline='', encoding='utf-8') as arquivo:
+        linhas = arquivo.read().split('\r\n')
+    corte = 1 + linhas_iniciais
+    with open(destino, 'w', newline='', encoding='utf-8') as arquivo:
+        arquivo.write('\r\n'.join(linhas[:corte]) + '\r\n')
+    return '\r\n'.join(linhas[corte:])
+
+
+def test_snapshot_e_ingestao_incremental_igualam_a_serial(tmp_path, csv_sintetico, estado):
+    caminho = str(tmp_path / 'crescendo.csv')
+    snapshot = str(tmp_path / 'estado.snapshot')
+    restante = _dividir_csv(csv_sintetico, caminho, 1800)
+
+    sistema, resumo = SistemaAnaliseEngajamento.carregar_snapshot_atualizado(snapshot, caminho, **OPCOES)
+    assert resumo['snapshot'] == 'ausente' and resumo['modo'] == 'completo'
+    with open(caminho, 'a', newline='', encoding='utf-8') as arquivo:
+        arquivo.write(restante)
+
+    restaurado, resumo = SistemaAnaliseEngajamento.carregar_snapshot_atualizado(snapshot, caminho, **OPCOES)
+    assert resumo['snapshot'] == 'restaurado'
+    assert resumo['modo'] == 'incremental' and resumo['linhas_novas'] == 1200
+
+    serial = _serial(csv_sintetico, **OPCOES)
+    assert estado(restaurado) == estado(serial)
+    assert _sketches(restaurado) == _sketches(serial)
+    assert restaurado.termos_frequentes(1, 5) == serial.termos_frequentes(1, 5)
+
+
+def test_snapshot_sem_recurso_ligado_e_recusado(tmp_path, csv_sintetico, estado):
+    snapshot = str(tmp_path / 'simples.snapshot')
+    _serial(csv_sintetico, classe_arvore=ArvoreAVL).salvar_snapshot(snapshot)
+
+    for opcao in ({'largura_bucket': 3600}, {'coengajamento': True}, {'erro_distintos': 0.05},
+                  {'indexar_comentarios': True}):
+        with pytest.raises(SnapshotInvalido):
+            SistemaAnaliseEngajamento.carregar_snapshot(snapshot, classe_arvore=ArvoreAVL, **opcao)
+
+    # O carregamento do main.py descarta o snapshot e relê o CSV inteiro.
+    sistema, resumo = SistemaAnaliseEngajamento.carregar_snapshot_atualizado(snapshot, csv_sintetico, **OPCOES)
+    assert resumo['snapshot'].startswith('ignorado')
+    assert estado(sistema) == estado(_serial(csv_sintetico, **OPCOES))
+
+
+def test_snapshot_com_outra_largura_de_bucket_e_recusado(tmp_path, csv_sintetico):
+    snapshot = str(tmp_path / 'horas.snapshot')
+    _serial(csv_sintetico, largura_bucket=3600).salvar_snapshot(snapshot)
+    with pytest.raises(SnapshotInvalido):
+        SistemaAnaliseEngajamento.carregar_snapshot(snapshot, largura_bucket=60)
@@ -0,0 +1,40 @@
+from analise.leitor_csv import ler_lotes
+from analise.sistema import SistemaAnaliseEngajamento
+from benchmarks.estresse_vistas import amostra, estressar
+
+
+def test_leitores_concorrentes_so_veem_prefixos_consistentes(tmp_path, gerador):
+    caminho = str(tmp_path / 'interacoes.csv')
+    gerador.escrever_csv(caminho, 4000)
+    # intervalo_vistas=0 publica a cada lote, para os leitores verem muitos prefixos.
+    resultado = estressar(caminho, leitores=3, intervalo_vistas=0)
+    assert resultado['amostras'] > 1
+    assert resultado['inconsistentes'] == 0
+
+
+def test_vista_final_igual_ao_sistema(csv_sintetico):
+    sistema = SistemaAnaliseEngajamento(publicar_vistas=True)
+    sistema.processar_csv_em_fluxo(csv_sintetico)
+    vista = sistema.obter_vista()
+    assert vista.eventos == sistema._total_registradas
+    assert amostra(vista, vista.eventos) == amostra(sistema, sistema._total_registradas)
+    for relatorio in ('gerar_top_conteudos_por_tempo', 'gerar_ranking_usuarios_por_tempo',
+                      'gerar_top_usuarios_por_interacoes', 'gerar_ranking_conteudos_por_comentarios'):
+        assert ([m.id for m in getattr(vista, relatorio)(10)]
+                == [e.id for e in getattr(sistema, relatorio)(10)])
+    assert vista.calcular_tempo_medio_consumo_por_plataforma() == \
+        sistema.calcular_tempo_medio_consumo_por_plataforma()
+    assert vista.contar_comentarios_por_conteudo() == sistema.contar_comentarios_por_conteudo()
+
+
+def test_vista_publicada_nao_muda_com_a_ingestao(csv_sintetico):
+    sistema = SistemaAnaliseEngajamento(publicar_vistas=True)
+    registros = [r for lote in ler_lotes(csv_sintetico) for r in lote]
+    sistema._processar_lote(registros[:500])
+    antiga = sistema.publicar_vista()
+    antes = amostra(antiga, antiga.eventos)
+    sistema._processar_lote(registros[500:])
+    nova = sistema.publicar_vista()
+    assert nova.eventos > antiga.eventos
+    assert amostra(antiga, antiga.eventos) == antes
+    assert amostra(nova, nova.eventos) == amostra(sistema, sistema._total_registradas)